@@ -0,0 +1,183 @@
+import atexit
+import logging
+import threading
+import time
+from collections import Counter, defaultdict
+
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.db import IntegrityError, connection, transaction
+
+from oscar.core.loading import get_class, get_model
+
+update_records = get_class('analytics.utils', 'update_records')
+
+logger = logging.getLogger('oscar.analytics')
+
+_buffer = None
+_buffer_lock = threading.Lock()
+
+
+class AnalyticsBuffer(object):
+    """
+    Collects analytics events in memory and writes them to the database in
+    bulk.
+
+    Rather than updating a product's record for every view or basket
+    addition, increments are summed up per record and written with a single
+    UPDATE when the buffer is flushed. This avoids row lock
+    contention on the records of popular products.
+
+    The buffer is flushed once it holds ``max_size`` events, by a background
+    thread every ``flush_interval`` seconds (if set), and when the process
+    exits.
+    """
+
+    def __init__(self, max_size, flush_interval=None):
+        self.max_size = max_size
+        self.flush_interval = flush_interval
+        self.lock = threading.Lock()
+        self.flusher = None
+        self.stopped = False
+        self.clear()
+
+    def clear(self):
+        self.product_counts = defaultdict(Counter)
+        self.user_counts = defaultdict(Counter)
+        self.product_views = []
+        self.size = 0
+
+    def add_product_view(self, product, user=None):
+        if user is not None and not user.is_authenticated():
+            user = None
+        self.add(product, 'num_views', user, 'num_product_views',
+                 record_view=True)
+
+    def add_basket_addition(self, product, user=None):
+        if user is not None and not user.is_authenticated():
+            user = None
+        self.add(product, 'num_basket_additions', user,
+                 'num_basket_additions')
+
+    def add(self, product, product_field, user=None, user_field=None,
+            record_view=False):
+        with self.lock:
+            self.product_counts[product.id][product_field] += 1
+            if user is not None:
+                self.user_counts[user.id][user_field] += 1
+                if record_view:
+                    self.product_views.append((product.id, user.id))
+            self.size += 1
+            is_full = self.size >= self.max_size
+        self.start_flusher()
+        if is_full:
+            self.flush()
+
+    def flush(self):
+        """
+        Write all buffered events to the database
+        """
+        with self.lock:
+            product_counts = self.product_counts
+            user_counts = self.user_counts
+            product_views = self.product_views
+            self.clear()
+
+        if product_counts:
+            update_records(
+                get_model('analytics', 'ProductRecord'), 'product_id',
+                product_counts)
+        if user_counts:
+            update_records(
+                get_model('analytics', 'UserRecord'), 'user_id', user_counts)
+        if product_views:
+            UserProductView = get_model('analytics', 'UserProductView')
+            try:
+                with transaction.atomic():
+                    UserProductView.objects.bulk_create([
+                        UserProductView(product_id=product_id,
+                                        user_id=user_id)
+                        for product_id, user_id in product_views])
+            except IntegrityError:
+                logger.error(
+                    "IntegrityError when recording %d product views",
+                    len(product_views))
+
+    def start_flusher(self):
+        """
+        Start the background thread flushing the buffer periodically, if a
+        flush interval is set
+        """
+        if not self.flush_interval or self.flusher is not None:
+            return
+        with self.lock:
+            if self.flusher is None:
+                self.flusher = threading.Thread(
+                    target=self.flush_periodically,
+                    name='oscar-analytics-flusher')
+                self.flusher.daemon = True
+                self.flusher.start()
+
+    def flush_periodically(self):
+        while True:
+            time.sleep(self.flush_interval)
+            if self.stopped:
+                return
+            try:
+                self.flush()
+            except Exception:
+                logger.exception("Error when flushing analytics")
+            finally:
+                # Each thread has its own database connection
+                connection.close()
+
+
+def is_enabled():
+    return bool(getattr(settings, 'OSCAR_ANALYTICS_BUFFER_SIZE', 0))
+
+
+def get_buffer():
+    """
+    Return the analytics buffer of this process
+    """
+    global _buffer
+    if _buffer is None:
+        with _buffer_lock:
+            if _buffer is None:
+                _buffer = AnalyticsBuffer(
+                    settings.OSCAR_ANALYTICS_BUFFER_SIZE,
+                    getattr(settings, 'OSCAR_ANALYTICS_FLUSH_INTERVAL', None))
+    return _buffer
+
+
+def flush():
+    """
+    Write any buffered analytics events to the database
+    """
+    if _buffer is not None:
+        _buffer.flush()
+
+
+def flush_on_exit():
+    try:
+        flush()
+    except Exception:
+        logger.exception("Error when flushing analytics on exit")
+
+
+def reset_on_setting_change(setting, **kwargs):
+    """
+    Discard the buffer, so it's recreated with the current settings
+    """
+    global _buffer
+    if setting not in ('OSCAR_ANALYTICS_BUFFER_SIZE',
+                       'OSCAR_ANALYTICS_FLUSH_INTERVAL'):
+        return
+    with _buffer_lock:
+        if _buffer is not None:
+            _buffer.stopped = True
+        _buffer = None
+
+
+setting_changed.connect(reset_on_setting_change)
+atexit.register(flush_on_exit)
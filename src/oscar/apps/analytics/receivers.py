@@ -4,6 +4,7 @@ from django.db import IntegrityError
 from django.db.models import F
 from django.dispatch import receiver
 
+from oscar.apps.analytics import buffer
 from oscar.apps.search.signals import user_search
 from oscar.core.loading import get_class, get_classes
 
@@ -13,6 +14,7 @@ UserSearch, UserRecord, ProductRecord, UserProductView = get_classes(
 product_viewed = get_classes('catalogue.signals', ['product_viewed'])
 basket_addition = get_class('basket.signals', 'basket_addition')
 order_placed = get_class('order.signals', 'order_placed')
+record_purchases = get_class('analytics.utils', 'record_purchases')
 
 # Helpers
 
@@ -43,11 +45,7 @@ def _update_counter(model, field_name, filter_kwargs, increment=1):
 
 
 def _record_products_in_order(order):
-    # surely there's a way to do this without causing a query for each line?
-    for line in order.lines.all():
-        _update_counter(
-            ProductRecord, 'num_purchases',
-            {'product': line.product}, line.quantity)
+    record_purchases(order.lines.all())
 
 
 def _record_user_order(user, order):
@@ -76,6 +74,9 @@ def _record_user_order(user, order):
 def receive_product_view(sender, product, user, **kwargs):
     if kwargs.get('raw', False):
         return
+    if buffer.is_enabled():
+        buffer.get_buffer().add_product_view(product, user)
+        return
     _update_counter(ProductRecord, 'num_views', {'product': product})
     if user and user.is_authenticated():
         _update_counter(UserRecord, 'num_product_views', {'user': user})
@@ -92,6 +93,9 @@ def receive_product_search(sender, query, user, **kwargs):
 def receive_basket_addition(sender, product, user, **kwargs):
     if kwargs.get('raw', False):
         return
+    if buffer.is_enabled():
+        buffer.get_buffer().add_basket_addition(product, user)
+        return
     _update_counter(
         ProductRecord, 'num_basket_additions', {'product': product})
     if user and user.is_authenticated():
@@ -13,21 +13,18 @@ UserRecord = get_model('analytics', 'UserRecord')
 
 class ProductReportCSVFormatter(ReportCSVFormatter):
     filename_template = 'conditional-offer-performance.csv'
-
-    def generate_csv(self, response, products):
-        writer = self.get_csv_writer(response)
-        header_row = [_('Product'),
-                      _('Views'),
-                      _('Basket additions'),
-                      _('Purchases')]
-        writer.writerow(header_row)
-
-        for record in products:
-            row = [record.product,
+    streaming = True
+
+    def generate_rows(self, products):
+        yield [_('Product'),
+               _('Views'),
+               _('Basket additions'),
+               _('Purchases')]
+        for record in self.iterate(products.select_related('product')):
+            yield [record.product,
                    record.num_views,
                    record.num_basket_additions,
                    record.num_purchases]
-            writer.writerow(row)
 
 
 class ProductReportHTMLFormatter(ReportHTMLFormatter):
@@ -55,22 +52,20 @@ class ProductReportGenerator(ReportGenerator):
 
 class UserReportCSVFormatter(ReportCSVFormatter):
     filename_template = 'user-analytics.csv'
-
-    def generate_csv(self, response, users):
-        writer = self.get_csv_writer(response)
-        header_row = [_('Name'),
-                      _('Date registered'),
-                      _('Product views'),
-                      _('Basket additions'),
-                      _('Orders'),
-                      _('Order lines'),
-                      _('Order items'),
-                      _('Total spent'),
-                      _('Date of last order')]
-        writer.writerow(header_row)
-
-        for record in users:
-            row = [record.user.get_full_name(),
+    streaming = True
+
+    def generate_rows(self, users):
+        yield [_('Name'),
+               _('Date registered'),
+               _('Product views'),
+               _('Basket additions'),
+               _('Orders'),
+               _('Order lines'),
+               _('Order items'),
+               _('Total spent'),
+               _('Date of last order')]
+        for record in self.iterate(users.select_related('user')):
+            yield [record.user.get_full_name(),
                    self.format_date(record.user.date_joined),
                    record.num_product_views,
                    record.num_basket_additions,
@@ -79,7 +74,6 @@ class UserReportCSVFormatter(ReportCSVFormatter):
                    record.num_order_items,
                    record.total_spent,
                    self.format_datetime(record.date_last_order)]
-            writer.writerow(row)
 
 
 class UserReportHTMLFormatter(ReportHTMLFormatter):
@@ -0,0 +1,184 @@
+import logging
+
+from django.db import IntegrityError, transaction
+from django.db.models import Case, Count, F, Max, Q, Sum, Value, When
+
+from oscar.core.loading import get_model
+
+logger = logging.getLogger('oscar.analytics')
+
+# The maximum number of records updated by a single query, which limits the
+# size of the CASE expressions in it
+BATCH_SIZE = 500
+
+
+def update_records(model, key, increments, values=None, maximums=None):
+    """
+    Update many analytics records with a constant number of queries per batch
+    of records.
+
+    :param model: The model class of the recording model
+    :param key: The name of the field identifying a record, e.g.
+                ``'product_id'``
+    :param increments: A dict mapping record keys to dicts of the fields to
+                       increment and the increments
+    :param values: An optional dict mapping record keys to dicts of fields to
+                   set and their new values
+    :param maximums: An optional dict mapping record keys to dicts of fields
+                     to set and their new values, which are only set if
+                     they're greater than the current ones
+
+    Records that don't exist yet are created.
+    """
+    values = values or {}
+    maximums = maximums or {}
+    record_keys = list(set(increments) | set(values) | set(maximums))
+    for i in range(0, len(record_keys), BATCH_SIZE):
+        _update_batch(model, key, record_keys[i:i + BATCH_SIZE],
+                      increments, values, maximums)
+
+
+def _update_batch(model, key, record_keys, increments, values, maximums):
+    existing = set(model._default_manager.filter(
+        **{'%s__in' % key: record_keys}).order_by().values_list(
+            key, flat=True))
+    if existing:
+        model._default_manager.filter(
+            **{'%s__in' % key: list(existing)}).update(
+                **_get_updates(model, key, existing, increments, values,
+                               maximums))
+
+    new_records = []
+    for record_key in record_keys:
+        if record_key not in existing:
+            fields = dict(increments.get(record_key, {}))
+            fields.update(values.get(record_key, {}))
+            fields.update(maximums.get(record_key, {}))
+            fields[key] = record_key
+            new_records.append(model(**fields))
+    if not new_records:
+        return
+    try:
+        with transaction.atomic():
+            model._default_manager.bulk_create(new_records)
+    except IntegrityError:
+        # Another process may have created some of the records in the
+        # meantime, so fall back to updating them one by one.
+        for record in new_records:
+            record_key = getattr(record, key)
+            _update_record(model, key, record_key,
+                           increments.get(record_key, {}),
+                           values.get(record_key, {}),
+                           maximums.get(record_key, {}))
+
+
+def _get_updates(model, key, record_keys, increments, values, maximums):
+    """
+    Return the expressions updating each field of the passed records at once
+    """
+    field_names = set()
+    for record_key in record_keys:
+        field_names.update(increments.get(record_key, {}))
+        field_names.update(values.get(record_key, {}))
+        field_names.update(maximums.get(record_key, {}))
+
+    updates = {}
+    for field_name in field_names:
+        whens = []
+        for record_key in record_keys:
+            condition = Q(**{key: record_key})
+            if field_name in increments.get(record_key, {}):
+                then = F(field_name) + Value(
+                    increments[record_key][field_name])
+            elif field_name in values.get(record_key, {}):
+                then = Value(values[record_key][field_name])
+            elif field_name in maximums.get(record_key, {}):
+                value = maximums[record_key][field_name]
+                condition &= _is_less_than(field_name, value)
+                then = Value(value)
+            else:
+                continue
+            whens.append(When(condition, then=then))
+        updates[field_name] = Case(
+            *whens, default=F(field_name),
+            output_field=model._meta.get_field(field_name))
+    return updates
+
+
+def _is_less_than(field_name, value):
+    """
+    Return a condition matching the records whose field is unset or less
+    than the passed value
+    """
+    is_unset = Q(**{'%s__isnull' % field_name: True})
+    return is_unset | Q(**{'%s__lt' % field_name: value})
+
+
+def _update_record(model, key, record_key, increments, values, maximums):
+    fields = dict((field_name, F(field_name) + increment)
+                  for field_name, increment in increments.items())
+    fields.update(values)
+    for field_name, value in maximums.items():
+        fields[field_name] = Case(
+            When(_is_less_than(field_name, value), then=Value(value)),
+            default=F(field_name),
+            output_field=model._meta.get_field(field_name))
+    try:
+        with transaction.atomic():
+            affected = model._default_manager.filter(
+                **{key: record_key}).update(**fields)
+            if not affected:
+                fields = dict(increments, **values)
+                fields.update(maximums)
+                fields[key] = record_key
+                model._default_manager.create(**fields)
+    except IntegrityError:
+        logger.error(
+            "IntegrityError when updating analytics counter for %s", model)
+
+
+def record_purchases(lines):
+    """
+    Add the quantities of the passed order lines to the purchase counts of
+    their products
+    """
+    ProductRecord = get_model('analytics', 'ProductRecord')
+    purchases = lines.filter(product__isnull=False).values(
+        'product_id').annotate(num_purchases=Sum('quantity')).order_by()
+    update_records(ProductRecord, 'product_id', dict(
+        (row['product_id'], {'num_purchases': row['num_purchases']})
+        for row in purchases))
+
+
+def record_orders(orders):
+    """
+    Add the passed orders to the purchase counts of their products and to
+    the order statistics of their users
+    """
+    Line = get_model('order', 'Line')
+    UserRecord = get_model('analytics', 'UserRecord')
+    record_purchases(Line._default_manager.filter(order__in=orders))
+
+    increments, maximums = {}, {}
+    order_stats = orders.filter(user__isnull=False).values(
+        'user_id').annotate(
+            num_orders=Count('id'), total_spent=Sum('total_incl_tax'),
+            date_last_order=Max('date_placed')).order_by()
+    for row in order_stats:
+        increments[row['user_id']] = {
+            'num_orders': row['num_orders'],
+            'total_spent': row['total_spent']}
+        # The orders may not be recorded in the order they were placed, so
+        # the date of the last order is only ever moved forward
+        maximums[row['user_id']] = {
+            'date_last_order': row['date_last_order']}
+    line_stats = Line._default_manager.filter(
+        order__in=orders, order__user__isnull=False).values(
+            'order__user_id').annotate(
+                num_order_lines=Count('id'),
+                num_order_items=Sum('quantity')).order_by()
+    for row in line_stats:
+        increments[row['order__user_id']].update(
+            num_order_lines=row['num_order_lines'],
+            num_order_items=row['num_order_items'])
+    update_records(UserRecord, 'user_id', increments, maximums=maximums)
@@ -79,6 +79,12 @@ class AbstractBasket(models.Model):
         self._lines = None
         self.offer_applications = results.OfferApplications()
 
+        # When lines are changed through the basket's methods, the offer
+        # applications from before the change and the IDs of the changed
+        # products are kept, so that offers can be re-applied incrementally.
+        self._previous_offer_applications = None
+        self._changed_product_ids = set()
+
     def __str__(self):
         return _(
             u"%(status)s basket (owner: %(owner)s, lines: %(num_lines)d)") \
@@ -121,11 +127,17 @@ class AbstractBasket(models.Model):
         if self.id is None:
             return self.lines.none()
         if self._lines is None:
+            # Load everything needed to price and render the lines up front,
+            # so the number of queries doesn't grow with the number of lines.
             self._lines = (
                 self.lines
-                .select_related('product', 'stockrecord')
+                .select_related(
+                    'product', 'product__product_class',
+                    'product__parent', 'product__parent__product_class',
+                    'stockrecord', 'stockrecord__partner')
                 .prefetch_related(
-                    'attributes', 'product__images')
+                    'attributes', 'attributes__option', 'product__images',
+                    'product__stockrecords')
                 .order_by(self._meta.pk.name))
         return self._lines
 
@@ -157,7 +169,7 @@ class AbstractBasket(models.Model):
         if self.status == self.FROZEN:
             raise PermissionDenied("A frozen basket cannot be flushed")
         self.lines.all().delete()
-        self._lines = None
+        self.reset_offer_applications()
 
     def add_product(self, product, quantity=1, options=None):
         """
@@ -221,7 +233,7 @@ class AbstractBasket(models.Model):
         else:
             line.quantity = max(0, line.quantity + quantity)
             line.save()
-        self.reset_offer_applications()
+        self.reset_offer_applications(changed_products=[product])
 
         # Returning the line is useful when overriding this method.
         return line, created
@@ -237,13 +249,51 @@ class AbstractBasket(models.Model):
         """
         return self.offer_applications.offers
 
-    def reset_offer_applications(self):
+    def reset_offer_applications(self, changed_products=None):
         """
         Remove any discounts so they get recalculated
+
+        If the products of the lines that were added, changed or removed are
+        passed, the current offer applications are kept around so that the
+        Applicator can re-apply only the offers affected by the change (see
+        ``OSCAR_INCREMENTAL_OFFER_APPLICATION``). Without them, all offers are
+        re-applied.
         """
+        if changed_products is None:
+            self._previous_offer_applications = None
+            self._changed_product_ids = set()
+        else:
+            if self.offer_applications.line_discounts is not None:
+                # Offers have been applied since the last reset
+                self._previous_offer_applications = self.offer_applications
+                self._changed_product_ids = set()
+            self._changed_product_ids.update(p.id for p in changed_products)
         self.offer_applications = results.OfferApplications()
         self._lines = None
 
+    @property
+    def has_offer_changes(self):
+        """
+        Test whether the basket keeps track of the lines that changed since
+        offers were last applied
+        """
+        return self._previous_offer_applications is not None
+
+    def pop_offer_changes(self):
+        """
+        Return the offer applications from before the basket's lines changed
+        and the IDs of the changed products, and stop tracking them.
+
+        Returns ``None`` if the changes aren't known.
+        """
+        if not self.has_offer_changes:
+            return None
+        changes = (self._previous_offer_applications,
+                   self._changed_product_ids)
+        self._previous_offer_applications = None
+        self._changed_product_ids = set()
+        return changes
+
     def merge_line(self, line, add_quantities=True):
         """
         For transferring a line from another basket to this one.
@@ -267,7 +317,7 @@ class AbstractBasket(models.Model):
             existing_line.save()
             line.delete()
         finally:
-            self._lines = None
+            self.reset_offer_applications(changed_products=[line.product])
     merge_line.alters_data = True
 
     def merge(self, basket, add_quantities=True):
@@ -675,6 +725,23 @@ class AbstractLine(models.Model):
             self._discount_excl_tax += discount_value
         self._affected_quantity += int(affected_quantity)
 
+    def get_discount_state(self):
+        """
+        Return the discount information of this line, which is not persisted.
+
+        This is used to carry over discounts when re-applying offers
+        incrementally.
+        """
+        return (self._discount_excl_tax, self._discount_incl_tax,
+                self._affected_quantity)
+
+    def set_discount_state(self, state):
+        """
+        Restore discount information returned by ``get_discount_state``.
+        """
+        (self._discount_excl_tax, self._discount_incl_tax,
+         self._affected_quantity) = state
+
     def consume(self, quantity):
         """
         Mark all or part of the line as 'consumed'
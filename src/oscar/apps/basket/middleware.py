@@ -9,6 +9,7 @@ from oscar.core.loading import get_class, get_model
 Applicator = get_class('offer.utils', 'Applicator')
 Basket = get_model('basket', 'basket')
 Selector = get_class('partner.strategy', 'Selector')
+get_basket_summary = get_class('basket.summary', 'get_summary')
 
 selector = Selector()
 
@@ -52,10 +53,21 @@ class BasketMiddleware(object):
             if basket.id:
                 return self.get_basket_hash(basket.id)
 
+        def load_basket_summary():
+            """
+            Return a summary of the basket for rendering the mini-basket
+
+            If summaries are cached, the full basket is only loaded when the
+            basket changed since its summary was built.
+            """
+            basket = self.get_basket(request)
+            return get_basket_summary(basket.id, lambda: request.basket)
+
         # Use Django's SimpleLazyObject to only perform the loading work
         # when the attribute is accessed.
         request.basket = SimpleLazyObject(load_full_basket)
         request.basket_hash = SimpleLazyObject(load_basket_hash)
+        request.basket_summary = SimpleLazyObject(load_basket_summary)
 
     def process_response(self, request, response):
         # Delete any surplus cookies
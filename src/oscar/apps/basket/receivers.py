@@ -0,0 +1,34 @@
+from django.db.models.signals import m2m_changed, post_delete, post_save
+
+from oscar.apps.basket import summary
+from oscar.core.loading import get_model
+
+Basket = get_model('basket', 'Basket')
+Line = get_model('basket', 'Line')
+
+
+def invalidate_basket_summary(sender, instance, **kwargs):
+    if not summary.get_timeout() or kwargs.get('raw', False):
+        return
+    if sender is Basket:
+        summary.invalidate(instance.id)
+    elif sender is Line:
+        summary.invalidate(instance.basket_id)
+
+
+def invalidate_basket_summary_on_voucher_change(
+        sender, instance, action, reverse, pk_set, **kwargs):
+    if not summary.get_timeout() or not action.startswith('post_'):
+        return
+    if not reverse:
+        summary.invalidate(instance.id)
+    elif pk_set:
+        for basket_id in pk_set:
+            summary.invalidate(basket_id)
+
+
+for model in (Basket, Line):
+    post_save.connect(invalidate_basket_summary, sender=model)
+    post_delete.connect(invalidate_basket_summary, sender=model)
+m2m_changed.connect(invalidate_basket_summary_on_voucher_change,
+                    sender=Basket.vouchers.through)
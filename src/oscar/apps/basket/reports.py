@@ -1,3 +1,4 @@
+from django.db.models import Count, Sum
 from django.utils.translation import ugettext_lazy as _
 
 from oscar.core.loading import get_class, get_model
@@ -10,35 +11,39 @@ ReportHTMLFormatter = get_class('dashboard.reports.reports',
 Basket = get_model('basket', 'Basket')
 
 
+def annotate_line_counts(baskets):
+    """
+    Load the baskets' owners and count their lines and items in the same
+    query
+    """
+    return baskets.select_related('owner').annotate(
+        line_count=Count('lines'), item_count=Sum('lines__quantity'))
+
+
 class OpenBasketReportCSVFormatter(ReportCSVFormatter):
     filename_template = 'open-baskets-%s-%s.csv'
-
-    def generate_csv(self, response, baskets):
-        writer = self.get_csv_writer(response)
-        header_row = [_('User ID'),
-                      _('Name'),
-                      _('Email'),
-                      _('Basket status'),
-                      _('Num lines'),
-                      _('Num items'),
-                      _('Date of creation'),
-                      _('Time since creation'),
-                      ]
-        writer.writerow(header_row)
-
-        for basket in baskets:
+    streaming = True
+
+    def generate_rows(self, baskets):
+        yield [_('User ID'),
+               _('Name'),
+               _('Email'),
+               _('Basket status'),
+               _('Num lines'),
+               _('Num items'),
+               _('Date of creation'),
+               _('Time since creation'),
+               ]
+        for basket in self.iterate(annotate_line_counts(baskets)):
             if basket.owner:
                 row = [basket.owner_id, basket.owner.get_full_name(),
-                       basket.owner.email,
-                       basket.status, basket.num_lines,
-                       self.format_datetime(basket.date_created),
-                       basket.time_since_creation]
+                       basket.owner.email]
             else:
-                row = [basket.owner_id, None, None, basket.status,
-                       basket.num_lines, basket.num_items,
-                       self.format_datetime(basket.date_created),
-                       basket.time_since_creation]
-            writer.writerow(row)
+                row = [basket.owner_id, None, None]
+            yield row + [basket.status, basket.line_count,
+                         basket.item_count or 0,
+                         self.format_datetime(basket.date_created),
+                         basket.time_since_creation]
 
     def filename(self, **kwargs):
         return self.filename_template % (kwargs['start_date'],
@@ -71,28 +76,25 @@ class OpenBasketReportGenerator(ReportGenerator):
 
 class SubmittedBasketReportCSVFormatter(ReportCSVFormatter):
     filename_template = 'submitted_baskets-%s-%s.csv'
-
-    def generate_csv(self, response, baskets):
-        writer = self.get_csv_writer(response)
-        header_row = [_('User ID'),
-                      _('User'),
-                      _('Basket status'),
-                      _('Num lines'),
-                      _('Num items'),
-                      _('Date created'),
-                      _('Time between creation and submission'),
-                      ]
-        writer.writerow(header_row)
-
-        for basket in baskets:
-            row = [basket.owner_id,
+    streaming = True
+
+    def generate_rows(self, baskets):
+        yield [_('User ID'),
+               _('User'),
+               _('Basket status'),
+               _('Num lines'),
+               _('Num items'),
+               _('Date created'),
+               _('Time between creation and submission'),
+               ]
+        for basket in self.iterate(annotate_line_counts(baskets)):
+            yield [basket.owner_id,
                    basket.owner,
                    basket.status,
-                   basket.num_lines,
-                   basket.num_items,
+                   basket.line_count,
+                   basket.item_count or 0,
                    self.format_datetime(basket.date_created),
                    basket.time_before_submit]
-            writer.writerow(row)
 
     def filename(self, **kwargs):
         return self.filename_template % (kwargs['start_date'],
@@ -0,0 +1,114 @@
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+from oscar.apps.offer import snapshot
+
+# Each basket has a version stamp in Django's cache, which changes whenever
+# the basket, its lines or its vouchers change. Summaries are cached under the
+# basket's current version, so changing it invalidates them in all processes.
+VERSION_CACHE_KEY = 'oscar_basket_version_%s'
+SUMMARY_CACHE_KEY = 'oscar_basket_summary_%s_%s'
+
+
+class BasketSummaryLine(object):
+    """
+    The details of a basket line that are shown in the mini-basket
+    """
+
+    def __init__(self, line):
+        product = line.product
+        self.product_id = product.id
+        self.title = product.get_title()
+        self.url = product.get_absolute_url()
+        self.description = line.description
+        self.quantity = line.quantity
+        self.unit_price_excl_tax = line.unit_price_excl_tax
+
+        # Store the name of the image file rather than the image, so the
+        # summary can be pickled.
+        image = product.primary_image()
+        if isinstance(image, dict):
+            image = image['original']
+        else:
+            image = image.original
+        self.image = image.name
+
+
+class BasketSummary(object):
+    """
+    A lightweight copy of the basket's totals and lines, which can be cached
+    to render the mini-basket without loading the basket and applying offers.
+
+    The basket passed in should have had its offers applied.
+    """
+
+    def __init__(self, basket):
+        self.id = basket.id
+        self.lines = [BasketSummaryLine(line) for line in basket.all_lines()]
+        self.num_lines = len(self.lines)
+        self.num_items = sum(line.quantity for line in self.lines)
+        self.currency = basket.currency
+        self.is_tax_known = basket.is_tax_known
+        self.total_excl_tax = basket.total_excl_tax
+        self.total_incl_tax = (
+            basket.total_incl_tax if self.is_tax_known else None)
+
+    def all_lines(self):
+        return self.lines
+
+
+def get_timeout():
+    return getattr(settings, 'OSCAR_BASKET_SUMMARY_CACHE_TIMEOUT', 0)
+
+
+def get_version(basket_id):
+    key = VERSION_CACHE_KEY % basket_id
+    version = cache.get(key)
+    if version is None:
+        version = uuid.uuid4().hex
+        if not cache.add(key, version, settings.OSCAR_BASKET_COOKIE_LIFETIME):
+            version = cache.get(key, version)
+    if snapshot.is_enabled():
+        # Changes to site offers are tracked too
+        version = '%s_%s' % (version, snapshot.get_version())
+    return version
+
+
+def get_summary(basket_id, load_basket):
+    """
+    Return the summary of the basket with the passed ID.
+
+    If ``OSCAR_BASKET_SUMMARY_CACHE_TIMEOUT`` is set, summaries are cached for
+    that many seconds and ``load_basket`` is only called to build a new one
+    when the basket changed. Otherwise, a new summary is built each time.
+    """
+    timeout = get_timeout()
+    if not timeout or basket_id is None:
+        return BasketSummary(load_basket())
+
+    key = SUMMARY_CACHE_KEY % (basket_id, get_version(basket_id))
+    summary = cache.get(key)
+    if summary is None:
+        summary = BasketSummary(load_basket())
+        cache.set(key, summary, timeout)
+    return summary
+
+
+def invalidate(basket_id):
+    """
+    Discard the cached summaries of the basket with the passed ID
+
+    The version is changed right away, so the rest of the transaction sees
+    the change, and again once the transaction is committed, as another
+    request could have cached a summary of the data before the commit under
+    the first new version.
+    """
+    def change_version():
+        cache.set(VERSION_CACHE_KEY % basket_id, uuid.uuid4().hex,
+                  settings.OSCAR_BASKET_COOKIE_LIFETIME)
+
+    change_version()
+    transaction.on_commit(change_version)
@@ -55,8 +55,10 @@ class BasketMessageGenerator(object):
         """
         Set flash messages triggered by changes to the basket
         """
-        # Re-apply offers to see if any new ones are now available
-        request.basket.reset_offer_applications()
+        # Re-apply offers to see if any new ones are now available. Baskets
+        # that keep track of their changed lines have been reset already.
+        if not request.basket.has_offer_changes:
+            request.basket.reset_offer_applications()
         Applicator().apply(request.basket, request.user, request)
         offers_after = request.basket.applied_offers()
 
@@ -171,12 +171,15 @@ class BasketView(ModelFormSetView):
             # Save changes to basket as per normal
             response = super(BasketView, self).formset_valid(formset)
 
+        # Let the basket know which lines changed, so that the offers can be
+        # re-applied incrementally
+        self.request.basket.reset_offer_applications(
+            changed_products=[form.instance.product for form in formset
+                              if form.has_changed()])
+
         # If AJAX submission, don't redirect but reload the basket content HTML
         if self.request.is_ajax():
-            # Reload basket and apply offers again
-            self.request.basket = get_model('basket', 'Basket').objects.get(
-                id=self.request.basket.id)
-            self.request.basket.strategy = self.request.strategy
+            # Apply offers again
             Applicator().apply(self.request.basket, self.request.user,
                                self.request)
             offers_after = self.request.basket.applied_offers()
@@ -12,7 +12,8 @@ from django.core.files.base import File
 from django.core.urlresolvers import reverse
 from django.core.validators import RegexValidator
 from django.db import models
-from django.db.models import Count, Sum
+from django.db.models import Count, Sum, Value
+from django.db.models.functions import Concat, Substr
 from django.utils import six
 from django.utils.encoding import python_2_unicode_compatible
 from django.utils.functional import cached_property
@@ -96,38 +97,26 @@ class AbstractCategory(MP_Node):
                               null=True, max_length=255)
     slug = SlugField(_('Slug'), max_length=255, db_index=True)
 
+    #: The names of the category and its ancestors, e.g.
+    #: 'Books > Non-fiction > Essential programming'. Kept up to date when
+    #: the category or one of its ancestors is saved or moved.
+    full_name = models.CharField(
+        _('Full name'), max_length=1024, editable=False)
+
+    #: The slugs of the category and its ancestors, e.g.
+    #: 'books/non-fiction/essential-programming'. Oscar used to store this in
+    #: the 'slug' field, which now only holds this category's slug. It isn't
+    #: indexed, as it's too long for some databases' indexes; categories are
+    #: looked up by their own slug instead.
+    full_slug = models.CharField(
+        _('Full slug'), max_length=1024, editable=False)
+
     _slug_separator = '/'
     _full_name_separator = ' > '
 
     def __str__(self):
         return self.full_name
 
-    @property
-    def full_name(self):
-        """
-        Returns a string representation of the category and it's ancestors,
-        e.g. 'Books > Non-fiction > Essential programming'.
-
-        It's rarely used in Oscar's codebase, but used to be stored as a
-        CharField and is hence kept for backwards compatibility. It's also
-        sufficiently useful to keep around.
-        """
-        names = [category.name for category in self.get_ancestors_and_self()]
-        return self._full_name_separator.join(names)
-
-    @property
-    def full_slug(self):
-        """
-        Returns a string of this category's slug concatenated with the slugs
-        of it's ancestors, e.g. 'books/non-fiction/essential-programming'.
-
-        Oscar used to store this as in the 'slug' model field, but this field
-        has been re-purposed to only store this category's slug and to not
-        include it's ancestors' slugs.
-        """
-        slugs = [category.slug for category in self.get_ancestors_and_self()]
-        return self._slug_separator.join(slugs)
-
     def generate_slug(self):
         """
         Generates a slug for a category. This makes no attempt at generating
@@ -161,16 +150,56 @@ class AbstractCategory(MP_Node):
         """
         if self.slug:
             # Slug was supplied. Hands off!
-            super(AbstractCategory, self).save(*args, **kwargs)
+            self.save_with_full_names(*args, **kwargs)
         else:
             self.slug = self.generate_slug()
-            super(AbstractCategory, self).save(*args, **kwargs)
+            self.save_with_full_names(*args, **kwargs)
             # We auto-generated a slug, so we need to make sure that it's
             # unique. As we need to be able to inspect the category's siblings
             # for that, we need to wait until the instance is saved. We
             # update the slug and save again if necessary.
             self.ensure_slug_uniqueness()
 
+    def save_with_full_names(self, *args, **kwargs):
+        """
+        Saves the category with its current full name and slug, and updates
+        those of its descendants if they changed.
+        """
+        old = None
+        if self.pk:
+            old = self.__class__._default_manager.filter(pk=self.pk).values(
+                'full_name', 'full_slug').first()
+        parent = self.get_parent(update=True)
+        if parent is None:
+            self.full_name = self.name
+            self.full_slug = self.slug
+        else:
+            self.full_name = self._full_name_separator.join(
+                [parent.full_name, self.name])
+            self.full_slug = self._slug_separator.join(
+                [parent.full_slug, self.slug])
+        super(AbstractCategory, self).save(*args, **kwargs)
+
+        if old and (old['full_name'] != self.full_name or
+                    old['full_slug'] != self.full_slug):
+            # Replace the old prefix of the descendants' full names and slugs
+            old_name_prefix = old['full_name'] + self._full_name_separator
+            old_slug_prefix = old['full_slug'] + self._slug_separator
+            self.get_descendants().update(
+                full_name=Concat(
+                    Value(self.full_name + self._full_name_separator),
+                    Substr('full_name', len(old_name_prefix) + 1)),
+                full_slug=Concat(
+                    Value(self.full_slug + self._slug_separator),
+                    Substr('full_slug', len(old_slug_prefix) + 1)))
+
+    def move(self, target, pos=None):
+        super(AbstractCategory, self).move(target, pos)
+        # Treebeard moves categories with bulk updates, which neither update
+        # this instance nor send any signals. Saving a fresh copy updates the
+        # full names and slugs of the category and its descendants.
+        self.__class__._default_manager.get(pk=self.pk).save()
+
     def get_ancestors_and_self(self):
         """
         Gets ancestors and includes itself. Use treebeard's get_ancestors
@@ -241,6 +270,29 @@ class AbstractProductCategory(models.Model):
         return u"<productcategory for product '%s'>" % self.product
 
 
+@python_2_unicode_compatible
+class AbstractProductChange(models.Model):
+    """
+    A record that a product has changed and needs to be reindexed.
+
+    Changes are only recorded if ``OSCAR_SEARCH_CHANGE_LOG`` is set. The
+    product's ID is stored as a plain integer (rather than a foreign key), so
+    the changes of deleted products are kept and they can be removed from the
+    search index.
+    """
+    product_id = models.IntegerField(_("Product ID"), db_index=True)
+    date_created = models.DateTimeField(_("Date created"), auto_now_add=True)
+
+    class Meta:
+        abstract = True
+        app_label = 'catalogue'
+        verbose_name = _('Product change')
+        verbose_name_plural = _('Product changes')
+
+    def __str__(self):
+        return u"<change of product #%d>" % self.product_id
+
+
 @python_2_unicode_compatible
 class AbstractProduct(models.Model):
     """
@@ -1,3 +1,6 @@
+from django.db import transaction
+from django.db.models import Case, CharField, Value, When
+
 from oscar.core.loading import get_model
 
 Category = get_model('catalogue', 'category')
@@ -42,3 +45,44 @@ def create_from_breadcrumbs(breadcrumb_str, separator='>'):
     category_names = [x.strip() for x in breadcrumb_str.split(separator)]
     categories = create_from_sequence(category_names)
     return categories[-1]
+
+
+def update_full_names_and_slugs(batch_size=500):
+    """
+    Recalculate the full names and slugs of all categories, e.g. after
+    categories have been imported without going through ``Category.save``.
+
+    Categories are read in order of their path, so that their ancestors'
+    full names and slugs are always known, and changed categories are updated
+    in batches. Returns the number of updated categories.
+    """
+    categories = Category.objects.order_by('path').values_list(
+        'pk', 'depth', 'name', 'slug', 'full_name', 'full_slug')
+    ancestors, changes, num_updated = [], [], 0
+    for pk, depth, name, slug, full_name, full_slug in categories.iterator():
+        del ancestors[depth - 1:]
+        if ancestors:
+            parent_name, parent_slug = ancestors[-1]
+            name = Category._full_name_separator.join([parent_name, name])
+            slug = Category._slug_separator.join([parent_slug, slug])
+        ancestors.append((name, slug))
+        if (name, slug) != (full_name, full_slug):
+            changes.append((pk, name, slug))
+        if len(changes) >= batch_size:
+            num_updated += _update_full_names_and_slugs(changes)
+            changes = []
+    if changes:
+        num_updated += _update_full_names_and_slugs(changes)
+    return num_updated
+
+
+def _update_full_names_and_slugs(changes):
+    with transaction.atomic():
+        Category.objects.filter(pk__in=[pk for pk, __, __ in changes]).update(
+            full_name=Case(*[When(pk=pk, then=Value(name))
+                             for pk, name, __ in changes],
+                           output_field=CharField()),
+            full_slug=Case(*[When(pk=pk, then=Value(slug))
+                             for pk, __, slug in changes],
+                           output_field=CharField()))
+    return len(changes)
@@ -0,0 +1,47 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+
+# The separators are properties of the category model, which aren't available
+# on the migration's snapshot of the model, so they're repeated here.
+FULL_NAME_SEPARATOR = ' > '
+SLUG_SEPARATOR = '/'
+
+
+def populate_full_names_and_slugs(apps, schema_editor):
+    Category = apps.get_model('catalogue', 'Category')
+    # Ordered by path, a category's ancestors are always handled before it
+    ancestors = []
+    for category in Category.objects.order_by('path'):
+        del ancestors[category.depth - 1:]
+        names = [ancestor.name for ancestor in ancestors] + [category.name]
+        slugs = [ancestor.slug for ancestor in ancestors] + [category.slug]
+        Category.objects.filter(pk=category.pk).update(
+            full_name=FULL_NAME_SEPARATOR.join(names),
+            full_slug=SLUG_SEPARATOR.join(slugs))
+        ancestors.append(category)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('catalogue', '0009_slugfield_noop'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='category',
+            name='full_name',
+            field=models.CharField(default='', editable=False, max_length=1024, verbose_name='Full name'),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name='category',
+            name='full_slug',
+            field=models.CharField(default='', editable=False, max_length=1024, verbose_name='Full slug'),
+            preserve_default=False,
+        ),
+        migrations.RunPython(
+            populate_full_names_and_slugs, migrations.RunPython.noop),
+    ]
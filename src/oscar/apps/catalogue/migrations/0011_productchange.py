@@ -0,0 +1,28 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.9.13 on 2026-10-18 08:48
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('catalogue', '0010_category_full_name_and_slug'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProductChange',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('product_id', models.IntegerField(db_index=True, verbose_name='Product ID')),
+                ('date_created', models.DateTimeField(auto_now_add=True, verbose_name='Date created')),
+            ],
+            options={
+                'verbose_name': 'Product change',
+                'verbose_name_plural': 'Product changes',
+                'abstract': False,
+            },
+        ),
+    ]
@@ -1,19 +1,22 @@
 # -*- coding: utf-8 -*-
 
 from django.conf import settings
+from django.core.signals import setting_changed
+from django.db.models.signals import post_delete, post_save
 
-if settings.OSCAR_DELETE_IMAGE_FILES:
+from oscar.apps.catalogue import tree
+from oscar.core.loading import get_model
+
+Category = get_model('catalogue', 'Category')
 
-    from oscar.core.loading import get_model
+if settings.OSCAR_DELETE_IMAGE_FILES:
 
     from django.db import models
-    from django.db.models.signals import post_delete
 
     from sorl import thumbnail
     from sorl.thumbnail.helpers import ThumbnailError
 
     ProductImage = get_model('catalogue', 'ProductImage')
-    Category = get_model('catalogue', 'Category')
 
     def delete_image_files(sender, instance, **kwargs):
         """
@@ -34,3 +37,18 @@ if settings.OSCAR_DELETE_IMAGE_FILES:
     models_with_images = [ProductImage, Category]
     for sender in models_with_images:
         post_delete.connect(delete_image_files, sender=sender)
+
+
+def invalidate_category_tree(sender, instance, **kwargs):
+    if tree.is_enabled() and not kwargs.get('raw', False):
+        tree.invalidate()
+
+
+def invalidate_category_tree_on_setting_change(setting, **kwargs):
+    if setting == 'OSCAR_CACHE_CATEGORY_TREE':
+        tree.invalidate()
+
+
+post_save.connect(invalidate_category_tree, sender=Category)
+post_delete.connect(invalidate_category_tree, sender=Category)
+setting_changed.connect(invalidate_category_tree_on_setting_change)
@@ -65,6 +65,7 @@ class AbstractProductReview(models.Model):
         _("Delta Votes"), default=0, db_index=True)  # upvotes - down votes
 
     date_created = models.DateTimeField(auto_now_add=True)
+    date_updated = models.DateTimeField(auto_now=True, db_index=True)
 
     # Managers
     objects = ProductReviewQuerySet.as_manager()
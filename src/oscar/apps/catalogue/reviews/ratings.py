@@ -0,0 +1,105 @@
+from django.core.cache import cache
+from django.db.models import Case, Count, FloatField, Sum, Value, When
+from django.utils import timezone
+
+from oscar.core.loading import get_class, get_model
+
+log_changes = get_class('search.changes', 'log_changes')
+
+# The number of products whose ratings are recalculated at once
+BATCH_SIZE = 500
+
+# The number of products updated by a single query, which limits the size of
+# the CASE expression in it
+UPDATE_BATCH_SIZE = 100
+
+# The time of the last run of ``oscar_update_product_ratings --incremental``
+# is kept in Django's cache, so the next run only recalculates the ratings of
+# the products whose reviews have changed since.
+LAST_RUN_CACHE_KEY = 'oscar_product_ratings_last_run'
+
+
+def calculate_ratings(product_ids):
+    """
+    Return a dict mapping the passed product IDs to their ratings, the
+    average score of their approved reviews, like
+    ``Product.calculate_rating`` does
+    """
+    ProductReview = get_model('reviews', 'ProductReview')
+    ratings = dict.fromkeys(product_ids)
+    totals = ProductReview._default_manager.filter(
+        product_id__in=product_ids, status=ProductReview.APPROVED
+    ).values('product_id').annotate(
+        sum=Sum('score'), count=Count('id')).order_by()
+    for row in totals:
+        if row['count']:
+            ratings[row['product_id']] = float(row['sum']) / row['count']
+    return ratings
+
+
+def update_ratings(product_ids=None, batch_size=BATCH_SIZE):
+    """
+    Recalculate the ratings of the passed products, or of all products, in
+    batches. Only the products whose rating has changed are updated.
+    Returns the number of products updated.
+    """
+    Product = get_model('catalogue', 'Product')
+    products = Product._default_manager.order_by('pk')
+    if product_ids is not None:
+        products = products.filter(pk__in=product_ids)
+
+    num_updated = 0
+    last_pk = 0
+    while True:
+        current = dict(products.filter(pk__gt=last_pk).values_list(
+            'pk', 'rating')[:batch_size])
+        if not current:
+            break
+        last_pk = max(current)
+        ratings = calculate_ratings(list(current))
+        changed = [(pk, rating) for pk, rating in ratings.items()
+                   if rating != current[pk]]
+        for i in range(0, len(changed), UPDATE_BATCH_SIZE):
+            set_ratings(changed[i:i + UPDATE_BATCH_SIZE])
+        num_updated += len(changed)
+    return num_updated
+
+
+def set_ratings(ratings):
+    """
+    Set the ratings of products with a single query, given a list of
+    (product ID, rating) pairs
+    """
+    Product = get_model('catalogue', 'Product')
+    # The update date is set as well, like saving the product does, so the
+    # search index picks up the new ratings
+    Product._default_manager.filter(
+        pk__in=[pk for pk, rating in ratings]
+    ).update(
+        rating=Case(*[When(pk=pk, then=Value(rating))
+                      for pk, rating in ratings], output_field=FloatField()),
+        date_updated=timezone.now())
+    log_changes([pk for pk, rating in ratings])
+
+
+def get_changed_product_ids(since):
+    """
+    Return the IDs of the products whose reviews have been created or updated
+    since the passed time
+    """
+    ProductReview = get_model('reviews', 'ProductReview')
+    return set(ProductReview._default_manager.filter(
+        date_updated__gte=since, product__isnull=False
+    ).values_list('product_id', flat=True))
+
+
+def get_last_run():
+    """
+    Return the time the ratings were last updated incrementally, or ``None``
+    if it isn't known
+    """
+    return cache.get(LAST_RUN_CACHE_KEY)
+
+
+def set_last_run(time):
+    cache.set(LAST_RUN_CACHE_KEY, time, None)
@@ -0,0 +1,141 @@
+import bisect
+import copy
+import threading
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+from oscar.core.loading import get_model
+
+# The version stamp is kept in Django's cache so that changing a category in
+# one process (e.g. in the dashboard) invalidates the tree in all others too.
+VERSION_CACHE_KEY = 'oscar_category_tree_version'
+
+_tree = None
+_lock = threading.Lock()
+
+
+class CategoryTree(object):
+    """
+    An in-memory copy of all categories.
+
+    The categories are loaded with a single query, ordered by their path, and
+    indexed by their IDs and full slugs. Rendering the category tree, looking
+    up a category or its descendants hence doesn't require any queries.
+    """
+
+    def __init__(self, version):
+        self.version = version
+        Category = get_model('catalogue', 'Category')
+        self.categories = list(Category.objects.order_by('path'))
+        self.paths = [category.path for category in self.categories]
+        self.by_id = {}
+        self.by_full_slug = {}
+        for category in self.categories:
+            self.by_id[category.id] = category
+            self.by_full_slug[category.full_slug] = category
+
+    def get_categories(self):
+        """
+        Return all categories, ordered by their path
+        """
+        # Categories are shared between requests (and threads), so we hand
+        # out shallow copies to keep per-request state off the originals.
+        return [copy.copy(category) for category in self.categories]
+
+    def get_category(self, pk):
+        category = self.by_id.get(pk)
+        if category is not None:
+            return copy.copy(category)
+
+    def get_category_by_full_slug(self, full_slug):
+        category = self.by_full_slug.get(full_slug)
+        if category is not None:
+            return copy.copy(category)
+
+    def get_descendants(self, category):
+        """
+        Return the descendants of the passed category, ordered by their path
+        """
+        return [copy.copy(descendant)
+                for descendant in self._descendants(category.path)]
+
+    def get_descendant_ids(self, category_ids):
+        """
+        Return the IDs of the passed categories and all their descendants
+        """
+        ids = set()
+        for category_id in category_ids:
+            category = self.by_id.get(category_id)
+            if category is not None:
+                ids.add(category_id)
+                ids.update(descendant.id for descendant
+                           in self._descendants(category.path))
+        return ids
+
+    def get_full_name(self, pk):
+        return self.by_id[pk].full_name
+
+    def _descendants(self, path):
+        # Descendants directly follow their ancestor when ordered by path
+        start = bisect.bisect_right(self.paths, path)
+        end = start
+        while end < len(self.paths) and self.paths[end].startswith(path):
+            end += 1
+        return self.categories[start:end]
+
+
+def get_version():
+    version = cache.get(VERSION_CACHE_KEY)
+    if version is None:
+        version = uuid.uuid4().hex
+        # Another process might have set the version in the meantime; add()
+        # won't overwrite it.
+        if not cache.add(VERSION_CACHE_KEY, version, None):
+            version = cache.get(VERSION_CACHE_KEY, version)
+    return version
+
+
+def get_tree():
+    """
+    Return the current category tree, building it if it doesn't exist or if
+    it has been invalidated.
+    """
+    global _tree
+    version = get_version()
+    tree = _tree
+    if tree is None or tree.version != version:
+        with _lock:
+            if _tree is None or _tree.version != version:
+                _tree = CategoryTree(version)
+            tree = _tree
+    return tree
+
+
+def is_enabled():
+    return getattr(settings, 'OSCAR_CACHE_CATEGORY_TREE', False)
+
+
+def invalidate():
+    """
+    Discard the category tree in this and all other processes.
+
+    The version only changes once the current transaction is committed, as
+    other processes could otherwise rebuild the category tree from the data
+    before the commit and keep it under the new version.
+    """
+    _discard()
+    transaction.on_commit(_change_version)
+
+
+def _change_version():
+    cache.set(VERSION_CACHE_KEY, uuid.uuid4().hex, None)
+    _discard()
+
+
+def _discard():
+    global _tree
+    with _lock:
+        _tree = None
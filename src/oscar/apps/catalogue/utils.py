@@ -1,12 +1,16 @@
+import hashlib
+import multiprocessing
 import os
 import shutil
 import tarfile
 import tempfile
 import zipfile
 import zlib
+from collections import defaultdict
 
 from django.core.exceptions import FieldError
 from django.core.files import File
+from django.db.models import Max
 from django.db.transaction import atomic
 from django.utils.translation import ugettext_lazy as _
 from PIL import Image
@@ -149,3 +153,191 @@ class Importer(object):
 
     def _get_lookup_value_from_filename(self, filename):
         return os.path.splitext(filename)[0]
+
+
+class ParallelImporter(Importer):
+    """
+    Image importer for large folders or archives.
+
+    Images are imported in batches of ``batch_size``. A pool of ``workers``
+    processes verifies the images of a batch and computes a hash of their
+    contents, while the products are looked up for the whole batch at once.
+    Images identical to an existing image of their product (or to another
+    image in the batch) are skipped; existing images are read only once per
+    import to compute their hashes. The new images of a batch are then
+    created with a single query.
+
+    Invalid images are logged and skipped rather than aborting the import.
+    If a ``state_file`` is passed, the names of the imported files (and of
+    those skipped as identical to an existing image) are appended to it after
+    each batch, and files listed in it are skipped, so an interrupted import
+    can be resumed. Invalid and unmatched files are tried again.
+    """
+
+    def __init__(self, logger, field, workers=None, batch_size=500,
+                 state_file=None):
+        super(ParallelImporter, self).__init__(logger, field)
+        self.workers = workers
+        self.batch_size = batch_size
+        self.state_file = state_file
+        self._hashes = {}
+
+    def handle(self, dirname):
+        stats = {
+            'num_processed': 0,
+            'num_skipped': 0,
+            'num_invalid': 0}
+        image_dir, filenames = self._get_image_files(dirname)
+        if not image_dir:
+            raise InvalidImageArchive(_('%s is not a valid image archive')
+                                      % dirname)
+        done = self._load_state()
+        filenames = sorted(set(filenames) - done)
+        if done:
+            self.logger.info("Skipping %d images imported before" % len(done))
+
+        pool = multiprocessing.Pool(self.workers)
+        try:
+            for i in range(0, len(filenames), self.batch_size):
+                batch = filenames[i:i + self.batch_size]
+                finished = self._import_batch(pool, image_dir, batch, stats)
+                self._save_state(finished)
+                self.logger.info(
+                    "Imported %d of %d images" % (
+                        i + len(batch), len(filenames)))
+        finally:
+            pool.close()
+            pool.join()
+            if image_dir != dirname:
+                shutil.rmtree(image_dir)
+        self.logger.info("Finished image import: %(num_processed)d imported,"
+                         " %(num_skipped)d skipped, %(num_invalid)d invalid"
+                         % stats)
+
+    def _load_state(self):
+        if not self.state_file or not os.path.exists(self.state_file):
+            return set()
+        with open(self.state_file) as f:
+            return set(line.rstrip('\n') for line in f)
+
+    def _save_state(self, filenames):
+        if self.state_file:
+            with open(self.state_file, 'a') as f:
+                f.writelines(filename + '\n' for filename in filenames)
+
+    def _import_batch(self, pool, image_dir, filenames, stats):
+        """
+        Import the images of a batch. Returns the names of the files that
+        needn't be imported again.
+        """
+        inspections = pool.map(
+            inspect_image, [os.path.join(image_dir, filename)
+                            for filename in filenames])
+        products = self._get_products(filenames)
+        self._load_hashes(product_id for matches in products.values()
+                          for product_id in matches)
+
+        images = []
+        done = []
+        for filename, (content_hash, error) in zip(filenames, inspections):
+            lookup_value = self._get_lookup_value_from_filename(filename)
+            if error is not None:
+                self.logger.warning("%s is not a valid image (%s), skipping"
+                                    % (filename, error))
+                stats['num_invalid'] += 1
+                continue
+            matches = products.get(lookup_value, [])
+            if len(matches) != 1:
+                self.logger.warning(
+                    "%s item matching %s='%s', skipping" % (
+                        "Multiple products" if matches else "No",
+                        self._field, lookup_value))
+                stats['num_skipped'] += 1
+                continue
+            product_id = matches[0]
+            if content_hash in self._hashes[product_id]:
+                self.logger.warning("Identical image already exists for"
+                                    " %s='%s', skipping"
+                                    % (self._field, lookup_value))
+                stats['num_skipped'] += 1
+                done.append(filename)
+                continue
+            self._hashes[product_id].add(content_hash)
+            images.append((product_id, filename))
+            done.append(filename)
+
+        self._create_images(image_dir, images)
+        stats['num_processed'] += len(images)
+        return done
+
+    def _get_products(self, filenames):
+        """
+        Return a dict mapping the lookup values of the passed filenames to
+        the IDs of the matching products
+        """
+        lookup_values = [self._get_lookup_value_from_filename(filename)
+                         for filename in filenames]
+        try:
+            matches = Product._default_manager.filter(**{
+                '%s__in' % self._field: lookup_values}).values_list(
+                    self._field, 'id')
+            products = defaultdict(list)
+            for lookup_value, product_id in matches:
+                products[lookup_value].append(product_id)
+        except FieldError as e:
+            raise ImageImportError(e)
+        return products
+
+    def _load_hashes(self, product_ids):
+        """
+        Compute the hashes of the existing images of the passed products,
+        unless they are known already
+        """
+        product_ids = set(product_ids) - set(self._hashes)
+        for product_id in product_ids:
+            self._hashes[product_id] = set()
+        images = ProductImage._default_manager.filter(
+            product_id__in=product_ids)
+        for image in images:
+            try:
+                image.original.open('rb')
+                try:
+                    self._hashes[image.product_id].add(hashlib.sha1(
+                        image.original.read()).hexdigest())
+                finally:
+                    image.original.close()
+            except IOError:
+                # File probably doesn't exist
+                image.delete()
+
+    @atomic
+    def _create_images(self, image_dir, images):
+        next_indexes = dict(
+            ProductImage._default_manager.filter(
+                product_id__in=set(product_id for product_id, __ in images)
+            ).values_list('product').annotate(
+                Max('display_order')).order_by())
+        new_images = []
+        for product_id, filename in images:
+            next_index = next_indexes.get(product_id)
+            next_index = 0 if next_index is None else next_index + 1
+            next_indexes[product_id] = next_index
+            image = ProductImage(product_id=product_id,
+                                 display_order=next_index)
+            with open(os.path.join(image_dir, filename), 'rb') as f:
+                image.original.save(filename, File(f), save=False)
+            new_images.append(image)
+        ProductImage._default_manager.bulk_create(new_images)
+
+
+def inspect_image(file_path):
+    """
+    Verify the image at the passed path. Returns the hash of its contents
+    and None, or None and the error if it isn't a valid image.
+    """
+    try:
+        Image.open(file_path).verify()
+        with open(file_path, 'rb') as f:
+            return hashlib.sha1(f.read()).hexdigest(), None
+    except Exception as e:
+        return None, str(e)
@@ -8,6 +8,7 @@ from django.utils.http import urlquote
 from django.utils.translation import ugettext_lazy as _
 from django.views.generic import DetailView, TemplateView
 
+from oscar.apps.catalogue import tree
 from oscar.apps.catalogue.signals import product_viewed
 from oscar.core.loading import get_class, get_model
 
@@ -15,6 +16,7 @@ Product = get_model('catalogue', 'product')
 Category = get_model('catalogue', 'category')
 ProductAlert = get_model('customer', 'ProductAlert')
 ProductAlertForm = get_class('customer.forms', 'ProductAlertForm')
+PurchaseInfoMixin = get_class('partner.views', 'PurchaseInfoMixin')
 get_product_search_handler_class = get_class(
     'catalogue.search_handlers', 'get_product_search_handler_class')
 
@@ -110,7 +112,7 @@ class ProductDetailView(DetailView):
             '%s/detail.html' % (self.template_folder)]
 
 
-class CatalogueView(TemplateView):
+class CatalogueView(PurchaseInfoMixin, TemplateView):
     """
     Browse all products in the catalogue
     """
@@ -139,7 +141,7 @@ class CatalogueView(TemplateView):
         return ctx
 
 
-class ProductCategoryView(TemplateView):
+class ProductCategoryView(PurchaseInfoMixin, TemplateView):
     """
     Browse products in a given category
     """
@@ -175,6 +177,11 @@ class ProductCategoryView(TemplateView):
             # as ProductCategoryView does the lookup by primary key, which
             # will work even if the cache is stale. But if you override this
             # logic, consider if that still holds true.
+            if tree.is_enabled():
+                category = tree.get_tree().get_category(int(self.kwargs['pk']))
+                if category is None:
+                    raise Http404
+                return category
             return get_object_or_404(Category, pk=self.kwargs['pk'])
         elif 'category_slug' in self.kwargs:
             # DEPRECATED. TODO: Remove in Oscar 1.2.
@@ -186,23 +193,28 @@ class ProductCategoryView(TemplateView):
             # Note that currently we enforce uniqueness of slugs, but as that
             # might feasibly change soon, it makes sense to be forgiving here.
             concatenated_slugs = self.kwargs['category_slug']
-            slugs = concatenated_slugs.split(Category._slug_separator)
-            try:
-                last_slug = slugs[-1]
-            except IndexError:
-                raise Http404
-            else:
-                for category in Category.objects.filter(slug=last_slug):
-                    if category.full_slug == concatenated_slugs:
-                        message = (
-                            "Accessing categories without a primary key"
-                            " is deprecated will be removed in Oscar 1.2.")
-                        warnings.warn(message, DeprecationWarning)
-
-                        return category
+            for category in self.get_categories_by_slug(concatenated_slugs):
+                if category.full_slug == concatenated_slugs:
+                    message = (
+                        "Accessing categories without a primary key"
+                        " is deprecated will be removed in Oscar 1.2.")
+                    warnings.warn(message, DeprecationWarning)
+
+                    return category
 
         raise Http404
 
+    def get_categories_by_slug(self, concatenated_slugs):
+        """
+        Return the categories that might have the passed concatenated slugs
+        """
+        if tree.is_enabled():
+            category = tree.get_tree().get_category_by_full_slug(
+                concatenated_slugs)
+            return [category] if category is not None else []
+        last_slug = concatenated_slugs.split(Category._slug_separator)[-1]
+        return Category.objects.filter(slug=last_slug)
+
     def redirect_if_necessary(self, current_path, category):
         if self.enforce_paths:
             # Categories are fetched by primary key to allow slug changes.
@@ -218,6 +230,9 @@ class ProductCategoryView(TemplateView):
         """
         Return a list of the current category and its ancestors
         """
+        if tree.is_enabled():
+            return tree.get_tree().get_descendants(
+                self.category) + [self.category]
         return self.category.get_descendants_and_self()
 
     def get_context_data(self, **kwargs):
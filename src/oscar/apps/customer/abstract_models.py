@@ -6,12 +6,12 @@ from django.contrib.auth import models as auth_models
 from django.core.urlresolvers import reverse
 from django.core.validators import RegexValidator
 from django.db import models
-from django.template import Context, Template, TemplateDoesNotExist
-from django.template.loader import get_template
+from django.template import Context
 from django.utils import six, timezone
 from django.utils.encoding import python_2_unicode_compatible
 from django.utils.translation import ugettext_lazy as _
 
+from oscar.apps.customer import template_cache
 from oscar.apps.customer.managers import CommunicationTypeManager
 from oscar.core.compat import AUTH_USER_MODEL
 from oscar.models.fields import AutoSlugField
@@ -129,6 +129,51 @@ class AbstractEmail(models.Model):
             'user': self.user.get_username(), 'subject': self.subject}
 
 
+@python_2_unicode_compatible
+class AbstractOutboxEmail(models.Model):
+    """
+    An email that has been queued to be sent by the ``oscar_send_emails``
+    management command, if ``OSCAR_EMAIL_OUTBOX`` is set.
+
+    The audit records of the email (an ``Email`` for the user and a
+    ``CommunicationEvent`` for the order) are created once it has been sent.
+    """
+    recipient = models.EmailField(_('Recipient'), max_length=254)
+    subject = models.TextField(_('Subject'), max_length=255)
+    body_text = models.TextField(_("Body Text"), blank=True)
+    body_html = models.TextField(_("Body HTML"), blank=True)
+    user = models.ForeignKey(
+        AUTH_USER_MODEL, null=True, blank=True, related_name='+',
+        verbose_name=_("User"))
+    order = models.ForeignKey(
+        'order.Order', null=True, blank=True, related_name='+',
+        verbose_name=_("Order"))
+    event_type = models.ForeignKey(
+        'customer.CommunicationEventType', null=True, blank=True,
+        related_name='+', verbose_name=_("Event Type"))
+    date_created = models.DateTimeField(_("Date Created"), auto_now_add=True)
+
+    class Meta:
+        abstract = True
+        app_label = 'customer'
+        verbose_name = _('Outbox email')
+        verbose_name_plural = _('Outbox emails')
+
+    def __str__(self):
+        return _(u"Email to %(recipient)s with subject '%(subject)s'") % {
+            'recipient': self.recipient, 'subject': self.subject}
+
+    def get_messages(self):
+        """
+        Return the messages dict of the email, as passed to the
+        ``Dispatcher``
+        """
+        return {'subject': self.subject,
+                'body': self.body_text,
+                'html': self.body_html,
+                'sms': None}
+
+
 @python_2_unicode_compatible
 class AbstractCommunicationEventType(models.Model):
     """
@@ -208,9 +253,45 @@ class AbstractCommunicationEventType(models.Model):
         We look first at the field templates but fail over to
         a set of file templates that follow a conventional path.
         """
-        code = self.code.lower()
+        return self.render_messages([ctx])[0]
+
+    def render_messages(self, contexts):
+        """
+        Return a list of message dicts, one for each of the passed contexts.
+
+        The templates are only looked up once, so this should be used to
+        render the messages for many recipients at once.
+        """
+        templates = self.get_templates()
+
+        # Pass base URL for serving images within HTML emails
+        static_base_url = getattr(settings, 'OSCAR_STATIC_BASE_URL', None)
+
+        rendered = []
+        for ctx in contexts:
+            if ctx is None:
+                ctx = {}
+            ctx['static_base_url'] = static_base_url
+
+            messages = {}
+            for name, template in templates.items():
+                messages[name] = (
+                    template.render(Context(ctx)) if template else '')
+
+            # Ensure the email subject doesn't contain any newlines
+            messages['subject'] = messages['subject'].replace("\n", "")
+            messages['subject'] = messages['subject'].replace("\r", "")
+            rendered.append(messages)
+        return rendered
+
+    def get_templates(self):
+        """
+        Return a dict of message name to Template instances.
 
-        # Build a dict of message name to Template instances
+        The compiled templates are cached, keyed by the code of this event
+        type and the template field or file.
+        """
+        code = self.code.lower()
         templates = {'subject': 'email_subject_template',
                      'body': 'email_body_template',
                      'html': 'email_body_html_template',
@@ -219,30 +300,14 @@ class AbstractCommunicationEventType(models.Model):
             field = getattr(self, attr_name, None)
             if field is not None:
                 # Template content is in a model field
-                templates[name] = Template(field)
+                templates[name] = template_cache.get_field_template(
+                    code, attr_name, field)
             else:
                 # Model field is empty - look for a file template
                 template_name = getattr(self, "%s_file" % attr_name) % code
-                try:
-                    templates[name] = get_template(template_name)
-                except TemplateDoesNotExist:
-                    templates[name] = None
-
-        # Pass base URL for serving images within HTML emails
-        if ctx is None:
-            ctx = {}
-        ctx['static_base_url'] = getattr(
-            settings, 'OSCAR_STATIC_BASE_URL', None)
-
-        messages = {}
-        for name, template in templates.items():
-            messages[name] = template.render(Context(ctx)) if template else ''
-
-        # Ensure the email subject doesn't contain any newlines
-        messages['subject'] = messages['subject'].replace("\n", "")
-        messages['subject'] = messages['subject'].replace("\r", "")
-
-        return messages
+                templates[name] = template_cache.get_file_template(
+                    code, template_name)
+        return templates
 
     def __str__(self):
         return self.name
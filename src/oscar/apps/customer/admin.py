@@ -4,7 +4,9 @@ from oscar.core.loading import get_model
 
 CommunicationEventType = get_model('customer', 'CommunicationEventType')
 Email = get_model('customer', 'Email')
+OutboxEmail = get_model('customer', 'OutboxEmail')
 
 
 admin.site.register(Email)
+admin.site.register(OutboxEmail)
 admin.site.register(CommunicationEventType)
@@ -1,31 +1,101 @@
 import logging
+from collections import defaultdict
 
 from django.conf import settings
 from django.contrib.sites.models import Site
 from django.core import mail
-from django.db.models import Max
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Q
 from django.template import Context, loader
+from django.utils import timezone
 
+from oscar.apps.customer import template_cache
 from oscar.apps.customer.notifications import services
 from oscar.core.loading import get_class, get_model
 
 ProductAlert = get_model('customer', 'ProductAlert')
 Product = get_model('catalogue', 'Product')
+StockRecord = get_model('partner', 'StockRecord')
 Selector = get_class('partner.strategy', 'Selector')
 
 logger = logging.getLogger('oscar.alerts')
 
+# The number of products whose alerts are checked at once
+BATCH_SIZE = 500
 
-def send_alerts():
+# The time of the last run of ``oscar_send_alerts --incremental`` is kept in
+# Django's cache, so the next run only checks the products whose stock has
+# changed since.
+LAST_RUN_CACHE_KEY = 'oscar_alerts_last_run'
+
+
+def send_alerts(since=None, batch_size=BATCH_SIZE, shard=0, num_shards=1):
     """
     Send out product alerts
+
+    :param since: If passed, only the products whose stock records have
+                  changed since this time are checked
+    :param batch_size: The number of products checked at once
+    :param shard: The shard of the products to check, if the work is split
+                  across ``num_shards`` processes
+
+    Returns the number of emails sent.
     """
-    products = Product.objects.filter(
-        productalert__status=ProductAlert.ACTIVE
-    ).distinct()
-    logger.info("Found %d products with active alerts", products.count())
-    for product in products:
-        send_product_alerts(product)
+    product_ids = get_product_ids_with_alerts(since, shard, num_shards)
+    logger.info("Found %d products with active alerts", len(product_ids))
+
+    # All emails are sent over the same connection
+    connection = mail.get_connection()
+    connection.open()
+    num_emails = 0
+    try:
+        for i in range(0, len(product_ids), batch_size):
+            products = Product.objects.filter(
+                id__in=product_ids[i:i + batch_size]
+            ).select_related(
+                'product_class', 'parent', 'parent__product_class'
+            ).prefetch_related('stockrecords')
+            num_emails += send_alerts_for_products(products, connection)
+    finally:
+        connection.close()
+    return num_emails
+
+
+def get_product_ids_with_alerts(since=None, shard=0, num_shards=1):
+    """
+    Return the IDs of the products with stock records, that have active
+    alerts themselves or whose parent has
+
+    Products are split into shards by the ID of their parent, if they have
+    one, so that the children of a parent are all checked by the same shard
+    and its alerts aren't sent by several shards at once.
+    """
+    stockrecords = StockRecord.objects.filter(
+        Q(product__productalert__status=ProductAlert.ACTIVE) |
+        Q(product__parent__productalert__status=ProductAlert.ACTIVE))
+    if since is not None:
+        stockrecords = stockrecords.filter(date_updated__gte=since)
+    return sorted(set(
+        product_id for product_id, parent_id
+        in stockrecords.values_list('product_id', 'product__parent_id')
+        if (parent_id or product_id) % num_shards == shard))
+
+
+def get_last_run_cache_key(shard=0, num_shards=1):
+    return '%s_%d_%d' % (LAST_RUN_CACHE_KEY, shard, num_shards)
+
+
+def get_last_run(shard=0, num_shards=1):
+    """
+    Return the time the alerts of the passed shard were last sent, or
+    ``None`` if it isn't known
+    """
+    return cache.get(get_last_run_cache_key(shard, num_shards))
+
+
+def set_last_run(time, shard=0, num_shards=1):
+    cache.set(get_last_run_cache_key(shard, num_shards), time, None)
 
 
 def send_alert_confirmation(alert):
@@ -51,76 +121,154 @@ def send_alert_confirmation(alert):
 def send_product_alerts(product):
     """
     Check for notifications for this product and send email to users
-    if the product is back in stock. Add a little 'hurry' note if the
-    amount of in-stock items is less then the number of notifications.
+    if the product is back in stock.
     """
-    stockrecords = product.stockrecords.all()
-    num_stockrecords = len(stockrecords)
-    if not num_stockrecords:
-        return
+    return send_alerts_for_products([product])
 
-    logger.info("Sending alerts for '%s'", product)
-    alerts = ProductAlert.objects.filter(
-        product_id__in=(product.id, product.parent_id),
-        status=ProductAlert.ACTIVE,
-    )
 
-    # Determine 'hurry mode'
-    num_alerts = alerts.count()
-    if num_stockrecords == 1:
-        num_in_stock = stockrecords[0].num_in_stock
-        # hurry_mode is false if num_in_stock is None
-        hurry_mode = num_in_stock is not None and num_alerts < num_in_stock
-    else:
-        result = stockrecords.aggregate(max_in_stock=Max('num_in_stock'))
-        hurry_mode = result['max_in_stock'] is not None and \
-            num_alerts < result['max_in_stock']
-
-    # Load templates
-    message_tpl = loader.get_template('customer/alerts/message.html')
-    email_subject_tpl = loader.get_template('customer/alerts/emails/'
-                                            'alert_subject.txt')
-    email_body_tpl = loader.get_template('customer/alerts/emails/'
-                                         'alert_body.txt')
+def send_alerts_for_products(products, connection=None):
+    """
+    Check for notifications for the passed products and send email to users
+    if a product is back in stock. Add a little 'hurry' note if the
+    amount of in-stock items is less then the number of notifications.
 
+    The alerts of the products (and of their parents) are loaded with one
+    query, availability is checked with a bulk lookup per user, and the
+    notified alerts are closed with a single update. An alert on a parent
+    product is sent for the first of its children that is available. Returns
+    the number of emails sent.
+    """
+    products = list(products)
+    product_alerts = get_product_alerts(products)
+    if not product_alerts:
+        return 0
+    purchase_infos = get_purchase_infos(products, product_alerts)
+
+    templates = get_alert_templates()
+    site = Site.objects.get_current()
     emails = []
-    num_notifications = 0
-    selector = Selector()
-    for alert in alerts:
-        # Check if the product is available to this user
-        strategy = selector.strategy(user=alert.user)
-        data = strategy.fetch_for_product(product)
-        if not data.availability.is_available_to_buy:
+    notifications = []
+    sent_alert_ids = set()
+    for product in products:
+        if product.id not in product_alerts:
             continue
+        alerts = product_alerts[product.id]
+        hurry_mode = is_hurry_mode(product, len(alerts))
+        for alert in alerts:
+            if alert.id in sent_alert_ids:
+                continue
+            # Check if the product is available to this user
+            info = purchase_infos[alert.user_id][product.id]
+            if not info.availability.is_available_to_buy:
+                continue
 
-        ctx = Context({
-            'alert': alert,
-            'site': Site.objects.get_current(),
-            'hurry': hurry_mode,
-        })
-        if alert.user:
-            # Send a site notification
-            num_notifications += 1
-            services.notify_user(alert.user, message_tpl.render(ctx))
-
-        # Build email and add to list
-        emails.append(
-            mail.EmailMessage(
-                email_subject_tpl.render(ctx).strip(),
-                email_body_tpl.render(ctx),
-                settings.OSCAR_FROM_EMAIL,
-                [alert.get_email_address()],
+            ctx = {
+                'alert': alert,
+                'site': site,
+                'hurry': hurry_mode,
+            }
+            if alert.user:
+                # Send a site notification
+                notifications.append(
+                    (alert.user, templates['message'].render(ctx)))
+
+            # Build email and add to list
+            emails.append(
+                mail.EmailMessage(
+                    templates['subject'].render(ctx).strip(),
+                    templates['body'].render(ctx),
+                    settings.OSCAR_FROM_EMAIL,
+                    [alert.get_email_address()],
+                )
             )
-        )
-        alert.close()
+            sent_alert_ids.add(alert.id)
 
     # Send all emails in one go to prevent multiple SMTP
     # connections to be opened
     if emails:
-        connection = mail.get_connection()
-        connection.open()
+        connection = connection or mail.get_connection()
         connection.send_messages(emails)
-        connection.close()
+        with transaction.atomic():
+            services.notify_users_in_bulk(notifications)
+            ProductAlert.objects.filter(id__in=sent_alert_ids).update(
+                status=ProductAlert.CLOSED, date_closed=timezone.now())
 
-    logger.info("Sent %d notifications and %d emails", num_notifications,
+    logger.info("Sent %d notifications and %d emails", len(notifications),
                 len(emails))
+    return len(emails)
+
+
+def get_product_alerts(products):
+    """
+    Return a dict mapping the IDs of the passed products that have stock
+    records to their active alerts, including those of their parents
+    """
+    alerts_by_product = defaultdict(list)
+    alert_product_ids = set(product.id for product in products)
+    alert_product_ids.update(
+        product.parent_id for product in products if product.parent_id)
+    alerts = ProductAlert.objects.filter(
+        product_id__in=alert_product_ids,
+        status=ProductAlert.ACTIVE).select_related(
+            'user', 'product').order_by('pk')
+    for alert in alerts:
+        alerts_by_product[alert.product_id].append(alert)
+    if not alerts_by_product:
+        return {}
+
+    product_alerts = {}
+    for product in products:
+        alerts = (alerts_by_product[product.id] +
+                  alerts_by_product[product.parent_id])
+        if alerts and product.stockrecords.all():
+            product_alerts[product.id] = alerts
+    return product_alerts
+
+
+def get_purchase_infos(products, product_alerts):
+    """
+    Return a dict mapping the IDs of the users of the passed alerts (``None``
+    for anonymous alerts) to the purchase info of their products
+    """
+    # Availability may depend on the user, so the products are looked up in
+    # bulk for each user
+    products_to_check = defaultdict(list)
+    users = {}
+    for product in products:
+        for alert in product_alerts.get(product.id, ()):
+            users[alert.user_id] = alert.user
+            if product not in products_to_check[alert.user_id]:
+                products_to_check[alert.user_id].append(product)
+
+    selector = Selector()
+    purchase_infos = {}
+    for user_id, user_products in products_to_check.items():
+        strategy = selector.strategy(user=users[user_id])
+        purchase_infos[user_id] = strategy.fetch_for_products(user_products)
+    return purchase_infos
+
+
+def is_hurry_mode(product, num_alerts):
+    """
+    Return whether there are fewer alerts for the passed product than items
+    in stock
+    """
+    # hurry_mode is false if num_in_stock is None
+    stock = [stockrecord.num_in_stock
+             for stockrecord in product.stockrecords.all()
+             if stockrecord.num_in_stock is not None]
+    return bool(stock) and num_alerts < max(stock)
+
+
+def get_alert_templates():
+    """
+    Return the (compiled and cached) templates of alert messages
+    """
+    names = {
+        'message': 'customer/alerts/message.html',
+        'subject': 'customer/alerts/emails/alert_subject.txt',
+        'body': 'customer/alerts/emails/alert_body.txt',
+    }
+    return dict(
+        (name, template_cache.get_file_template('product_alert', path))
+        for name, path in names.items())
@@ -11,6 +11,13 @@ if not is_model_registered('customer', 'Email'):
     __all__.append('Email')
 
 
+if not is_model_registered('customer', 'OutboxEmail'):
+    class OutboxEmail(abstract_models.AbstractOutboxEmail):
+        pass
+
+    __all__.append('OutboxEmail')
+
+
 if not is_model_registered('customer', 'CommunicationEventType'):
     class CommunicationEventType(
             abstract_models.AbstractCommunicationEventType):
@@ -16,3 +16,13 @@ def notify_users(users, msg, **kwargs):
     """
     for user in users:
         notify_user(user, msg, **kwargs)
+
+
+def notify_users_in_bulk(notifications, **kwargs):
+    """
+    Send simple notifications to many users at once, given an iterable of
+    (user, message) pairs
+    """
+    Notification.objects.bulk_create([
+        Notification(recipient=user, subject=msg, **kwargs)
+        for user, msg in notifications])
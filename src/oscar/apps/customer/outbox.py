@@ -0,0 +1,84 @@
+import logging
+
+from django.conf import settings
+from django.core import mail
+from django.db import transaction
+
+from oscar.core.loading import get_class, get_model
+
+logger = logging.getLogger('oscar.customer')
+
+
+def is_enabled():
+    return getattr(settings, 'OSCAR_EMAIL_OUTBOX', False)
+
+
+def queue(recipient, messages, user=None, order=None, event_type=None):
+    """
+    Queue an email with the passed messages to be sent by
+    ``send_queued_emails``. An ``Email`` is recorded for the passed user, and
+    a ``CommunicationEvent`` for the passed order and event type, once it has
+    been sent.
+    """
+    OutboxEmail = get_model('customer', 'OutboxEmail')
+    return OutboxEmail._default_manager.create(
+        recipient=recipient,
+        subject=messages['subject'],
+        body_text=messages['body'] or '',
+        body_html=messages['html'] or '',
+        user=user, order=order, event_type=event_type)
+
+
+def send_queued_emails(batch_size=100, connection=None):
+    """
+    Send the queued emails in batches over a single mail connection, and
+    record their audit records. Returns the number of emails sent.
+
+    Each batch is sent and removed from the outbox in a transaction, so a
+    batch that fails to send is kept and retried on the next run. Only one
+    process should send the queued emails at a time.
+    """
+    OutboxEmail = get_model('customer', 'OutboxEmail')
+    Dispatcher = get_class('customer.utils', 'Dispatcher')
+    connection = connection or mail.get_connection()
+    dispatcher = Dispatcher(logger, mail_connection=connection)
+    num_sent = 0
+    connection.open()
+    try:
+        while True:
+            with transaction.atomic():
+                batch = list(
+                    OutboxEmail._default_manager.order_by('pk')[:batch_size])
+                if not batch:
+                    break
+                connection.send_messages([
+                    dispatcher.get_email_message(
+                        queued.recipient, queued.get_messages())
+                    for queued in batch])
+                record_audit(batch)
+                OutboxEmail._default_manager.filter(
+                    pk__in=[queued.pk for queued in batch]).delete()
+            num_sent += len(batch)
+    finally:
+        connection.close()
+    return num_sent
+
+
+def record_audit(queued_emails):
+    """
+    Create the ``Email`` and ``CommunicationEvent`` records of the passed
+    queued emails
+    """
+    Email = get_model('customer', 'Email')
+    CommunicationEvent = get_model('order', 'CommunicationEvent')
+    emails, events = [], []
+    for queued in queued_emails:
+        if queued.user_id is not None:
+            emails.append(Email(
+                user_id=queued.user_id, subject=queued.subject,
+                body_text=queued.body_text, body_html=queued.body_html))
+        if queued.order_id is not None and queued.event_type_id is not None:
+            events.append(CommunicationEvent(
+                order_id=queued.order_id, event_type_id=queued.event_type_id))
+    Email._default_manager.bulk_create(emails)
+    CommunicationEvent._default_manager.bulk_create(events)
@@ -1,10 +1,13 @@
+from django.core.signals import setting_changed
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
 
-from oscar.core.loading import get_class
+from oscar.core.loading import get_class, get_model
 
-from . import history
+from . import history, template_cache
 
 product_viewed = get_class('catalogue.signals', 'product_viewed')
+CommunicationEventType = get_model('customer', 'CommunicationEventType')
 
 
 @receiver(product_viewed)
@@ -15,3 +18,15 @@ def receive_product_view(sender, product, user, request, response, **kwargs):
     Requires the request and response objects due to dependence on cookies
     """
     return history.update(product, request, response)
+
+
+@receiver(post_save, sender=CommunicationEventType)
+@receiver(post_delete, sender=CommunicationEventType)
+def invalidate_templates(sender, instance, **kwargs):
+    template_cache.invalidate(instance.code.lower())
+
+
+@receiver(setting_changed)
+def invalidate_templates_on_setting_change(setting, **kwargs):
+    if setting in ('TEMPLATES', 'DEBUG'):
+        template_cache.invalidate()
@@ -0,0 +1,78 @@
+import hashlib
+import threading
+
+from django.conf import settings
+from django.template import Template, TemplateDoesNotExist
+from django.template.loader import get_template
+from django.utils.encoding import force_bytes
+
+# Compiled templates of the fields of communication event types, keyed by the
+# event type code and the template field, along with a hash of the template
+# content they were compiled from. As the hash is compared on each lookup, a
+# template edited in another process is never served stale. Only the latest
+# content of each field is kept, so previews of unsaved edits don't make the
+# cache grow.
+_field_templates = {}
+
+# Compiled file templates of communication event types, keyed by the event
+# type code and the template name
+_file_templates = {}
+
+_lock = threading.Lock()
+
+# Marks a file template that doesn't exist, so the lookup isn't repeated
+_MISSING = object()
+
+
+def get_field_template(code, field_name, content):
+    """
+    Return the compiled template of the passed template content of an event
+    type
+    """
+    key = (code, field_name)
+    content_hash = hashlib.sha1(force_bytes(content)).hexdigest()
+    cached = _field_templates.get(key)
+    if cached is not None and cached[0] == content_hash:
+        return cached[1]
+    template = Template(content)
+    with _lock:
+        _field_templates[key] = (content_hash, template)
+    return template
+
+
+def get_file_template(code, template_name):
+    """
+    Return the file template with the passed name, or ``None`` if it doesn't
+    exist
+    """
+    if settings.DEBUG:
+        # Pick up changes to the template files while developing
+        return _load_file_template(template_name)
+    key = (code, template_name)
+    template = _file_templates.get(key)
+    if template is None:
+        template = _load_file_template(template_name) or _MISSING
+        with _lock:
+            _file_templates[key] = template
+    return template if template is not _MISSING else None
+
+
+def _load_file_template(template_name):
+    try:
+        return get_template(template_name)
+    except TemplateDoesNotExist:
+        return None
+
+
+def invalidate(code=None):
+    """
+    Discard the compiled templates of the event type with the passed code, or
+    of all event types
+    """
+    with _lock:
+        for templates in (_field_templates, _file_templates):
+            if code is None:
+                templates.clear()
+            else:
+                for key in [key for key in templates if key[0] == code]:
+                    del templates[key]
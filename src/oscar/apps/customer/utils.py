@@ -7,6 +7,7 @@ from django.core.urlresolvers import reverse
 from django.utils.encoding import force_bytes
 from django.utils.http import urlsafe_base64_encode
 
+from oscar.apps.customer import outbox
 from oscar.core.loading import get_model
 
 CommunicationEvent = get_model('order', 'CommunicationEvent')
@@ -14,10 +15,20 @@ Email = get_model('customer', 'Email')
 
 
 class Dispatcher(object):
-    def __init__(self, logger=None):
+    """
+    Sends messages to customers and records them for audit.
+
+    If ``OSCAR_EMAIL_OUTBOX`` is set, emails to customers are queued in the
+    outbox instead, and sent (and recorded) by the ``oscar_send_emails``
+    management command. A mail connection can be passed to send several
+    emails over the same connection.
+    """
+
+    def __init__(self, logger=None, mail_connection=None):
         if not logger:
             logger = logging.getLogger(__name__)
         self.logger = logger
+        self.mail_connection = mail_connection
 
     # Public API methods
 
@@ -26,13 +37,20 @@ class Dispatcher(object):
         Dispatch one-off messages to explicitly specified recipient(s).
         """
         if messages['subject'] and messages['body']:
-            self.send_email_messages(recipient, messages)
+            if outbox.is_enabled():
+                outbox.queue(recipient, messages)
+            else:
+                self.send_email_messages(recipient, messages)
 
     def dispatch_order_messages(self, order, messages, event_type=None,
                                 **kwargs):
         """
         Dispatch order-related messages to the customer
         """
+        if outbox.is_enabled():
+            self.queue_order_messages(order, messages, event_type, **kwargs)
+            return
+
         if order.is_anonymous:
             if 'email_address' in kwargs:
                 self.send_email_messages(kwargs['email_address'], messages)
@@ -59,6 +77,36 @@ class Dispatcher(object):
 
     # Internal
 
+    def queue_order_messages(self, order, messages, event_type=None,
+                             **kwargs):
+        """
+        Queue the email of order-related messages in the outbox, along with
+        the communication event to record once it has been sent
+        """
+        user = None
+        if order.is_anonymous:
+            recipient = kwargs.get('email_address', order.guest_email)
+            if not recipient:
+                return
+        else:
+            user = order.user
+            recipient = None
+            if messages['subject'] and (messages['body'] or messages['html']):
+                recipient = user.email
+                if not recipient:
+                    self.logger.warning(
+                        "Unable to send email messages as user #%d has no "
+                        "email address", user.id)
+            if messages['sms']:
+                self.send_text_message(user, messages['sms'])
+
+        if recipient:
+            outbox.queue(recipient, messages, user=user, order=order,
+                         event_type=event_type)
+        elif event_type is not None:
+            CommunicationEvent._default_manager.create(
+                order=order, event_type=event_type)
+
     def send_user_email_messages(self, user, messages):
         """
         Sends message to the registered user / customer and collects data in
@@ -69,6 +117,10 @@ class Dispatcher(object):
                                 " no email address", user.id)
             return
 
+        if outbox.is_enabled():
+            outbox.queue(user.email, messages, user=user)
+            return
+
         email = self.send_email_messages(user.email, messages)
 
         # Is user is signed in, record the event for audit
@@ -82,6 +134,17 @@ class Dispatcher(object):
         """
         Plain email sending to the specified recipient
         """
+        email = self.get_email_message(recipient, messages)
+        self.logger.info("Sending email to %s" % recipient)
+        email.send()
+
+        return email
+
+    def get_email_message(self, recipient, messages):
+        """
+        Return the email message of the passed messages to the specified
+        recipient
+        """
         if hasattr(settings, 'OSCAR_FROM_EMAIL'):
             from_email = settings.OSCAR_FROM_EMAIL
         else:
@@ -92,16 +155,15 @@ class Dispatcher(object):
             email = EmailMultiAlternatives(messages['subject'],
                                            messages['body'],
                                            from_email=from_email,
-                                           to=[recipient])
+                                           to=[recipient],
+                                           connection=self.mail_connection)
             email.attach_alternative(messages['html'], "text/html")
         else:
             email = EmailMessage(messages['subject'],
                                  messages['body'],
                                  from_email=from_email,
-                                 to=[recipient])
-        self.logger.info("Sending email to %s" % recipient)
-        email.send()
-
+                                 to=[recipient],
+                                 connection=self.mail_connection)
         return email
 
     def send_text_message(self, user, event_type):
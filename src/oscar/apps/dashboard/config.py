@@ -6,3 +6,6 @@ class DashboardConfig(AppConfig):
     label = 'dashboard'
     name = 'oscar.apps.dashboard'
     verbose_name = _('Dashboard')
+
+    def ready(self):
+        from . import receivers  # noqa
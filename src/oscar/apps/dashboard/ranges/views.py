@@ -147,8 +147,7 @@ class RangeProductListView(BulkEditMixin, ListView):
         if not products:
             return
 
-        for product in products:
-            range.add_product(product)
+        range.add_products([product.id for product in products])
 
         num_products = len(products)
         messages.success(request, ungettext("%d product added to range",
@@ -0,0 +1,53 @@
+from datetime import timedelta
+
+from django.core.signals import setting_changed
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+from django.utils.timezone import now
+
+from oscar.apps.dashboard import statistics
+from oscar.core.compat import get_user_model
+from oscar.core.loading import get_class, get_model
+
+Basket = get_model('basket', 'Basket')
+order_placed = get_class('order.signals', 'order_placed')
+User = get_user_model()
+
+
+@receiver(order_placed)
+def count_order(sender, order, **kwargs):
+    if not statistics.is_enabled():
+        return
+    num_lines = order.lines.count()
+    counters = dict(
+        total_orders=1, total_orders_last_day=1,
+        total_lines=num_lines, total_lines_last_day=num_lines,
+        total_revenue=order.total_incl_tax,
+        total_revenue_last_day=order.total_incl_tax)
+    # The order's basket has been submitted, so it's no longer open
+    basket = order.basket
+    if basket is not None:
+        counters['total_open_baskets'] = -1
+        if basket.date_created > now() - timedelta(hours=24):
+            counters['total_open_baskets_last_day'] = -1
+    statistics.increment(**counters)
+
+
+@receiver(post_save, sender=User)
+def count_customer(sender, instance, created, **kwargs):
+    if created and statistics.is_enabled() and not kwargs.get('raw', False):
+        statistics.increment(total_customers=1, total_customers_last_day=1)
+
+
+@receiver(post_save, sender=Basket)
+def count_basket(sender, instance, created, **kwargs):
+    if (created and instance.status == Basket.OPEN and
+            statistics.is_enabled() and not kwargs.get('raw', False)):
+        statistics.increment(
+            total_open_baskets=1, total_open_baskets_last_day=1)
+
+
+@receiver(setting_changed)
+def invalidate_stats_on_setting_change(setting, **kwargs):
+    if setting == 'OSCAR_DASHBOARD_STATS_TIMEOUT':
+        statistics.invalidate()
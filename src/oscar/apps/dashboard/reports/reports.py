@@ -1,7 +1,9 @@
 from datetime import datetime, time
 
-from django.http import HttpResponse
-from django.utils import timezone
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import Q
+from django.http import HttpResponse, StreamingHttpResponse
+from django.utils import six, timezone
 from django.utils.translation import ugettext_lazy as _
 
 from oscar.core import utils
@@ -98,18 +100,134 @@ class ReportFormatter(object):
         return self.filename_template
 
 
+class CSVBuffer(object):
+    """
+    A file-like object collecting what the CSV writer writes, so that it can
+    be passed on in chunks to a streaming response
+    """
+
+    def __init__(self):
+        self.parts = []
+
+    def write(self, value):
+        self.parts.append(value)
+
+    def pop(self):
+        value = ''.join(self.parts) if self.parts else ''
+        self.parts = []
+        return value
+
+
 class ReportCSVFormatter(ReportFormatter):
+    #: Whether the report is streamed rather than built in memory. Streaming
+    #: formatters need to implement generate_rows.
+    streaming = False
+
+    #: The number of objects loaded with each query when streaming a report
+    chunk_size = 1000
 
     def get_csv_writer(self, file_handle, **kwargs):
         return UnicodeCSVWriter(open_file=file_handle, **kwargs)
 
     def generate_response(self, objects, **kwargs):
-        response = HttpResponse(content_type='text/csv')
+        if self.streaming:
+            response = StreamingHttpResponse(
+                self.stream_csv(objects), content_type='text/csv')
+        else:
+            response = HttpResponse(content_type='text/csv')
+            self.generate_csv(response, objects)
         response['Content-Disposition'] = 'attachment; filename=%s' \
             % self.filename(**kwargs)
-        self.generate_csv(response, objects)
         return response
 
+    def generate_csv(self, response, objects):
+        writer = self.get_csv_writer(response)
+        writer.writerows(self.generate_rows(objects))
+
+    def generate_rows(self, objects):
+        """
+        Yield the rows of the report, starting with the header row
+        """
+        raise NotImplementedError
+
+    def stream_csv(self, objects):
+        """
+        Yield the report's CSV in chunks of rows
+        """
+        buffer = CSVBuffer()
+        writer = self.get_csv_writer(buffer)
+        for num_rows, row in enumerate(self.generate_rows(objects), 1):
+            writer.writerow(row)
+            if num_rows % self.chunk_size == 0:
+                yield buffer.pop()
+        yield buffer.pop()
+
+    def iterate(self, queryset):
+        """
+        Yield the objects of the queryset in its ordering, with ties ordered
+        by primary key, loading them in chunks of chunk_size.
+
+        If the queryset is ordered by its primary key, or by a single
+        non-nullable field of its model, each chunk is loaded by filtering on
+        the values of the last object of the previous one rather than by
+        offset, so it's equally fast to load any chunk.
+        """
+        model = queryset.model
+        ordering = list(queryset.query.order_by or model._meta.ordering)
+        if not all(isinstance(name, six.string_types) for name in ordering):
+            # Ordered by expressions
+            return self.iterate_by_offset(queryset.order_by(
+                *(ordering + ['pk'])))
+        descending = bool(ordering) and ordering[0].startswith('-')
+        queryset = queryset.order_by(*(ordering + [
+            '-pk' if descending else 'pk']))
+        key_fields = [
+            name.lstrip('-') for name in ordering
+            if name.lstrip('-') not in ('pk', model._meta.pk.name)]
+        if len(key_fields) > 1 or (
+                key_fields and not self.is_key_field(model, key_fields[0])):
+            return self.iterate_by_offset(queryset)
+        return self.iterate_by_key(
+            queryset, key_fields[0] if key_fields else None, descending)
+
+    def is_key_field(self, model, name):
+        """
+        Return whether the objects can be loaded in chunks by the values of
+        the passed field
+        """
+        try:
+            field = model._meta.get_field(name)
+        except FieldDoesNotExist:
+            return False
+        return not field.null and not field.is_relation
+
+    def iterate_by_key(self, queryset, field_name, descending):
+        lookup = 'lt' if descending else 'gt'
+        chunk = list(queryset[:self.chunk_size])
+        while chunk:
+            for obj in chunk:
+                yield obj
+            if len(chunk) < self.chunk_size:
+                break
+            last = chunk[-1]
+            after_last = Q(**{'pk__%s' % lookup: last.pk})
+            if field_name is not None:
+                value = getattr(last, field_name)
+                after_last = (
+                    Q(**{'%s__%s' % (field_name, lookup): value})
+                    | (Q(**{field_name: value}) & after_last))
+            chunk = list(queryset.filter(after_last)[:self.chunk_size])
+
+    def iterate_by_offset(self, queryset):
+        offset = 0
+        while True:
+            chunk = list(queryset[offset:offset + self.chunk_size])
+            for obj in chunk:
+                yield obj
+            if len(chunk) < self.chunk_size:
+                break
+            offset += self.chunk_size
+
 
 class ReportHTMLFormatter(ReportFormatter):
 
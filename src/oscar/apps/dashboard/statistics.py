@@ -0,0 +1,100 @@
+import uuid
+from decimal import Decimal as D
+
+from django.conf import settings
+from django.core.cache import cache
+
+# The snapshot is kept in Django's cache so that it's shared between
+# processes and the counters can be incremented atomically.
+SNAPSHOT_CACHE_KEY = 'oscar_dashboard_stats'
+
+# The statistics which are kept up to date between snapshots. Revenue is
+# counted in hundredths, as cache counters are integers.
+COUNTERS = (
+    'total_orders', 'total_orders_last_day',
+    'total_lines', 'total_lines_last_day',
+    'total_revenue', 'total_revenue_last_day',
+    'total_customers', 'total_customers_last_day',
+    'total_open_baskets', 'total_open_baskets_last_day',
+)
+REVENUE_COUNTERS = ('total_revenue', 'total_revenue_last_day')
+
+
+def is_enabled():
+    return bool(getattr(settings, 'OSCAR_DASHBOARD_STATS_TIMEOUT', 0))
+
+
+def get_counter_key(version, name, decrement=False):
+    # Some cache backends (e.g. memcached) don't decrement counters below
+    # zero, so decrements are counted separately.
+    return 'oscar_dashboard_stats_%s_%s%s' % (
+        version, name, '_decrements' if decrement else '')
+
+
+def get_counter_keys(version):
+    """
+    Return a dict mapping the cache keys of the counters to their names and
+    signs
+    """
+    keys = {}
+    for name in COUNTERS:
+        keys[get_counter_key(version, name)] = (name, 1)
+        keys[get_counter_key(version, name, decrement=True)] = (name, -1)
+    return keys
+
+
+def take_snapshot(compute_stats):
+    """
+    Compute the statistics with the passed function and store them as the
+    current snapshot, which is kept for ``OSCAR_DASHBOARD_STATS_TIMEOUT``
+    seconds.
+    """
+    version = uuid.uuid4().hex
+    timeout = settings.OSCAR_DASHBOARD_STATS_TIMEOUT
+    cache.set_many(dict.fromkeys(get_counter_keys(version), 0), timeout)
+    snapshot = {'version': version, 'stats': compute_stats()}
+    cache.set(SNAPSHOT_CACHE_KEY, snapshot, timeout)
+    return snapshot
+
+
+def get_stats(compute_stats):
+    """
+    Return the statistics of the current snapshot, taking one if there is
+    none, updated by the counters incremented since.
+    """
+    snapshot = cache.get(SNAPSHOT_CACHE_KEY)
+    if snapshot is None:
+        snapshot = take_snapshot(compute_stats)
+    stats = dict(snapshot['stats'])
+    keys = get_counter_keys(snapshot['version'])
+    for key, value in cache.get_many(list(keys)).items():
+        name, sign = keys[key]
+        if name in REVENUE_COUNTERS:
+            value = D(value) / 100
+        stats[name] += sign * value
+    if stats['total_orders_last_day']:
+        stats['average_order_costs'] = (
+            stats['total_revenue_last_day'] / stats['total_orders_last_day'])
+    return stats
+
+
+def increment(**counters):
+    """
+    Add the passed values to the counters of the current snapshot
+    """
+    snapshot = cache.get(SNAPSHOT_CACHE_KEY)
+    if snapshot is None:
+        return
+    for name, value in counters.items():
+        if name in REVENUE_COUNTERS:
+            value = int(value * 100)
+        key = get_counter_key(snapshot['version'], name, decrement=value < 0)
+        try:
+            cache.incr(key, abs(value))
+        except ValueError:
+            # The counter has expired along with the snapshot
+            pass
+
+
+def invalidate():
+    cache.delete(SNAPSHOT_CACHE_KEY)
@@ -2,10 +2,12 @@ from datetime import timedelta
 from decimal import Decimal as D
 from decimal import ROUND_UP
 
-from django.db.models import Avg, Count, Sum
+from django.db.models import (
+    Case, Count, DecimalField, F, IntegerField, Sum, Value, When)
 from django.utils.timezone import now
 from django.views.generic import TemplateView
 
+from oscar.apps.dashboard import statistics as dashboard_stats
 from oscar.apps.promotions.models import AbstractPromotion
 from oscar.core.compat import get_user_model
 from oscar.core.loading import get_model
@@ -94,22 +96,24 @@ class IndexView(TemplateView):
         # Get datetime for 24 hours agao
         time_now = now().replace(minute=0, second=0)
         start_time = time_now - timedelta(hours=hours - 1)
-
-        orders_last_day = Order.objects.filter(date_placed__gt=start_time)
+        chunk = timedelta(hours=2)
 
         order_total_hourly = []
         for hour in range(0, hours, 2):
-            end_time = start_time + timedelta(hours=2)
-            hourly_orders = orders_last_day.filter(date_placed__gt=start_time,
-                                                   date_placed__lt=end_time)
-            total = hourly_orders.aggregate(
-                Sum('total_incl_tax')
-            )['total_incl_tax__sum'] or D('0.0')
             order_total_hourly.append({
-                'end_time': end_time,
-                'total_incl_tax': total
+                'end_time': start_time + timedelta(hours=hour + 2),
+                'total_incl_tax': D('0.0'),
             })
-            start_time = end_time
+
+        # Fetch the order totals with a single query and add them up per chunk
+        orders_last_day = Order.objects.filter(
+            date_placed__gt=start_time).values_list(
+                'date_placed', 'total_incl_tax').order_by()
+        for date_placed, total in orders_last_day:
+            index = int((date_placed - start_time).total_seconds() //
+                        chunk.total_seconds())
+            if index < len(order_total_hourly):
+                order_total_hourly[index]['total_incl_tax'] += total
 
         max_value = max([x['total_incl_tax'] for x in order_total_hourly])
         divisor = 1
@@ -139,55 +143,79 @@ class IndexView(TemplateView):
         return ctx
 
     def get_stats(self):
-        datetime_24hrs_ago = now() - timedelta(hours=24)
+        """
+        Return the statistics shown on the dashboard. If
+        ``OSCAR_DASHBOARD_STATS_TIMEOUT`` is set, they're taken from a
+        periodic snapshot, which is kept up to date by counting new orders,
+        customers and baskets.
+        """
+        if dashboard_stats.is_enabled():
+            return dashboard_stats.get_stats(self.compute_stats)
+        return self.compute_stats()
 
-        orders = Order.objects.all()
-        orders_last_day = orders.filter(date_placed__gt=datetime_24hrs_ago)
+    def compute_stats(self):
+        datetime_24hrs_ago = now() - timedelta(hours=24)
 
-        open_alerts = StockAlert.objects.filter(status=StockAlert.OPEN)
-        closed_alerts = StockAlert.objects.filter(status=StockAlert.CLOSED)
+        # Totals and the figures for the last day are computed together, with
+        # a single query per table.
+        def count_last_day(**filters):
+            return Count(Case(When(then=Value(1), **filters),
+                              output_field=IntegerField()))
+
+        def sum_last_day(field_name, **filters):
+            return Sum(Case(When(then=F(field_name), **filters),
+                            output_field=DecimalField()))
+
+        order_totals = Order.objects.aggregate(
+            total=Count('id'),
+            last_day=count_last_day(date_placed__gt=datetime_24hrs_ago),
+            revenue=Sum('total_incl_tax'),
+            revenue_last_day=sum_last_day(
+                'total_incl_tax', date_placed__gt=datetime_24hrs_ago))
+        line_totals = Line.objects.aggregate(
+            total=Count('id'),
+            last_day=count_last_day(order__date_placed__gt=datetime_24hrs_ago))
+        customer_totals = User.objects.aggregate(
+            total=Count('id'),
+            last_day=count_last_day(date_joined__gt=datetime_24hrs_ago))
+        basket_totals = self.get_open_baskets().aggregate(
+            total=Count('id'),
+            last_day=count_last_day(date_created__gt=datetime_24hrs_ago))
+        alert_totals = dict(StockAlert.objects.values_list(
+            'status').annotate(Count('id')).order_by())
+
+        revenue_last_day = order_totals['revenue_last_day'] or D('0.00')
+        average_order_costs = D('0.00')
+        if order_totals['last_day']:
+            average_order_costs = revenue_last_day / order_totals['last_day']
 
-        total_lines_last_day = Line.objects.filter(
-            order__in=orders_last_day).count()
         stats = {
-            'total_orders_last_day': orders_last_day.count(),
-            'total_lines_last_day': total_lines_last_day,
-
-            'average_order_costs': orders_last_day.aggregate(
-                Avg('total_incl_tax')
-            )['total_incl_tax__avg'] or D('0.00'),
-
-            'total_revenue_last_day': orders_last_day.aggregate(
-                Sum('total_incl_tax')
-            )['total_incl_tax__sum'] or D('0.00'),
+            'total_orders_last_day': order_totals['last_day'],
+            'total_lines_last_day': line_totals['last_day'],
+            'average_order_costs': average_order_costs,
+            'total_revenue_last_day': revenue_last_day,
 
             'hourly_report_dict': self.get_hourly_report(hours=24),
-            'total_customers_last_day': User.objects.filter(
-                date_joined__gt=datetime_24hrs_ago,
-            ).count(),
-
-            'total_open_baskets_last_day': self.get_open_baskets({
-                'date_created__gt': datetime_24hrs_ago
-            }).count(),
+            'total_customers_last_day': customer_totals['last_day'],
+            'total_open_baskets_last_day': basket_totals['last_day'],
 
             'total_products': Product.objects.count(),
-            'total_open_stock_alerts': open_alerts.count(),
-            'total_closed_stock_alerts': closed_alerts.count(),
+            'total_open_stock_alerts': alert_totals.get(StockAlert.OPEN, 0),
+            'total_closed_stock_alerts': alert_totals.get(
+                StockAlert.CLOSED, 0),
 
             'total_site_offers': self.get_active_site_offers().count(),
             'total_vouchers': self.get_active_vouchers().count(),
             'total_promotions': self.get_number_of_promotions(),
 
-            'total_customers': User.objects.count(),
-            'total_open_baskets': self.get_open_baskets().count(),
-            'total_orders': orders.count(),
-            'total_lines': Line.objects.count(),
-            'total_revenue': orders.aggregate(
-                Sum('total_incl_tax')
-            )['total_incl_tax__sum'] or D('0.00'),
+            'total_customers': customer_totals['total'],
+            'total_open_baskets': basket_totals['total'],
+            'total_orders': order_totals['total'],
+            'total_lines': line_totals['total'],
+            'total_revenue': order_totals['revenue'] or D('0.00'),
 
-            'order_status_breakdown': orders.order_by(
+            'order_status_breakdown': list(Order.objects.order_by(
                 'status'
-            ).values('status').annotate(freq=Count('id'))
+            ).values('status').annotate(freq=Count('id')))
         }
         return stats
@@ -2,13 +2,14 @@ import itertools
 import operator
 import os
 import re
+from collections import defaultdict
 from decimal import Decimal as D
 from decimal import ROUND_DOWN
 
 from django.conf import settings
 from django.core import exceptions
 from django.core.urlresolvers import reverse
-from django.db import models
+from django.db import IntegrityError, models, transaction
 from django.db.models.query import Q
 from django.template.defaultfilters import date as date_filter
 from django.utils.encoding import python_2_unicode_compatible
@@ -16,7 +17,9 @@ from django.utils.functional import cached_property
 from django.utils.timezone import get_current_timezone, now
 from django.utils.translation import ugettext_lazy as _
 
+from oscar.apps.catalogue import tree as category_tree
 from oscar.apps.offer import results, utils
+from oscar.apps.offer import snapshot as offer_snapshot
 from oscar.apps.offer.managers import ActiveOfferManager
 from oscar.core.compat import AUTH_USER_MODEL
 from oscar.core.loading import get_class, get_model
@@ -24,6 +27,7 @@ from oscar.models import fields
 from oscar.templatetags.currency_filters import currency
 
 BrowsableRangeManager = get_class('offer.managers', 'BrowsableRangeManager')
+RangeMembershipIndex = get_class('offer.membership', 'RangeMembershipIndex')
 
 
 @python_2_unicode_compatible
@@ -456,10 +460,11 @@ class AbstractBenefit(models.Model):
             # Short-circuit again.
             if self.__class__ == klass:
                 return self
-            return klass(**field_dict)
+            return utils.copy_range_cache(self, klass(**field_dict))
 
         if self.type in klassmap:
-            return klassmap[self.type](**field_dict)
+            return utils.copy_range_cache(
+                self, klassmap[self.type](**field_dict))
         raise RuntimeError("Unrecognised benefit type (%s)" % self.type)
 
     def __str__(self):
@@ -675,9 +680,10 @@ class AbstractCondition(models.Model):
             # Short-circuit again.
             if self.__class__ == klass:
                 return self
-            return klass(**field_dict)
+            return utils.copy_range_cache(self, klass(**field_dict))
         if self.type in klassmap:
-            return klassmap[self.type](**field_dict)
+            return utils.copy_range_cache(
+                self, klassmap[self.type](**field_dict))
         raise RuntimeError("Unrecognised condition type (%s)" % self.type)
 
     def __str__(self):
@@ -840,6 +846,38 @@ class AbstractRange(models.Model):
             relation.display_order = display_order
             relation.save()
 
+    def add_products(self, product_ids, display_order=0):
+        """
+        Add the products with the passed IDs to the range with a constant
+        number of queries. Products that already have a relation to the range
+        are left unchanged. Returns the number of products added.
+        """
+        RangeProduct = get_model('offer', 'RangeProduct')
+        product_ids = set(product_ids)
+        if not product_ids:
+            return 0
+        existing = RangeProduct.objects.filter(
+            range=self, product_id__in=product_ids).values_list(
+                'product_id', flat=True)
+        relations = [
+            RangeProduct(range=self, product_id=product_id,
+                         display_order=display_order)
+            for product_id in product_ids - set(existing)]
+        try:
+            with transaction.atomic():
+                RangeProduct.objects.bulk_create(relations)
+        except IntegrityError:
+            # Some of the products have been added in the meantime
+            for relation in relations:
+                RangeProduct.objects.get_or_create(
+                    range=self, product_id=relation.product_id,
+                    defaults={'display_order': display_order})
+        # bulk_create doesn't send the signals that invalidate the snapshot
+        # of site offers
+        if relations and offer_snapshot.is_enabled():
+            offer_snapshot.invalidate()
+        return len(relations)
+
     def remove_product(self, product):
         """
         Remove product from range. To save on queries, this function does not
@@ -857,7 +895,13 @@ class AbstractRange(models.Model):
     def contains_product(self, product):  # noqa (too complex (12))
         """
         Check whether the passed product is part of this range.
+
+        If the product has been annotated with precomputed range memberships
+        (see ``oscar.apps.offer.membership``), these are used instead.
         """
+        memberships = getattr(product, '_range_memberships', None)
+        if memberships is not None and self.id in memberships:
+            return memberships[self.id]
 
         # Delegate to a proxy class if one is provided
         if self.proxy:
@@ -876,13 +920,11 @@ class AbstractRange(models.Model):
             return True
         if product.id in included_product_ids:
             return True
-        test_categories = self.included_categories.all()
-        if test_categories:
-            for category in product.get_categories().all():
-                for test_category in test_categories:
-                    if category == test_category \
-                            or category.is_descendant_of(test_category):
-                        return True
+        category_ids = self._category_ids()
+        if category_ids:
+            product_category_ids = product.get_categories().values_list(
+                'pk', flat=True)
+            return not category_ids.isdisjoint(product_category_ids)
         return False
 
     # Shorter alias
@@ -924,15 +966,26 @@ class AbstractRange(models.Model):
         return self.__class_ids
 
     def _category_ids(self):
-        if self.__category_ids is None:
-            category_ids_list = list(
+        """
+        Return the IDs of the included categories and all their descendants
+        """
+        if not self.id:
+            return set()
+        if self.__category_ids is None and category_tree.is_enabled():
+            self.__category_ids = category_tree.get_tree().get_descendant_ids(
                 self.included_categories.values_list('pk', flat=True))
-            for category in self.included_categories.all():
-                children_ids = category.get_descendants().values_list(
-                    'pk', flat=True)
-                category_ids_list.extend(list(children_ids))
-
-            self.__category_ids = category_ids_list
+        elif self.__category_ids is None:
+            paths = self.included_categories.values_list('path', flat=True)
+            query = Q()
+            for path in paths:
+                query |= Q(path__startswith=path)
+            if query:
+                Category = get_model('catalogue', 'Category')
+                self.__category_ids = set(
+                    Category.objects.filter(query).values_list(
+                        'pk', flat=True))
+            else:
+                self.__category_ids = set()
 
         return self.__category_ids
 
@@ -1058,37 +1111,66 @@ class AbstractRangeProductFileUpload(models.Model):
     def was_processing_successful(self):
         return self.status == self.PROCESSED
 
-    def process(self):
+    def process(self, chunk_size=1000):
         """
         Process the file upload and add products to the range
+
+        The IDs are read from the file and processed in chunks of
+        ``chunk_size``, so the number of queries depends on the number of
+        IDs in the file rather than on the number of products in the range.
+        """
+        stats = {'new': 0, 'unknown': 0, 'duplicate': 0}
+        membership = RangeMembershipIndex()
+        seen_ids, added_product_ids, chunk = set(), set(), []
+        for id in self.extract_ids():
+            if id in seen_ids:
+                continue
+            seen_ids.add(id)
+            chunk.append(id)
+            if len(chunk) >= chunk_size:
+                self.process_ids(chunk, membership, added_product_ids, stats)
+                chunk = []
+        if chunk:
+            self.process_ids(chunk, membership, added_product_ids, stats)
+        self.mark_as_processed(
+            stats['new'], stats['unknown'], stats['duplicate'])
+
+    def process_ids(self, ids, membership, added_product_ids, stats):
+        """
+        Add the products matching the passed SKUs or UPCs to the range, and
+        update the stats
         """
-        all_ids = set(self.extract_ids())
-        products = self.range.all_products()
-        existing_skus = products.values_list(
-            'stockrecords__partner_sku', flat=True)
-        existing_skus = set(filter(bool, existing_skus))
-        existing_upcs = products.values_list('upc', flat=True)
-        existing_upcs = set(filter(bool, existing_upcs))
-        existing_ids = existing_skus.union(existing_upcs)
-        new_ids = all_ids - existing_ids
-
-        Product = models.get_model('catalogue', 'Product')
-        products = Product._default_manager.filter(
-            models.Q(stockrecords__partner_sku__in=new_ids) |
-            models.Q(upc__in=new_ids))
-        for product in products:
-            self.range.add_product(product)
-
-        # Processing stats
-        found_skus = products.values_list(
-            'stockrecords__partner_sku', flat=True)
-        found_skus = set(filter(bool, found_skus))
-        found_upcs = set(filter(bool, products.values_list('upc', flat=True)))
-        found_ids = found_skus.union(found_upcs)
-        missing_ids = new_ids - found_ids
-        dupes = set(all_ids).intersection(existing_ids)
-
-        self.mark_as_processed(products.count(), len(missing_ids), len(dupes))
+        Product = get_model('catalogue', 'Product')
+        StockRecord = get_model('partner', 'StockRecord')
+        products = defaultdict(set)
+        for upc, product_id in Product._default_manager.filter(
+                upc__in=ids).order_by().values_list('upc', 'id'):
+            products[upc].add(product_id)
+        for sku, product_id in StockRecord._default_manager.filter(
+                partner_sku__in=ids).values_list('partner_sku', 'product_id'):
+            products[sku].add(product_id)
+
+        product_ids = set().union(*products.values())
+        ranges = membership.ranges_for_products(
+            product_ids - added_product_ids, ranges=[self.range])
+        in_range = added_product_ids.union(
+            product_id for product_id, range_ids in ranges.items()
+            if range_ids)
+
+        # Products added for an earlier ID of the chunk count as in the range,
+        # so the stats don't depend on where the chunks start
+        new_product_ids = set()
+        for id in ids:
+            if not products[id]:
+                stats['unknown'] += 1
+            elif products[id] & in_range:
+                stats['duplicate'] += 1
+            else:
+                new_product_ids.update(products[id])
+                in_range.update(products[id])
+        self.range.add_products(new_product_ids)
+        added_product_ids.update(new_product_ids)
+        stats['new'] += len(new_product_ids)
 
     def extract_ids(self):
         """
@@ -1,11 +1,14 @@
 import logging
 from itertools import chain
 
+from django.conf import settings
 from django.db.models import Q
 from django.utils.timezone import now
 
-from oscar.apps.offer import results
-from oscar.core.loading import get_model
+from oscar.apps.offer import results, snapshot
+from oscar.core.loading import get_class, get_model
+
+RangeMembershipIndex = get_class('offer.membership', 'RangeMembershipIndex')
 
 logger = logging.getLogger('oscar.offers')
 
@@ -22,30 +25,178 @@ class Applicator(object):
 
         The request is passed too as sometimes the available offers
         are dependent on the user (eg session-based offers).
+
+        If ``OSCAR_INCREMENTAL_OFFER_APPLICATION`` is enabled and the basket
+        knows which lines changed since offers were last applied, only the
+        offers affected by the change are re-applied.
         """
         offers = self.get_offers(basket, user, request)
-        self.apply_offers(basket, offers)
+        changes = basket.pop_offer_changes()
+        if changes is not None and getattr(
+                settings, 'OSCAR_INCREMENTAL_OFFER_APPLICATION', False):
+            previous_applications, changed_product_ids = changes
+            self.reapply_offers(
+                basket, offers, previous_applications, changed_product_ids)
+        else:
+            self.apply_offers(basket, offers)
 
     def apply_offers(self, basket, offers):
+        self.cache_range_memberships(basket, offers)
         applications = results.OfferApplications()
         for offer in offers:
-            num_applications = 0
-            # Keep applying the offer until either
-            # (a) We reach the max number of applications for the offer.
-            # (b) The benefit can't be applied successfully.
-            while num_applications < offer.get_max_applications(basket.owner):
-                result = offer.apply_benefit(basket)
-                num_applications += 1
-                if not result.is_successful:
-                    break
-                applications.add(offer, result)
-                if result.is_final:
-                    break
+            self.apply_offer(basket, offer, applications)
+        self.record_line_discounts(basket, offers, applications)
 
         # Store this list of discounts with the basket so it can be
         # rendered in templates
         basket.offer_applications = applications
 
+    def apply_offer(self, basket, offer, applications):
+        num_applications = 0
+        # Keep applying the offer until either
+        # (a) We reach the max number of applications for the offer.
+        # (b) The benefit can't be applied successfully.
+        while num_applications < offer.get_max_applications(basket.owner):
+            result = offer.apply_benefit(basket)
+            num_applications += 1
+            if not result.is_successful:
+                break
+            applications.add(offer, result)
+            if result.is_final:
+                break
+
+    def reapply_offers(self, basket, offers, previous_applications,
+                       changed_product_ids):
+        """
+        Re-apply the offers affected by changes to the lines of the passed
+        products, and carry over the discounts of all other offers.
+
+        An offer is affected if its ranges contain one of the changed
+        products, or if it shares basket lines with an affected offer (as
+        offers consume the lines they're applied to). All offers are
+        re-applied if the set of offers has changed, or if an offer has a
+        custom condition or benefit or a condition without a range, as we
+        can't tell which lines those depend on.
+        """
+        offer_ids = [offer.id for offer in offers]
+        if (offer_ids != previous_applications.offer_ids or
+                not all(self.is_reapplicable(offer) for offer in offers)):
+            return self.apply_offers(basket, offers)
+
+        lines = basket.all_lines()
+        memberships = self.cache_range_memberships(
+            basket, offers, changed_product_ids)
+        affected_offer_ids, affected_line_ids = self.get_affected_offers(
+            offers, lines, memberships, changed_product_ids)
+
+        line_discounts = previous_applications.line_discounts
+        for line in lines:
+            if line.id not in affected_line_ids and line.id in line_discounts:
+                line.set_discount_state(line_discounts[line.id])
+
+        applications = results.OfferApplications()
+        for offer in offers:
+            if offer.id in affected_offer_ids:
+                self.apply_offer(basket, offer, applications)
+            elif offer.id in previous_applications.applications:
+                applications.applications[offer.id] = (
+                    previous_applications.applications[offer.id])
+        self.record_line_discounts(basket, offers, applications)
+        basket.offer_applications = applications
+
+    def get_affected_offers(self, offers, lines, memberships,
+                            changed_product_ids):
+        """
+        Return the IDs of the offers affected by changes to the lines of the
+        passed products, and the IDs of the lines those offers may use.
+        """
+        offer_lines = {}
+        affected_offer_ids = set()
+        for offer in offers:
+            range_ids = set(r.id for r in self.get_offer_ranges([offer]))
+            offer_lines[offer.id] = set(
+                line.id for line in lines
+                if range_ids & memberships.get(line.product_id, set()))
+            if any(range_ids & memberships.get(product_id, set())
+                   for product_id in changed_product_ids):
+                affected_offer_ids.add(offer.id)
+
+        # Offers sharing lines with affected offers are affected too
+        affected_line_ids = set()
+        while True:
+            for offer_id in affected_offer_ids:
+                affected_line_ids.update(offer_lines[offer_id])
+            linked_offer_ids = set(
+                offer_id for offer_id, line_ids in offer_lines.items()
+                if offer_id not in affected_offer_ids and
+                line_ids & affected_line_ids)
+            if not linked_offer_ids:
+                return affected_offer_ids, affected_line_ids
+            affected_offer_ids.update(linked_offer_ids)
+
+    def is_reapplicable(self, offer):
+        """
+        Test whether the lines an offer depends on can be determined from its
+        ranges, which is required to re-apply offers incrementally.
+        """
+        condition, benefit = offer.condition, offer.benefit
+        return (condition.range is not None and
+                not condition.proxy_class and not benefit.proxy_class)
+
+    def record_line_discounts(self, basket, offers, applications):
+        """
+        Record the offers that were applied and the resulting discount state
+        of each line, which is needed to re-apply offers incrementally.
+        """
+        applications.offer_ids = [offer.id for offer in offers]
+        applications.line_discounts = dict(
+            (line.id, line.get_discount_state())
+            for line in basket.all_lines())
+
+    def get_offer_ranges(self, offers):
+        ranges = []
+        for offer in offers:
+            ranges.extend([offer.condition.range, offer.benefit.range])
+        return [r for r in ranges if r is not None]
+
+    def cache_range_memberships(self, basket, offers, product_ids=()):
+        """
+        Work out which of the offers' ranges contain the basket's products in
+        one go, so conditions and benefits don't need to query the database
+        for every line they check.
+
+        Returns a dict mapping the IDs of the basket's products (and any
+        other passed product IDs) to the IDs of the ranges containing them.
+        """
+        lines = basket.all_lines()
+        product_ids = set(product_ids)
+        product_ids.update(line.product_id for line in lines)
+        ranges = self.get_offer_ranges(offers)
+        if not product_ids or not ranges:
+            return {}
+
+        memberships = self.get_range_index().ranges_for_products(
+            product_ids, ranges)
+        range_ids = set(r.id for r in ranges)
+        for line in lines:
+            product_range_ids = memberships.get(line.product_id, set())
+            line.product._range_memberships = {
+                range_id: range_id in product_range_ids
+                for range_id in range_ids}
+        return memberships
+
+    def get_range_index(self):
+        """
+        Return the index used to look up range memberships.
+
+        If site offers are cached, the index is shared with the snapshot so
+        the ranges' membership data is only loaded once. Otherwise, a fresh
+        index is used each time.
+        """
+        if snapshot.is_enabled():
+            return snapshot.get_snapshot().index
+        return RangeMembershipIndex()
+
     def get_offers(self, basket, user=None, request=None):
         """
         Return all offers to apply to the basket.
@@ -66,7 +217,14 @@ class Applicator(object):
     def get_site_offers(self):
         """
         Return site offers that are available to all users
+
+        If ``OSCAR_CACHE_SITE_OFFERS`` is enabled, the offers are served from
+        an in-memory snapshot which is invalidated whenever offers, ranges or
+        product categories change.
         """
+        if snapshot.is_enabled():
+            return snapshot.get_site_offers()
+
         cutoff = now()
         date_based = Q(
             Q(start_datetime__lte=cutoff),
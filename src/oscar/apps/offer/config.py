@@ -6,3 +6,6 @@ class OfferConfig(AppConfig):
     label = 'offer'
     name = 'oscar.apps.offer'
     verbose_name = _('Offer')
+
+    def ready(self):
+        from . import receivers  # noqa
@@ -0,0 +1,208 @@
+from collections import defaultdict
+
+from django.db.models import Q
+
+from oscar.core.loading import get_model
+
+
+class RangeMembership(object):
+    """
+    The resolved sets of IDs that decide whether a product is in a range.
+    """
+
+    def __init__(self, range_id, includes_all_products=False):
+        self.range_id = range_id
+        self.includes_all_products = includes_all_products
+        # Included and excluded products contain the IDs of their children
+        self.included_product_ids = set()
+        self.excluded_product_ids = set()
+        self.class_ids = set()
+        # Included categories and all their descendants
+        self.category_ids = set()
+
+    def contains(self, product_id, parent_id, class_id, category_ids):
+        """
+        Mirrors ``AbstractRange.contains_product`` for the passed product
+        data.
+        """
+        if product_id in self.excluded_product_ids:
+            return False
+        if self.includes_all_products:
+            return True
+        if class_id in self.class_ids:
+            return True
+        if (product_id in self.included_product_ids or
+                parent_id in self.included_product_ids):
+            return True
+        return not self.category_ids.isdisjoint(category_ids)
+
+
+class RangeMembershipIndex(object):
+    """
+    Answers which ranges contain which products, for many products at once.
+
+    The membership data of each range (its included and excluded products
+    with their children, product classes and category subtrees) is loaded
+    on first use with a constant number of queries for any number of ranges,
+    and kept until it's invalidated. Looking up the ranges for a batch of
+    products then costs at most two queries, regardless of the number of
+    products and ranges.
+
+    Ranges with a custom proxy class can't be indexed; they're evaluated by
+    calling ``contains_product`` on each product instead.
+    """
+
+    def __init__(self):
+        self._memberships = {}
+
+    def ranges_for_products(self, product_ids, ranges=None):
+        """
+        Return a dict mapping each of the passed product IDs to the set of
+        IDs of the ranges that contain it.
+
+        Only the passed range instances are considered, or all ranges if
+        none are passed.
+        """
+        Range = get_model('offer', 'Range')
+        product_ids = set(product_ids)
+        if ranges is None:
+            ranges = Range.objects.all()
+        ranges = {range.id: range for range in ranges if range.id}
+
+        result = {product_id: set() for product_id in product_ids}
+        if not product_ids or not ranges:
+            return result
+
+        proxy_ranges = [r for r in ranges.values() if r.proxy]
+        memberships = self.get_memberships(
+            [r for r in ranges.values() if not r.proxy])
+
+        for product_id, parent_id, class_id, category_ids in (
+                self.get_product_data(product_ids, memberships)):
+            for membership in memberships:
+                if membership.contains(
+                        product_id, parent_id, class_id, category_ids):
+                    result[product_id].add(membership.range_id)
+
+        if proxy_ranges:
+            Product = get_model('catalogue', 'Product')
+            for product in Product.objects.filter(id__in=product_ids):
+                for range in proxy_ranges:
+                    if range.contains_product(product):
+                        result[product.id].add(range.id)
+        return result
+
+    def get_memberships(self, ranges):
+        """
+        Return the membership data for the passed ranges, loading any that
+        aren't cached yet.
+        """
+        missing = [r for r in ranges if r.id not in self._memberships]
+        if missing:
+            self._memberships.update(self.load_memberships(missing))
+        return [self._memberships[r.id] for r in ranges]
+
+    def load_memberships(self, ranges):
+        Range = get_model('offer', 'Range')
+        RangeProduct = get_model('offer', 'RangeProduct')
+
+        memberships = {
+            r.id: RangeMembership(r.id, r.includes_all_products)
+            for r in ranges}
+        range_ids = list(memberships)
+        # Ranges that include all products only need their exclusions
+        partial_ids = [
+            r.id for r in ranges if not r.includes_all_products]
+
+        excluded = Range.excluded_products.through.objects.filter(
+            range_id__in=range_ids).values_list(
+            'range_id', 'product_id', 'product__children__id')
+        for range_id, product_id, child_id in excluded:
+            memberships[range_id].excluded_product_ids.update(
+                {product_id, child_id} - {None})
+
+        if not partial_ids:
+            return memberships
+
+        included = RangeProduct.objects.filter(
+            range_id__in=partial_ids).values_list(
+            'range_id', 'product_id', 'product__children__id')
+        for range_id, product_id, child_id in included:
+            memberships[range_id].included_product_ids.update(
+                {product_id, child_id} - {None})
+
+        classes = Range.classes.through.objects.filter(
+            range_id__in=partial_ids).values_list(
+            'range_id', 'productclass_id')
+        for range_id, class_id in classes:
+            memberships[range_id].class_ids.add(class_id)
+
+        categories = Range.included_categories.through.objects.filter(
+            range_id__in=partial_ids).values_list(
+            'range_id', 'category__path')
+        ranges_by_path = defaultdict(set)
+        for range_id, path in categories:
+            ranges_by_path[path].add(range_id)
+        if ranges_by_path:
+            self.load_category_subtrees(memberships, ranges_by_path)
+
+        return memberships
+
+    def load_category_subtrees(self, memberships, ranges_by_path):
+        """
+        Add all categories within the included categories' subtrees with a
+        single query, by matching on the materialised path.
+        """
+        Category = get_model('catalogue', 'Category')
+        query = Q()
+        for path in ranges_by_path:
+            query |= Q(path__startswith=path)
+        steplen = Category.steplen
+        for category_id, path in Category.objects.filter(query).values_list(
+                'id', 'path'):
+            for length in range(steplen, len(path) + 1, steplen):
+                for range_id in ranges_by_path.get(path[:length], ()):
+                    memberships[range_id].category_ids.add(category_id)
+
+    def get_product_data(self, product_ids, memberships):
+        """
+        Yield (product ID, parent ID, class ID, category IDs) tuples for the
+        passed product IDs. Child products inherit their parent's product
+        class and categories.
+        """
+        if all(m.includes_all_products for m in memberships):
+            # Only exclusions matter, which only need the product ID
+            for product_id in product_ids:
+                yield product_id, None, None, ()
+            return
+
+        Product = get_model('catalogue', 'Product')
+        ProductCategory = get_model('catalogue', 'ProductCategory')
+
+        rows = list(Product.objects.filter(id__in=product_ids).values_list(
+            'id', 'parent_id', 'product_class_id',
+            'parent__product_class_id'))
+
+        categories = defaultdict(set)
+        if any(m.category_ids for m in memberships):
+            owner_ids = {parent_id or product_id
+                         for product_id, parent_id, __, __ in rows}
+            for owner_id, category_id in ProductCategory.objects.filter(
+                    product_id__in=owner_ids).values_list(
+                    'product_id', 'category_id'):
+                categories[owner_id].add(category_id)
+
+        for product_id, parent_id, class_id, parent_class_id in rows:
+            yield (product_id, parent_id, parent_class_id or class_id,
+                   categories.get(parent_id or product_id, ()))
+
+    def invalidate(self, range_ids=None):
+        """
+        Discard the cached membership data of the passed ranges, or of all
+        ranges if none are passed.
+        """
+        if range_ids is None:
+            self._memberships.clear()
+        else:
+            for range_id in range_ids:
+                self._memberships.pop(range_id, None)
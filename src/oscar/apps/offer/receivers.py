@@ -0,0 +1,49 @@
+from django.core.signals import setting_changed
+from django.db.models.signals import m2m_changed, post_delete, post_save
+
+from oscar.apps.offer import snapshot
+from oscar.core.loading import get_model
+
+ConditionalOffer = get_model('offer', 'ConditionalOffer')
+Condition = get_model('offer', 'Condition')
+Benefit = get_model('offer', 'Benefit')
+Range = get_model('offer', 'Range')
+RangeProduct = get_model('offer', 'RangeProduct')
+Product = get_model('catalogue', 'Product')
+ProductCategory = get_model('catalogue', 'ProductCategory')
+Category = get_model('catalogue', 'Category')
+
+# Saving or deleting any of these can change which site offers apply to a
+# basket. Conditions and benefits are usually saved through their proxy
+# classes, hence we check with isinstance rather than connecting per sender.
+SNAPSHOT_MODELS = (ConditionalOffer, Condition, Benefit, Range, RangeProduct,
+                   ProductCategory, Category)
+
+
+def invalidate_site_offers(sender, instance, **kwargs):
+    if not snapshot.is_enabled() or kwargs.get('raw', False):
+        return
+    if isinstance(instance, SNAPSHOT_MODELS):
+        snapshot.invalidate()
+    elif isinstance(instance, Product) and instance.is_child:
+        # Ranges include the children of their included and excluded
+        # products, so the snapshot needs to know about new children.
+        snapshot.invalidate()
+
+
+def invalidate_site_offers_on_m2m_change(sender, instance, action, **kwargs):
+    if not snapshot.is_enabled() or not action.startswith('post_'):
+        return
+    if isinstance(instance, Range) or kwargs['model'] is Range:
+        snapshot.invalidate()
+
+
+def invalidate_site_offers_on_setting_change(setting, **kwargs):
+    if setting == 'OSCAR_CACHE_SITE_OFFERS':
+        snapshot.invalidate()
+
+
+post_save.connect(invalidate_site_offers)
+post_delete.connect(invalidate_site_offers)
+m2m_changed.connect(invalidate_site_offers_on_m2m_change)
+setting_changed.connect(invalidate_site_offers_on_setting_change)
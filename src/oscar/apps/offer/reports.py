@@ -1,6 +1,3 @@
-import datetime
-from decimal import Decimal as D
-
 from django.utils.translation import ugettext_lazy as _
 
 from oscar.core.loading import get_class, get_model
@@ -10,8 +7,8 @@ ReportCSVFormatter = get_class('dashboard.reports.reports',
                                'ReportCSVFormatter')
 ReportHTMLFormatter = get_class('dashboard.reports.reports',
                                 'ReportHTMLFormatter')
+get_discount_totals = get_class('order.summaries', 'get_discount_totals')
 ConditionalOffer = get_model('offer', 'ConditionalOffer')
-OrderDiscount = get_model('order', 'OrderDiscount')
 
 
 class OfferReportCSVFormatter(ReportCSVFormatter):
@@ -25,7 +22,7 @@ class OfferReportCSVFormatter(ReportCSVFormatter):
         writer.writerow(header_row)
 
         for offer in offers:
-            row = [offer, offer['total_discount']]
+            row = [offer['offer'], offer['total_discount']]
             writer.writerow(row)
 
 
@@ -43,25 +40,15 @@ class OfferReportGenerator(ReportGenerator):
     }
 
     def generate(self):
-        qs = OrderDiscount._default_manager.all()
-        if self.start_date:
-            qs = qs.filter(order__date_placed__gte=self.start_date)
-        if self.end_date:
-            qs = qs.filter(order__date_placed__lt=self.end_date + datetime.timedelta(days=1))
-
-        offer_discounts = {}
-        for discount in qs:
-            if discount.offer_id not in offer_discounts:
-                try:
-                    all_offers = ConditionalOffer._default_manager
-                    offer = all_offers.get(id=discount.offer_id)
-                except ConditionalOffer.DoesNotExist:
-                    continue
-                offer_discounts[discount.offer_id] = {
-                    'offer': offer,
-                    'total_discount': D('0.00')
-                }
-            offer_discounts[discount.offer_id]['total_discount'] \
-                += discount.amount
-
-        return self.formatter.generate_response(offer_discounts.values())
+        totals = list(get_discount_totals(
+            'offer_id', self.start_date, self.end_date))
+        offers = ConditionalOffer._default_manager.in_bulk(
+            [row['offer_id'] for row in totals])
+
+        # Discounts of offers that have since been deleted are left out
+        offer_discounts = [
+            {'offer': offers[row['offer_id']],
+             'num_orders': row['orders'],
+             'total_discount': row['discount']}
+            for row in totals if row['offer_id'] in offers]
+        return self.formatter.generate_response(offer_discounts)
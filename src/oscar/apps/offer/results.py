@@ -13,6 +13,11 @@ class OfferApplications(object):
     """
     def __init__(self):
         self.applications = {}
+        # Once offers have been applied, these record the IDs of the offers
+        # that were considered and the discount state of each basket line, so
+        # offers can be re-applied incrementally when lines change.
+        self.offer_ids = None
+        self.line_discounts = None
 
     def __iter__(self):
         return self.applications.values().__iter__()
@@ -0,0 +1,147 @@
+import copy
+import threading
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.utils.timezone import now
+
+from oscar.core.loading import get_class, get_model
+
+RangeMembershipIndex = get_class('offer.membership', 'RangeMembershipIndex')
+
+# The version stamp is kept in Django's cache so that invalidating the
+# snapshot in one process (e.g. when an offer is edited in the dashboard)
+# invalidates it in all others too.
+VERSION_CACHE_KEY = 'oscar_site_offers_version'
+
+_snapshot = None
+_lock = threading.Lock()
+
+
+class SiteOfferSnapshot(object):
+    """
+    An in-memory copy of all open site offers.
+
+    The offers are loaded with their condition, benefit and ranges, and the
+    range membership data (included/excluded product IDs, product classes and
+    categories) is resolved up front. Applying the offers to a basket hence
+    doesn't require any offer queries.
+
+    The snapshot also holds the range membership index used by the
+    ``Applicator``, so that it is discarded along with the offers.
+    """
+
+    def __init__(self, version):
+        self.version = version
+        self.offers = self.load_offers()
+        self.index = RangeMembershipIndex()
+
+    def load_offers(self):
+        ConditionalOffer = get_model('offer', 'ConditionalOffer')
+        # Date restrictions are checked when offers are retrieved from the
+        # snapshot, so that offers starting or ending later on don't require
+        # rebuilding it.
+        qs = ConditionalOffer.objects.filter(
+            offer_type=ConditionalOffer.SITE,
+            status=ConditionalOffer.OPEN,
+        ).select_related(
+            'condition', 'condition__range', 'benefit', 'benefit__range')
+        offers = list(qs)
+        for offer in offers:
+            for range in (offer.condition.range, offer.benefit.range):
+                if range is not None:
+                    self.resolve_range(range)
+        return offers
+
+    def resolve_range(self, range):
+        """
+        Evaluate and cache the range's membership data
+        """
+        range._included_product_ids()
+        range._excluded_product_ids()
+        list(range._class_ids())
+        range._category_ids()
+
+    def get_offers(self, test_date=None):
+        """
+        Return copies of the offers that are available at the given date.
+
+        This mimics the date filtering in ``Applicator.get_site_offers``:
+        offers with a start date are available from that date until their
+        (optional) end date, offers without any dates are always available.
+        """
+        if test_date is None:
+            test_date = now()
+        offers = []
+        for offer in self.offers:
+            if offer.start_datetime is None:
+                if offer.end_datetime is not None:
+                    continue
+            elif offer.start_datetime > test_date or (
+                    offer.end_datetime is not None and
+                    offer.end_datetime < test_date):
+                continue
+            # Offers are shared between requests (and threads), so we hand
+            # out shallow copies to keep per-request state off the originals.
+            offers.append(copy.copy(offer))
+        return offers
+
+
+def get_version():
+    version = cache.get(VERSION_CACHE_KEY)
+    if version is None:
+        version = uuid.uuid4().hex
+        # Another process might have set the version in the meantime; add()
+        # won't overwrite it.
+        if not cache.add(VERSION_CACHE_KEY, version, None):
+            version = cache.get(VERSION_CACHE_KEY, version)
+    return version
+
+
+def get_snapshot():
+    """
+    Return the current snapshot of site offers, building it if it doesn't
+    exist or if it has been invalidated.
+    """
+    global _snapshot
+    version = get_version()
+    snapshot = _snapshot
+    if snapshot is None or snapshot.version != version:
+        with _lock:
+            if _snapshot is None or _snapshot.version != version:
+                _snapshot = SiteOfferSnapshot(version)
+            snapshot = _snapshot
+    return snapshot
+
+
+def get_site_offers():
+    return get_snapshot().get_offers()
+
+
+def is_enabled():
+    return getattr(settings, 'OSCAR_CACHE_SITE_OFFERS', False)
+
+
+def invalidate():
+    """
+    Discard the snapshot in this and all other processes.
+
+    The version only changes once the current transaction is committed, as
+    other processes could otherwise rebuild the snapshot from the data
+    before the commit and keep it under the new version.
+    """
+    _discard()
+    transaction.on_commit(_change_version)
+
+
+def _change_version():
+    cache.set(VERSION_CACHE_KEY, uuid.uuid4().hex, None)
+    _discard()
+
+
+def _discard():
+    global _snapshot
+    with _lock:
+        _snapshot = None
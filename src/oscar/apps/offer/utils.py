@@ -33,3 +33,17 @@ def load_proxy(proxy_class):
     except AttributeError:
         raise exceptions.ImproperlyConfigured(
             "Module %s does not define a %s" % (module, classname))
+
+
+def copy_range_cache(instance, proxy):
+    """
+    Copy an already fetched range from a condition or benefit to its proxy.
+
+    Proxies are instantiated from the non-private fields of the instance,
+    which means the related object cache would be lost otherwise and
+    accessing ``proxy.range`` would cost another query.
+    """
+    cache_name = instance._meta.get_field('range').get_cache_name()
+    if hasattr(instance, cache_name):
+        setattr(proxy, cache_name, getattr(instance, cache_name))
+    return proxy
@@ -3,8 +3,9 @@ from django.conf import settings
 from django.shortcuts import get_object_or_404
 from django.views.generic import ListView
 
-from oscar.core.loading import get_model
+from oscar.core.loading import get_class, get_model
 
+PurchaseInfoMixin = get_class('partner.views', 'PurchaseInfoMixin')
 ConditionalOffer = get_model('offer', 'ConditionalOffer')
 Range = get_model('offer', 'Range')
 Product = get_model('catalogue', 'Product')
@@ -20,7 +21,7 @@ class OfferListView(ListView):
             offer_type=ConditionalOffer.SITE)
 
 
-class OfferDetailView(ListView):
+class OfferDetailView(PurchaseInfoMixin, ListView):
     context_object_name = 'products'
     template_name = 'offer/detail.html'
     paginate_by = settings.OSCAR_OFFERS_PER_PAGE
@@ -44,7 +45,7 @@ class OfferDetailView(ListView):
         return self.offer.products()
 
 
-class RangeDetailView(ListView):
+class RangeDetailView(PurchaseInfoMixin, ListView):
     template_name = 'offer/range.html'
     context_object_name = 'products'
 
@@ -1075,3 +1075,33 @@ class AbstractOrderDiscount(models.Model):
         if self.voucher_code:
             return self.voucher_code
         return self.offer_name or u""
+
+
+@python_2_unicode_compatible
+class AbstractOrderDiscountSummary(models.Model):
+    """
+    The discounts of an offer (and voucher) in the orders placed on a day.
+
+    Summaries are filled by the ``oscar_summarise_discounts`` management
+    command, and can be used by the offer and voucher reports instead of
+    aggregating the individual order discounts.
+    """
+    date = models.DateField(_("Date"), db_index=True)
+    offer_id = models.PositiveIntegerField(
+        _("Offer ID"), blank=True, null=True)
+    voucher_id = models.PositiveIntegerField(
+        _("Voucher ID"), blank=True, null=True)
+    num_orders = models.PositiveIntegerField(_("Number of orders"), default=0)
+    total_discount = models.DecimalField(
+        _("Total discount"), decimal_places=2, max_digits=12, default=0)
+
+    class Meta:
+        abstract = True
+        app_label = 'order'
+        ordering = ['-date']
+        verbose_name = _("Order discount summary")
+        verbose_name_plural = _("Order discount summaries")
+
+    def __str__(self):
+        return _("Discounts of offer %(offer)s on %(date)s") % {
+            'offer': self.offer_id, 'date': self.date}
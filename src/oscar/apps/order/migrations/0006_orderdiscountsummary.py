@@ -0,0 +1,32 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.9.13 on 2026-10-18 07:19
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('order', '0005_update_email_length'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OrderDiscountSummary',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField(db_index=True, verbose_name='Date')),
+                ('offer_id', models.PositiveIntegerField(blank=True, null=True, verbose_name='Offer ID')),
+                ('voucher_id', models.PositiveIntegerField(blank=True, null=True, verbose_name='Voucher ID')),
+                ('num_orders', models.PositiveIntegerField(default=0, verbose_name='Number of orders')),
+                ('total_discount', models.DecimalField(decimal_places=2, default=0, max_digits=12, verbose_name='Total discount')),
+            ],
+            options={
+                'verbose_name': 'Order discount summary',
+                'verbose_name_plural': 'Order discount summaries',
+                'ordering': ['-date'],
+                'abstract': False,
+            },
+        ),
+    ]
@@ -14,23 +14,21 @@ Order = get_model('order', 'Order')
 
 class OrderReportCSVFormatter(ReportCSVFormatter):
     filename_template = 'orders-%s-to-%s.csv'
-
-    def generate_csv(self, response, orders):
-        writer = self.get_csv_writer(response)
-        header_row = [_('Order number'),
-                      _('Name'),
-                      _('Email'),
-                      _('Total incl. tax'),
-                      _('Date placed')]
-        writer.writerow(header_row)
-        for order in orders:
-            row = [
+    streaming = True
+
+    def generate_rows(self, orders):
+        yield [_('Order number'),
+               _('Name'),
+               _('Email'),
+               _('Total incl. tax'),
+               _('Date placed')]
+        for order in self.iterate(orders.select_related('user')):
+            yield [
                 order.number,
-                '-' if order.is_anonymous else order.user.get_full_name(),
+                '-' if order.user is None else order.user.get_full_name(),
                 order.email,
                 order.total_incl_tax,
                 self.format_datetime(order.date_placed)]
-            writer.writerow(row)
 
     def filename(self, **kwargs):
         return self.filename_template % (
@@ -0,0 +1,71 @@
+import datetime
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, Sum
+
+from oscar.core.loading import get_model
+from oscar.core.utils import datetime_combine
+
+
+def is_enabled():
+    return getattr(settings, 'OSCAR_USE_DISCOUNT_SUMMARIES', False)
+
+
+def get_discount_totals(field, start_date=None, end_date=None):
+    """
+    Return the number of orders and the total discount per offer or voucher
+    (depending on whether ``field`` is ``'offer_id'`` or ``'voucher_id'``)
+    for the orders placed between the passed dates, largest discount first.
+
+    The totals are aggregated from the daily discount summaries if
+    ``OSCAR_USE_DISCOUNT_SUMMARIES`` is set, and from the order discounts
+    otherwise.
+    """
+    if is_enabled():
+        qs = get_model('order', 'OrderDiscountSummary')._default_manager.all()
+        if start_date:
+            qs = qs.filter(date__gte=start_date)
+        if end_date:
+            qs = qs.filter(date__lte=end_date)
+        qs = qs.values(field).annotate(
+            orders=Sum('num_orders'), discount=Sum('total_discount'))
+    else:
+        qs = get_model('order', 'OrderDiscount')._default_manager.all()
+        if start_date:
+            qs = qs.filter(order__date_placed__gte=start_date)
+        if end_date:
+            qs = qs.filter(order__date_placed__lt=end_date +
+                           datetime.timedelta(days=1))
+        qs = qs.values(field).annotate(
+            orders=Count('order', distinct=True), discount=Sum('amount'))
+    return qs.filter(**{'%s__isnull' % field: False}).order_by('-discount')
+
+
+def summarise_discounts(start_date, end_date):
+    """
+    (Re)build the daily discount summaries for the days between the passed
+    dates. Returns the number of summaries created.
+    """
+    OrderDiscount = get_model('order', 'OrderDiscount')
+    OrderDiscountSummary = get_model('order', 'OrderDiscountSummary')
+    num_summaries = 0
+    date = start_date
+    while date <= end_date:
+        # Days are bounded in the current time zone, so the summaries match
+        # the dates shown in the dashboard.
+        next_date = date + datetime.timedelta(days=1)
+        discounts = OrderDiscount._default_manager.filter(
+            order__date_placed__gte=datetime_combine(date, datetime.time()),
+            order__date_placed__lt=datetime_combine(
+                next_date, datetime.time()))
+        totals = discounts.values('offer_id', 'voucher_id').annotate(
+            num_orders=Count('order', distinct=True),
+            total_discount=Sum('amount')).order_by()
+        summaries = [OrderDiscountSummary(date=date, **row) for row in totals]
+        with transaction.atomic():
+            OrderDiscountSummary._default_manager.filter(date=date).delete()
+            OrderDiscountSummary._default_manager.bulk_create(summaries)
+        num_summaries += len(summaries)
+        date = next_date
+    return num_summaries
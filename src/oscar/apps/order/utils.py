@@ -1,7 +1,9 @@
+from collections import defaultdict
 from decimal import Decimal as D
 
 from django.conf import settings
 from django.contrib.sites.models import Site
+from django.utils import six
 from django.utils.translation import ugettext_lazy as _
 
 from oscar.core.loading import get_class, get_model
@@ -10,8 +12,15 @@ from . import exceptions
 
 Order = get_model('order', 'Order')
 Line = get_model('order', 'Line')
+LinePrice = get_model('order', 'LinePrice')
+LineAttribute = get_model('order', 'LineAttribute')
 OrderDiscount = get_model('order', 'OrderDiscount')
 order_placed = get_class('order.signals', 'order_placed')
+bulk_allocate = get_class('partner.stock', 'allocate')
+
+
+def is_bulk_enabled():
+    return getattr(settings, 'OSCAR_BULK_CREATE_ORDER_LINES', False)
 
 
 class OrderNumberGenerator(object):
@@ -61,11 +70,12 @@ class OrderCreator(object):
         order = self.create_order_model(
             user, basket, shipping_address, shipping_method, shipping_charge,
             billing_address, total, order_number, status, **kwargs)
-        for line in basket.all_lines():
-            self.create_line_models(order, line)
-            self.update_stock_records(line)
+        lines = basket.all_lines()
+        self.create_lines(order, lines)
+        self.allocate_stock(lines)
 
         # Record any discounts associated with this order
+        discounts = []
         for application in basket.offer_applications:
             # Trigger any deferred benefits from offers and capture the
             # resulting message
@@ -82,8 +92,13 @@ class OrderCreator(object):
                 # the shipping method instance, which should be wrapped in an
                 # OfferDiscount instance.
                 application['discount'] = shipping_discount
-            self.create_discount_model(order, application)
+            if is_bulk_enabled():
+                discounts.append(self.get_discount_model(order, application))
+            else:
+                self.create_discount_model(order, application)
             self.record_discount(application)
+        if discounts:
+            OrderDiscount._default_manager.bulk_create(discounts)
 
         for voucher in basket.vouchers.all():
             self.record_voucher_usage(order, voucher, user)
@@ -124,6 +139,45 @@ class OrderCreator(object):
         order.save()
         return order
 
+    def create_lines(self, order, basket_lines):
+        """
+        Create the order lines, and their prices and attributes, for the
+        passed basket lines.
+
+        If ``OSCAR_BULK_CREATE_ORDER_LINES`` is set, the models are built with
+        ``get_line_model``, ``get_line_price_models`` and
+        ``get_line_attribute_models`` and written with a few bulk inserts,
+        rather than by calling ``create_line_models`` for each line.
+        """
+        if not is_bulk_enabled():
+            return [self.create_line_models(order, basket_line)
+                    for basket_line in basket_lines]
+
+        basket_lines = list(basket_lines)
+        order_lines = [self.get_line_model(order, basket_line)
+                       for basket_line in basket_lines]
+        Line._default_manager.bulk_create(order_lines)
+        if order_lines and order_lines[0].pk is None:
+            # Not all databases return the IDs of bulk inserted rows. The
+            # order is new, so its lines are exactly the ones just inserted,
+            # in the order of their IDs.
+            ids = order.lines.order_by('pk').values_list('pk', flat=True)
+            for order_line, pk in zip(order_lines, ids):
+                order_line.pk = pk
+
+        prices, attributes = [], []
+        for order_line, basket_line in zip(order_lines, basket_lines):
+            prices.extend(
+                self.get_line_price_models(order, order_line, basket_line))
+            attributes.extend(
+                self.get_line_attribute_models(order, order_line, basket_line))
+        LinePrice._default_manager.bulk_create(prices)
+        LineAttribute._default_manager.bulk_create(attributes)
+
+        for order_line, basket_line in zip(order_lines, basket_lines):
+            self.create_additional_line_models(order, order_line, basket_line)
+        return order_lines
+
     def create_line_models(self, order, basket_line, extra_line_fields=None):
         """
         Create the batch line model.
@@ -131,6 +185,18 @@ class OrderCreator(object):
         You can set extra fields by passing a dictionary as the
         extra_line_fields value
         """
+        order_line = self.get_line_model(order, basket_line, extra_line_fields)
+        order_line.save()
+        self.create_line_price_models(order, order_line, basket_line)
+        self.create_line_attributes(order, order_line, basket_line)
+        self.create_additional_line_models(order, order_line, basket_line)
+
+        return order_line
+
+    def get_line_model(self, order, basket_line, extra_line_fields=None):
+        """
+        Return an unsaved order line for the passed basket line
+        """
         product = basket_line.product
         stockrecord = basket_line.stockrecord
         if not stockrecord:
@@ -175,12 +241,7 @@ class OrderCreator(object):
         if extra_line_fields:
             line_data.update(extra_line_fields)
 
-        order_line = Line._default_manager.create(**line_data)
-        self.create_line_price_models(order, order_line, basket_line)
-        self.create_line_attributes(order, order_line, basket_line)
-        self.create_additional_line_models(order, order_line, basket_line)
-
-        return order_line
+        return Line(**line_data)
 
     def update_stock_records(self, line):
         """
@@ -189,6 +250,29 @@ class OrderCreator(object):
         if line.product.get_product_class().track_stock:
             line.stockrecord.allocate(line.quantity)
 
+    def allocate_stock(self, lines):
+        """
+        Allocate the stock for all the passed basket lines at once.
+
+        All allocations are applied with a single query, and the low-stock
+        alerts are updated in bulk. If ``update_stock_records`` has been
+        overridden, it's still called for each line instead.
+        """
+        if self.overrides_update_stock_records():
+            for line in lines:
+                self.update_stock_records(line)
+            return
+        quantities = defaultdict(int)
+        for line in lines:
+            if line.product.get_product_class().track_stock:
+                quantities[line.stockrecord_id] += line.quantity
+        bulk_allocate(quantities)
+
+    def overrides_update_stock_records(self):
+        return (six.get_method_function(self.update_stock_records)
+                is not six.get_unbound_function(
+                    OrderCreator.update_stock_records))
+
     def create_additional_line_models(self, order, order_line, basket_line):
         """
         Empty method designed to be overridden.
@@ -203,34 +287,59 @@ class OrderCreator(object):
         """
         Creates the batch line price models
         """
+        for line_price in self.get_line_price_models(
+                order, order_line, basket_line):
+            line_price.save()
+
+    def get_line_price_models(self, order, order_line, basket_line):
+        """
+        Return the unsaved line price models of the passed order line
+        """
         breakdown = basket_line.get_price_breakdown()
-        for price_incl_tax, price_excl_tax, quantity in breakdown:
-            order_line.prices.create(
-                order=order,
-                quantity=quantity,
-                price_incl_tax=price_incl_tax,
-                price_excl_tax=price_excl_tax)
+        return [LinePrice(order=order,
+                          line=order_line,
+                          quantity=quantity,
+                          price_incl_tax=price_incl_tax,
+                          price_excl_tax=price_excl_tax)
+                for price_incl_tax, price_excl_tax, quantity in breakdown]
 
     def create_line_attributes(self, order, order_line, basket_line):
         """
         Creates the batch line attributes.
         """
-        for attr in basket_line.attributes.all():
-            order_line.attributes.create(
-                option=attr.option,
-                type=attr.option.code,
-                value=attr.value)
+        for attribute in self.get_line_attribute_models(
+                order, order_line, basket_line):
+            attribute.save()
 
-    def create_discount_model(self, order, discount):
+    def get_line_attribute_models(self, order, order_line, basket_line):
+        """
+        Return the unsaved attribute models of the passed order line
+        """
+        return [LineAttribute(line=order_line,
+                              option=attr.option,
+                              type=attr.option.code,
+                              value=attr.value)
+                for attr in basket_line.attributes.all()]
 
+    def create_discount_model(self, order, discount):
         """
         Create an order discount model for each offer application attached to
         the basket.
         """
+        self.get_discount_model(order, discount).save()
+
+    def get_discount_model(self, order, discount):
+        """
+        Return an unsaved order discount model for the passed offer
+        application. The offer's name and the voucher's code are filled in
+        here rather than by ``OrderDiscount.save``, which isn't called when
+        the discounts are created in bulk.
+        """
         order_discount = OrderDiscount(
             order=order,
             message=discount['message'] or '',
             offer_id=discount['offer'].id,
+            offer_name=discount['offer'].name,
             frequency=discount['freq'],
             amount=discount['discount'])
         result = discount['result']
@@ -242,7 +351,7 @@ class OrderCreator(object):
         if voucher:
             order_discount.voucher_id = voucher.id
             order_discount.voucher_code = voucher.code
-        order_discount.save()
+        return order_discount
 
     def record_discount(self, discount):
         discount['offer'].record_usage(discount)
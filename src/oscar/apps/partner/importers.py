@@ -1,12 +1,21 @@
+import multiprocessing
 import os
+import time
+import zlib
 from decimal import Decimal as D
 
+from django.db import connection, connections
+from django.db.models import Case, Value, When
 from django.db.transaction import atomic
+from django.utils import timezone
 from django.utils.translation import ugettext_lazy as _
 
-from oscar.apps.catalogue.categories import create_from_breadcrumbs
+from oscar.apps.catalogue.categories import (
+    create_from_breadcrumbs, create_from_sequence)
+from oscar.apps.offer import snapshot as offer_snapshot
 from oscar.core.compat import UnicodeCSVReader
 from oscar.core.loading import get_class, get_classes
+from oscar.core.utils import slugify
 
 ImportingError = get_class('partner.exceptions', 'ImportingError')
 Partner, StockRecord = get_classes('partner.models', ['Partner',
@@ -14,6 +23,9 @@ Partner, StockRecord = get_classes('partner.models', ['Partner',
 ProductClass, Product, Category, ProductCategory = get_classes(
     'catalogue.models', ('ProductClass', 'Product', 'Category',
                          'ProductCategory'))
+has_memos, invalidate_purchase_info = get_classes(
+    'partner.strategy', ['has_memos', 'invalidate_purchase_info'])
+log_changes = get_class('search.changes', 'log_changes')
 
 
 class CatalogueImporter(object):
@@ -117,6 +129,300 @@ class CatalogueImporter(object):
         stock.save()
 
 
+class BulkCatalogueImporter(CatalogueImporter):
+    """
+    CSV product importer for large files, which reads the same format as
+    :class:`CatalogueImporter`.
+
+    Rows are imported in chunks of ``batch_size``, each in its own
+    transaction: products and stock records are looked up for the whole
+    chunk at once, and then created with ``bulk_create`` and updated with a
+    single ``UPDATE`` per field. Product classes, partners and categories
+    are loaded once and created as they're first encountered.
+
+    With ``workers`` set, the file is imported by that many processes. The
+    product classes, partners and categories are created first, and the rows
+    are then split between the workers by their UPC, so that all rows of a
+    product are imported by the same worker. Rows sharing the same partner
+    SKU should hence belong to the same product.
+
+    Because of the bulk queries, no signals are sent for the imported
+    products and stock records. In particular, stock alerts aren't updated.
+    """
+
+    def __init__(self, logger, delimiter=",", flush=False, batch_size=1000,
+                 workers=None):
+        super(BulkCatalogueImporter, self).__init__(logger, delimiter, flush)
+        self.batch_size = batch_size
+        self.workers = workers
+
+    def _import(self, file_path):
+        u"""Imports given file"""
+        self._load_lookups()
+        if self.workers and self.workers > 1:
+            # Create the rows' classes, partners and categories before the
+            # workers start, so they don't race to create them.
+            for row_number, row in self._read_rows(file_path):
+                self._get_product_class(row[0])
+                self._get_category_id(row[1])
+                if len(row) == 9:
+                    self._get_partner_id(row[5])
+            # The workers are forked and hence inherit the importer, but they
+            # mustn't share the parent's database connections.
+            global _worker_importer
+            _worker_importer = self
+            connections.close_all()
+            pool = multiprocessing.Pool(self.workers)
+            try:
+                results = pool.map(_import_partition, [
+                    (file_path, worker) for worker in range(self.workers)])
+            finally:
+                pool.close()
+                pool.join()
+        else:
+            results = [self._import_partition(file_path)]
+        self._invalidate_caches()
+        self.logger.info("New items: %d, updated items: %d" % (
+            sum(new for new, __ in results),
+            sum(updated for __, updated in results)))
+
+    def _import_partition(self, file_path, worker=0):
+        """
+        Import the rows of the passed file which belong to the passed worker.
+        Returns the numbers of new and updated items.
+        """
+        stats = {'new_items': 0, 'updated_items': 0}
+        start_time = time.time()
+        num_workers = self.workers or 1
+        chunk = []
+        for row_number, row in self._read_rows(file_path):
+            if num_workers > 1 and get_partition(
+                    row[2], num_workers) != worker:
+                continue
+            chunk.append(row)
+            if len(chunk) >= self.batch_size:
+                self._import_chunk(chunk, stats)
+                self._log_progress(worker, stats, start_time)
+                chunk = []
+        if chunk:
+            self._import_chunk(chunk, stats)
+            self._log_progress(worker, stats, start_time)
+        return stats['new_items'], stats['updated_items']
+
+    def _read_rows(self, file_path):
+        with UnicodeCSVReader(
+                file_path, delimiter=self._delimiter,
+                quotechar='"', escapechar='\\') as reader:
+            for row_number, row in enumerate(reader, 1):
+                if len(row) != 5 and len(row) != 9:
+                    self.logger.error(
+                        "Row number %d has an invalid number of fields (%d),"
+                        " skipping..." % (row_number, len(row)))
+                    continue
+                yield row_number, row
+
+    def _log_progress(self, worker, stats, start_time):
+        num_items = stats['new_items'] + stats['updated_items']
+        duration = time.time() - start_time
+        self.logger.info(
+            " - Worker %d imported %d items (%.0f items/s)" % (
+                worker, num_items, num_items / duration if duration else 0))
+
+    # Lookups
+
+    def _load_lookups(self):
+        self._product_classes = dict(
+            (product_class.name, product_class)
+            for product_class in ProductClass.objects.all())
+        self._partner_ids = dict(
+            Partner.objects.values_list('name', 'id'))
+        # Categories are identified by the names of their ancestors and
+        # themselves, which are collected while iterating over the tree
+        self._category_ids = {}
+        ancestors = []
+        categories = Category.objects.order_by('path').values_list(
+            'id', 'depth', 'name')
+        for category_id, depth, name in categories.iterator():
+            del ancestors[depth - 1:]
+            ancestors.append(name)
+            self._category_ids[tuple(ancestors)] = category_id
+
+    def _get_product_class(self, name):
+        if name not in self._product_classes:
+            self._product_classes[name], __ \
+                = ProductClass.objects.get_or_create(name=name)
+        return self._product_classes[name]
+
+    def _get_partner_id(self, name):
+        if name not in self._partner_ids:
+            partner, __ = Partner.objects.get_or_create(name=name)
+            self._partner_ids[name] = partner.id
+        return self._partner_ids[name]
+
+    def _get_category_id(self, breadcrumbs, separator='>'):
+        names = tuple(x.strip() for x in breadcrumbs.split(separator))
+        if names not in self._category_ids:
+            categories = create_from_sequence(names)
+            for i, category in enumerate(categories, 1):
+                self._category_ids[names[:i]] = category.id
+        return self._category_ids[names]
+
+    # Importing
+
+    @atomic
+    def _import_chunk(self, rows, stats):
+        # The last row of a product or stock record sets its fields, as it
+        # would when importing the rows one by one, while every row adds its
+        # category to the product.
+        items = {}
+        for row in rows:
+            items[row[2]] = row
+        products = self._save_products(items, stats)
+        self._save_product_categories(rows, products)
+        stock = dict((row[6], (products[row[2]], row))
+                     for row in rows if len(row) == 9)
+        if stock:
+            self._save_stockrecords(stock)
+        # No signals are sent for the bulk created and updated rows, so the
+        # products are logged for the search index here
+        log_changes(products.values())
+
+    def _save_products(self, items, stats):
+        """
+        Create or update the passed items' products. Returns a dict mapping
+        the items' UPCs to the product IDs.
+        """
+        existing = dict(
+            (product.upc, product) for product
+            in Product.objects.filter(upc__in=list(items)).order_by())
+        new_products, updated_products = [], []
+        for upc, row in items.items():
+            product = existing.get(upc) or Product(upc=upc)
+            changed = set_fields(product, {
+                'title': row[3],
+                'description': '' if row[4] == 'NULL' else row[4],
+                'product_class_id': self._get_product_class(row[0]).id})
+            if not product.pk:
+                product.slug = slugify(product.get_title())
+                new_products.append(product)
+            elif changed:
+                updated_products.append(product)
+        stats['new_items'] += len(new_products)
+        stats['updated_items'] += len(existing)
+
+        bulk_update(Product, updated_products,
+                    ['title', 'description', 'product_class'])
+        Product.objects.bulk_create(new_products)
+        product_ids = dict((upc, product.id)
+                           for upc, product in existing.items())
+        if new_products:
+            # bulk_create doesn't set the IDs of the new products
+            product_ids.update(Product.objects.filter(
+                upc__in=[product.upc for product in new_products]
+            ).values_list('upc', 'id'))
+        return product_ids
+
+    def _save_product_categories(self, rows, products):
+        categories = set(
+            (products[row[2]], self._get_category_id(row[1])) for row in rows)
+        existing = set(ProductCategory.objects.filter(
+            product_id__in=list(products.values())).order_by().values_list(
+                'product_id', 'category_id'))
+        ProductCategory.objects.bulk_create([
+            ProductCategory(product_id=product_id, category_id=category_id)
+            for product_id, category_id in categories - existing])
+
+    def _save_stockrecords(self, stock):
+        existing = dict(
+            (stockrecord.partner_sku, stockrecord) for stockrecord
+            in StockRecord.objects.filter(partner_sku__in=list(stock)))
+        new_stockrecords, updated_stockrecords = [], []
+        for partner_sku, (product_id, row) in stock.items():
+            stockrecord = existing.get(partner_sku) or StockRecord(
+                partner_sku=partner_sku)
+            changed = set_fields(stockrecord, {
+                'product_id': product_id,
+                'partner_id': self._get_partner_id(row[5]),
+                'price_excl_tax': D(row[7]),
+                'num_in_stock': int(row[8])})
+            if not stockrecord.pk:
+                new_stockrecords.append(stockrecord)
+            elif changed:
+                updated_stockrecords.append(stockrecord)
+        bulk_update(StockRecord, updated_stockrecords,
+                    ['product', 'partner', 'price_excl_tax', 'num_in_stock'])
+        StockRecord.objects.bulk_create(new_stockrecords)
+        if has_memos() and updated_stockrecords:
+            invalidate_purchase_info([stockrecord.product_id for stockrecord
+                                      in updated_stockrecords])
+
+    def _invalidate_caches(self):
+        # The new product categories can change which offers apply to a
+        # basket, and no signals have been sent for them.
+        if offer_snapshot.is_enabled():
+            offer_snapshot.invalidate()
+
+
+_worker_importer = None
+
+# The maximum number of objects updated by a single query of bulk_update()
+UPDATE_BATCH_SIZE = 100
+
+
+def _import_partition(args):
+    file_path, worker = args
+    try:
+        return _worker_importer._import_partition(file_path, worker)
+    finally:
+        connection.close()
+
+
+def get_partition(key, num_partitions):
+    """
+    Return the partition of the passed key. Unlike ``hash``, the result is
+    the same in every process.
+    """
+    return zlib.crc32(key.encode('utf-8')) % num_partitions
+
+
+def set_fields(obj, values):
+    """
+    Set the passed attributes of the object. Returns whether any of them
+    changed.
+    """
+    changed = False
+    for name, value in values.items():
+        if getattr(obj, name) != value:
+            setattr(obj, name, value)
+            changed = True
+    return changed
+
+
+def bulk_update(model, objects, field_names):
+    """
+    Update the passed fields of the objects with a single query per batch,
+    setting each field with a ``CASE`` expression. The objects' ``auto_now``
+    fields are set to the current time.
+    """
+    fields = [model._meta.get_field(name) for name in field_names]
+    # Each object adds its primary key and a value per field to the query.
+    # Databases evaluate CASE expressions branch by branch, so the batches
+    # are kept small as well.
+    batch_size = min(connection.ops.bulk_batch_size(
+        ['pk'] + fields * 2, objects) or len(objects), UPDATE_BATCH_SIZE)
+    for i in range(0, len(objects), batch_size):
+        batch = objects[i:i + batch_size]
+        updates = dict(
+            (field.name, timezone.now()) for field
+            in model._meta.concrete_fields if getattr(field, 'auto_now', False))
+        for field in fields:
+            updates[field.name] = Case(*[
+                When(pk=obj.pk, then=Value(getattr(obj, field.attname)))
+                for obj in batch], output_field=field)
+        model._default_manager.filter(
+            pk__in=[obj.pk for obj in batch]).update(**updates)
+
+
 class Validator(object):
 
     def validate(self, file_path):
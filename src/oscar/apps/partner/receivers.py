@@ -1,10 +1,14 @@
-from django.db.models.signals import post_save
+from django.core.exceptions import ObjectDoesNotExist
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
 
-from oscar.core.loading import get_classes
+from oscar.core.loading import get_class, get_classes
 
 StockRecord, StockAlert = get_classes('partner.models', ['StockRecord',
                                                          'StockAlert'])
+invalidate_purchase_info = get_class(
+    'partner.strategy', 'invalidate_purchase_info')
+has_memos = get_class('partner.strategy', 'has_memos')
 
 
 @receiver(post_save, sender=StockRecord)
@@ -26,3 +30,20 @@ def update_stock_alerts(sender, instance, created, **kwargs):
                                   threshold=stockrecord.low_stock_threshold)
     elif not stockrecord.is_below_threshold and alert:
         alert.close()
+
+
+@receiver(post_save, sender=StockRecord)
+@receiver(post_delete, sender=StockRecord)
+def invalidate_memoized_purchase_info(sender, instance, **kwargs):
+    """
+    Discard memoized purchase info of the stockrecord's product and of its
+    parent, whose purchase info depends on its children's stockrecords
+    """
+    if not has_memos():
+        return
+    product_ids = [instance.product_id]
+    try:
+        product_ids.append(instance.product.parent_id)
+    except ObjectDoesNotExist:
+        pass
+    invalidate_purchase_info(product_ids)
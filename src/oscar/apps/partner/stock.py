@@ -0,0 +1,88 @@
+from django.db import transaction
+from django.db.models import Case, F, IntegerField, Value, When
+from django.db.models.functions import Coalesce
+from django.utils.timezone import now
+
+from oscar.core.loading import get_classes, get_model
+
+has_memos, invalidate_purchase_info = get_classes(
+    'partner.strategy', ['has_memos', 'invalidate_purchase_info'])
+is_change_log_enabled, log_changes = get_classes(
+    'search.changes', ['is_enabled', 'log_changes'])
+
+
+def allocate(quantities):
+    """
+    Record the stock allocations of many stock records at once.
+
+    :param quantities: A dict mapping stock record IDs to the quantities to
+                       allocate
+
+    All allocations are applied with a single ``UPDATE``, which increments
+    the allocated numbers in the database rather than overwriting them, so
+    the rows of popular stock records are locked as briefly as possible.
+    The low-stock alerts of the stock records are updated afterwards.
+    """
+    StockRecord = get_model('partner', 'StockRecord')
+    quantities = dict((stockrecord_id, quantity) for stockrecord_id, quantity
+                      in quantities.items() if quantity)
+    if not quantities:
+        return
+    increment = Case(
+        *[When(pk=stockrecord_id, then=Value(quantity))
+          for stockrecord_id, quantity in quantities.items()],
+        output_field=IntegerField())
+    StockRecord._default_manager.filter(pk__in=list(quantities)).update(
+        num_allocated=Coalesce(F('num_allocated'), 0) + increment,
+        date_updated=now())
+    update_stock_alerts(list(quantities))
+
+    # The stock records haven't been saved, so the receivers discarding the
+    # memoized purchase info of their products and logging their changes for
+    # the search index haven't been called
+    if has_memos() or is_change_log_enabled():
+        product_ids = set()
+        for product_id, parent_id in StockRecord._default_manager.filter(
+                pk__in=list(quantities)).values_list(
+                    'product_id', 'product__parent_id'):
+            product_ids.update([product_id, parent_id])
+        product_ids.discard(None)
+        if has_memos():
+            invalidate_purchase_info(product_ids)
+        log_changes(product_ids)
+
+
+def update_stock_alerts(stockrecord_ids):
+    """
+    Open low-stock alerts for the passed stock records that are below their
+    threshold, and close those of the ones that aren't anymore.
+
+    This mirrors what saving a single stock record does, with a constant
+    number of queries for any number of stock records.
+    """
+    StockRecord = get_model('partner', 'StockRecord')
+    StockAlert = get_model('partner', 'StockAlert')
+    stockrecords = StockRecord._default_manager.filter(
+        pk__in=stockrecord_ids).only(
+            'pk', 'num_in_stock', 'num_allocated', 'low_stock_threshold')
+    open_alert_ids = set(StockAlert._default_manager.filter(
+        stockrecord_id__in=stockrecord_ids,
+        status=StockAlert.OPEN).values_list('stockrecord_id', flat=True))
+
+    new_alerts, closed_ids = [], []
+    for stockrecord in stockrecords:
+        has_alert = stockrecord.pk in open_alert_ids
+        if stockrecord.is_below_threshold and not has_alert:
+            new_alerts.append(StockAlert(
+                stockrecord=stockrecord,
+                threshold=stockrecord.low_stock_threshold))
+        elif not stockrecord.is_below_threshold and has_alert:
+            closed_ids.append(stockrecord.pk)
+
+    with transaction.atomic():
+        if new_alerts:
+            StockAlert._default_manager.bulk_create(new_alerts)
+        if closed_ids:
+            StockAlert._default_manager.filter(
+                stockrecord_id__in=closed_ids, status=StockAlert.OPEN).update(
+                    status=StockAlert.CLOSED, date_closed=now())
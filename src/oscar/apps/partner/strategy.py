@@ -1,12 +1,86 @@
-from collections import namedtuple
+import threading
+import weakref
+from collections import OrderedDict, defaultdict, namedtuple
 from decimal import Decimal as D
 
+from django.conf import settings
+
+from oscar.core.loading import get_model
+
 from . import availability, prices
 
 # A container for policies
 PurchaseInfo = namedtuple(
     'PurchaseInfo', ['price', 'availability', 'stockrecord'])
 
+# The key used in place of a stockrecord ID for the purchase info of parents
+PARENT_KEY = 'parent'
+
+# All memos in use, so they can be invalidated when stockrecords change
+_memos = weakref.WeakSet()
+_memos_lock = threading.Lock()
+
+
+class PurchaseInfoMemo(object):
+    """
+    A bounded store of ``PurchaseInfo`` instances, keyed by product ID and
+    stockrecord ID. Once full, the least recently used entries are dropped.
+
+    The numbers of hits and misses are counted, for profiling.
+    """
+
+    def __init__(self, max_size):
+        self.max_size = max_size
+        self.data = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        with _memos_lock:
+            _memos.add(self)
+
+    def get(self, key):
+        try:
+            info = self.data.pop(key)
+        except KeyError:
+            self.misses += 1
+            return None
+        # Mark the entry as the most recently used one
+        self.data[key] = info
+        self.hits += 1
+        return info
+
+    def set(self, key, info):
+        self.data.pop(key, None)
+        self.data[key] = info
+        while len(self.data) > self.max_size:
+            self.data.popitem(last=False)
+
+    def invalidate(self, product_ids):
+        """
+        Remove the entries for the passed product IDs
+        """
+        for key in list(self.data):
+            if key[0] in product_ids:
+                self.data.pop(key, None)
+
+    def get_stats(self):
+        return {'hits': self.hits, 'misses': self.misses,
+                'size': len(self.data)}
+
+
+def invalidate_purchase_info(product_ids):
+    """
+    Remove the purchase info of the passed product IDs from all memos
+    """
+    product_ids = set(product_ids)
+    with _memos_lock:
+        memos = list(_memos)
+    for memo in memos:
+        memo.invalidate(product_ids)
+
+
+def has_memos():
+    return len(_memos) > 0
+
 
 class Selector(object):
     """
@@ -54,6 +128,24 @@ class Base(object):
         if request and request.user.is_authenticated():
             self.user = request.user
 
+        # Purchase info can optionally be memoized for the lifetime of this
+        # strategy instance (see OSCAR_PURCHASE_INFO_MEMO_SIZE).
+        memo_size = getattr(settings, 'OSCAR_PURCHASE_INFO_MEMO_SIZE', 0)
+        self.memo = PurchaseInfoMemo(memo_size) if memo_size else None
+
+    def get_memo(self):
+        # Subclasses might not call __init__
+        return getattr(self, 'memo', None)
+
+    def get_memo_stats(self):
+        """
+        Return the hit and miss counts and size of the purchase info memo,
+        or ``None`` if purchase info isn't memoized.
+        """
+        memo = self.get_memo()
+        if memo is not None:
+            return memo.get_stats()
+
     def fetch_for_product(self, product, stockrecord=None):
         """
         Given a product, return a ``PurchaseInfo`` instance.
@@ -97,6 +189,32 @@ class Base(object):
         # do with them within Oscar - that's up to your project to implement.
         return self.fetch_for_product(line.product)
 
+    def fetch_for_products(self, products):
+        """
+        Given a list of products, return a dict mapping each product's ID to
+        its ``PurchaseInfo`` instance.
+
+        Parent products get the ``PurchaseInfo`` returned by
+        ``fetch_for_parent``. This default implementation fetches the info of
+        each product in turn; strategies should override it to look up the
+        required data in bulk.
+        """
+        infos = {}
+        for product in products:
+            if product.is_parent:
+                infos[product.id] = self.fetch_for_parent(product)
+            else:
+                infos[product.id] = self.fetch_for_product(product)
+        return infos
+
+    def fetch_for_lines(self, lines):
+        """
+        Given a list of basket lines, return a dict mapping each line's ID to
+        its ``PurchaseInfo`` instance.
+        """
+        return dict((line.id, self.fetch_for_line(line, line.stockrecord))
+                    for line in lines)
+
 
 class Structured(Base):
     """
@@ -114,6 +232,17 @@ class Structured(Base):
 
         This method is not intended to be overridden.
         """
+        memo = self.get_memo()
+        if memo is not None and product.id is not None:
+            key = (product.id, stockrecord.id if stockrecord else None)
+            info = memo.get(key)
+            if info is None:
+                info = self.get_purchase_info(product, stockrecord)
+                memo.set(key, info)
+            return info
+        return self.get_purchase_info(product, stockrecord)
+
+    def get_purchase_info(self, product, stockrecord=None):
         if stockrecord is None:
             stockrecord = self.select_stockrecord(product)
         return PurchaseInfo(
@@ -122,14 +251,84 @@ class Structured(Base):
             stockrecord=stockrecord)
 
     def fetch_for_parent(self, product):
+        memo = self.get_memo()
+        if memo is not None and product.id is not None:
+            key = (product.id, PARENT_KEY)
+            info = memo.get(key)
+            if info is None:
+                info = self.get_parent_purchase_info(product)
+                memo.set(key, info)
+            return info
+        return self.get_parent_purchase_info(product)
+
+    def get_parent_purchase_info(self, product):
         # Select children and associated stockrecords
         children_stock = self.select_children_stockrecords(product)
+        return self.get_parent_purchase_info_for_stock(
+            product, children_stock)
+
+    def get_parent_purchase_info_for_stock(self, product, children_stock):
         return PurchaseInfo(
             price=self.parent_pricing_policy(product, children_stock),
             availability=self.parent_availability_policy(
                 product, children_stock),
             stockrecord=None)
 
+    def fetch_for_products(self, products):
+        """
+        Return a dict mapping product IDs to ``PurchaseInfo`` instances.
+
+        The stockrecords of all products (and of the children of parent
+        products) are selected in bulk using ``select_stockrecords``.
+        """
+        products = list(products)
+        infos = {}
+        memo = self.get_memo()
+        if memo is not None:
+            # Only fetch the purchase info that isn't memoized yet
+            missing = []
+            for product in products:
+                key = (product.id, PARENT_KEY if product.is_parent else None)
+                info = memo.get(key)
+                if info is None:
+                    missing.append(product)
+                else:
+                    infos[product.id] = info
+            products = missing
+
+        parents = [p for p in products if p.is_parent]
+        others = [p for p in products if not p.is_parent]
+        children_stock = self.select_children_stockrecords_for_products(
+            parents)
+        stockrecords = self.select_stockrecords(others)
+
+        for product in parents:
+            infos[product.id] = self.get_parent_purchase_info_for_stock(
+                product, children_stock[product.id])
+            if memo is not None:
+                memo.set((product.id, PARENT_KEY), infos[product.id])
+        for product in others:
+            stockrecord = stockrecords.get(product.id)
+            infos[product.id] = PurchaseInfo(
+                price=self.pricing_policy(product, stockrecord),
+                availability=self.availability_policy(product, stockrecord),
+                stockrecord=stockrecord)
+            if memo is not None:
+                memo.set((product.id, None), infos[product.id])
+        return infos
+
+    def fetch_for_lines(self, lines):
+        """
+        Return a dict mapping line IDs to ``PurchaseInfo`` instances.
+
+        Like ``fetch_for_line``, this ignores the lines' options. If you
+        override ``fetch_for_line``, you'll want to override this method too.
+        """
+        lines = list(lines)
+        infos = self.fetch_for_products(
+            dict((line.product_id, line.product) for line in lines).values())
+        return dict((line.id, infos[line.product_id]) for line in lines)
+
     def select_stockrecord(self, product):
         """
         Select the appropriate stockrecord
@@ -138,6 +337,17 @@ class Structured(Base):
             "A structured strategy class must define a "
             "'select_stockrecord' method")
 
+    def select_stockrecords(self, products):
+        """
+        Select the appropriate stockrecords for a list of products, returning
+        a dict mapping product IDs to stockrecords (or ``None``).
+
+        This default implementation selects each product's stockrecord in
+        turn, so mixins should override it to do so in bulk.
+        """
+        return dict((product.id, self.select_stockrecord(product))
+                    for product in products)
+
     def select_children_stockrecords(self, product):
         """
         Select appropriate stock record for all children of a product
@@ -148,6 +358,23 @@ class Structured(Base):
             records.append((child, self.select_stockrecord(child)))
         return records
 
+    def select_children_stockrecords_for_products(self, products):
+        """
+        Select the stockrecords of the children of a list of parent products,
+        returning a dict mapping parent IDs to lists of (child product,
+        stockrecord) tuples.
+        """
+        children_stock = dict((product.id, []) for product in products)
+        if not products:
+            return children_stock
+        Product = get_model('catalogue', 'Product')
+        children = list(Product.objects.filter(parent__in=products))
+        stockrecords = self.select_stockrecords(children)
+        for child in children:
+            children_stock[child.parent_id].append(
+                (child, stockrecords.get(child.id)))
+        return children_stock
+
     def pricing_policy(self, product, stockrecord):
         """
         Return the appropriate pricing policy
@@ -193,6 +420,24 @@ class UseFirstStockRecord(object):
         except IndexError:
             return None
 
+    def select_stockrecords(self, products):
+        StockRecord = get_model('partner', 'StockRecord')
+        product_records = defaultdict(list)
+        records = StockRecord.objects.filter(
+            product_id__in=[product.id for product in products])
+        for record in records:
+            product_records[record.product_id].append(record)
+
+        stockrecords = {}
+        for product in products:
+            records = product_records[product.id]
+            stockrecords[product.id] = None
+            if records:
+                # Avoid a query when the stockrecord's product is accessed
+                records[0].product = product
+                stockrecords[product.id] = records[0]
+        return stockrecords
+
 
 class StockRequired(object):
     """
@@ -1 +1,34 @@
-# Create your views here.
+from oscar.core.loading import get_model
+
+Product = get_model('catalogue', 'Product')
+
+
+def prefetch_purchase_info(request, products):
+    """
+    Fetch the purchase info of a list of products in bulk and store it on the
+    request, where the ``purchase_info_for_product`` template tag picks it up.
+    Anything that isn't a product (e.g. search results) is ignored.
+    """
+    products = [product for product in products
+                if isinstance(product, Product)]
+    if not products or not hasattr(request, 'strategy'):
+        return
+    if getattr(request, '_purchase_info_cache', None) is None:
+        request._purchase_info_cache = {}
+    request._purchase_info_cache.update(
+        request.strategy.fetch_for_products(products))
+
+
+class PurchaseInfoMixin(object):
+    """
+    Mixin for views listing products, which fetches the purchase info of all
+    products on the page in bulk rather than once per rendered product.
+    """
+    purchase_info_context_object_name = 'products'
+
+    def render_to_response(self, context, **response_kwargs):
+        prefetch_purchase_info(
+            self.request,
+            context.get(self.purchase_info_context_object_name) or [])
+        return super(PurchaseInfoMixin, self).render_to_response(
+            context, **response_kwargs)
@@ -0,0 +1,20 @@
+from django.conf import settings
+
+from oscar.core.loading import get_model
+
+
+def is_enabled():
+    return getattr(settings, 'OSCAR_SEARCH_CHANGE_LOG', False)
+
+
+def log_changes(product_ids):
+    """
+    Record that the products with the passed IDs have changed and need to be
+    reindexed, if ``OSCAR_SEARCH_CHANGE_LOG`` is set
+    """
+    if not is_enabled():
+        return
+    ProductChange = get_model('catalogue', 'ProductChange')
+    ProductChange._default_manager.bulk_create([
+        ProductChange(product_id=product_id)
+        for product_id in set(product_ids) if product_id is not None])
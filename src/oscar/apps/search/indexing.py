@@ -0,0 +1,109 @@
+import logging
+import multiprocessing
+
+from django.db import connection
+from django.db import connections as db_connections
+
+from haystack import connections
+from haystack.constants import DEFAULT_ALIAS
+from haystack.utils import get_identifier
+
+from oscar.core.loading import get_model
+
+logger = logging.getLogger('oscar.search')
+
+# The number of products reindexed at once
+BATCH_SIZE = 500
+
+# The search connection the worker processes reindex the products with
+_worker_using = None
+
+
+def index_products(product_ids, using=DEFAULT_ALIAS):
+    """
+    Reindex the products with the passed IDs, removing those that no longer
+    exist or aren't browsable from the index. Returns the number of products
+    indexed.
+    """
+    Product = get_model('catalogue', 'Product')
+    backend = connections[using].get_backend()
+    index = connections[using].get_unified_index().get_index(Product)
+    products = list(index.index_queryset(using=using).filter(
+        pk__in=product_ids))
+
+    # Child products are indexed through their parents, so they're never in
+    # the index and needn't be removed from it
+    indexed_ids = set(product.pk for product in products)
+    removed_ids = set(product_ids) - indexed_ids
+    if removed_ids:
+        removed_ids -= set(Product._default_manager.filter(
+            pk__in=removed_ids, structure=Product.CHILD
+        ).values_list('pk', flat=True))
+    identifiers = [get_identifier(Product(pk=product_id))
+                   for product_id in sorted(removed_ids)]
+
+    # Only the last request to the backend commits, so each chunk is
+    # committed once
+    for i, identifier in enumerate(identifiers, 1):
+        backend.remove(identifier,
+                       commit=not products and i == len(identifiers))
+    if products:
+        index.load_purchase_info(products)
+        try:
+            backend.update(index, products, commit=True)
+        finally:
+            index.clear_purchase_info()
+    return len(products)
+
+
+def update_index(batch_size=BATCH_SIZE, workers=None, using=DEFAULT_ALIAS):
+    """
+    Reindex the products that have changed since the last update, in chunks
+    of ``batch_size`` products, optionally split across ``workers`` processes.
+    Returns the number of products reindexed.
+
+    Changes recorded while updating are kept for the next update.
+    """
+    ProductChange = get_model('catalogue', 'ProductChange')
+    # Only the changes read here are deleted afterwards. Changes committed
+    # later may have lower IDs, as they're allocated before the commit.
+    changes = dict(ProductChange._default_manager.values_list(
+        'id', 'product_id'))
+    if not changes:
+        return 0
+    product_ids = sorted(set(changes.values()))
+    logger.info("Reindexing %d changed products", len(product_ids))
+
+    chunks = [product_ids[i:i + batch_size]
+              for i in range(0, len(product_ids), batch_size)]
+    if workers and workers > 1:
+        num_indexed = _index_in_workers(chunks, workers, using)
+    else:
+        num_indexed = sum(index_products(chunk, using) for chunk in chunks)
+
+    change_ids = list(changes)
+    for i in range(0, len(change_ids), batch_size):
+        ProductChange._default_manager.filter(
+            id__in=change_ids[i:i + batch_size]).delete()
+    return num_indexed
+
+
+def _index_in_workers(chunks, workers, using):
+    # The workers are forked, but they mustn't share this process' database
+    # connections
+    global _worker_using
+    _worker_using = using
+    db_connections.close_all()
+    pool = multiprocessing.Pool(workers)
+    try:
+        return sum(pool.map(_index_products_in_worker, chunks))
+    finally:
+        pool.close()
+        pool.join()
+
+
+def _index_products_in_worker(product_ids):
+    try:
+        return index_products(product_ids, _worker_using)
+    finally:
+        connection.close()
@@ -0,0 +1,49 @@
+from django.db.models.signals import post_delete, post_save
+
+from oscar.core.loading import get_model
+
+from . import changes
+
+Category = get_model('catalogue', 'Category')
+Product = get_model('catalogue', 'Product')
+ProductCategory = get_model('catalogue', 'ProductCategory')
+ProductReview = get_model('reviews', 'ProductReview')
+StockRecord = get_model('partner', 'StockRecord')
+
+
+def log_product_change(sender, instance, **kwargs):
+    # A child product is indexed as part of its parent
+    if changes.is_enabled() and not kwargs.get('raw', False):
+        changes.log_changes([instance.id, instance.parent_id])
+
+
+def log_related_product_change(sender, instance, **kwargs):
+    """
+    Log the change of the product of a stockrecord, product category or
+    review
+    """
+    if changes.is_enabled() and not kwargs.get('raw', False):
+        try:
+            product = instance.product
+        except Product.DoesNotExist:
+            # The product is being deleted, which is logged by itself
+            return
+        if product is not None:
+            changes.log_changes([product.id, product.parent_id])
+
+
+def log_category_change(sender, instance, created=False, **kwargs):
+    # The names of a category and its descendants are indexed with their
+    # products
+    if changes.is_enabled() and not created and not kwargs.get('raw', False):
+        changes.log_changes(ProductCategory._default_manager.filter(
+            category__in=instance.get_descendants_and_self()
+        ).values_list('product_id', flat=True))
+
+
+post_save.connect(log_product_change, sender=Product)
+post_delete.connect(log_product_change, sender=Product)
+for sender in (StockRecord, ProductCategory, ProductReview):
+    post_save.connect(log_related_product_change, sender=sender)
+    post_delete.connect(log_related_product_change, sender=sender)
+post_save.connect(log_category_change, sender=Category)
@@ -1,11 +1,10 @@
 from haystack import indexes
 
+from oscar.apps.catalogue import tree as category_tree
 from oscar.core.loading import get_class, get_model
 
-# Load default strategy (without a user/request)
 is_solr_supported = get_class('search.features', 'is_solr_supported')
 Selector = get_class('partner.strategy', 'Selector')
-strategy = Selector().strategy()
 
 
 class ProductIndex(indexes.SearchIndex, indexes.Indexable):
@@ -35,7 +34,11 @@ class ProductIndex(indexes.SearchIndex, indexes.Indexable):
 
     def index_queryset(self, using=None):
         # Only index browsable products (not each individual child product)
-        return self.get_model().browsable.order_by('-date_updated')
+        return self.get_model().browsable.select_related(
+            'product_class'
+        ).prefetch_related(
+            'categories', 'stockrecords'
+        ).order_by('-date_updated')
 
     def read_queryset(self, using=None):
         return self.get_model().browsable.base_queryset()
@@ -44,7 +47,12 @@ class ProductIndex(indexes.SearchIndex, indexes.Indexable):
         return obj.get_product_class().name
 
     def prepare_category(self, obj):
+        # The categories are prefetched by index_queryset()
         categories = obj.categories.all()
+        if category_tree.is_enabled():
+            tree = category_tree.get_tree()
+            return [tree.get_full_name(category.pk)
+                    for category in categories] or None
         if len(categories) > 0:
             return [category.full_name for category in categories]
 
@@ -56,13 +64,38 @@ class ProductIndex(indexes.SearchIndex, indexes.Indexable):
     # most common case is for customers to see the same prices and stock levels
     # and so we implement that case here.
 
-    def prepare_price(self, obj):
-        result = None
+    def get_strategy(self):
+        """
+        Return the default strategy (without a user/request). A new one is
+        created each time, so that purchase info memoized by a strategy
+        isn't used for later updates of the index.
+        """
+        return Selector().strategy()
+
+    def load_purchase_info(self, products):
+        """
+        Look up the purchase info of the passed products in bulk, to be used
+        when preparing them
+        """
+        self._purchase_info = self.get_strategy().fetch_for_products(products)
+
+    def clear_purchase_info(self):
+        self._purchase_info = {}
+
+    def get_purchase_info(self, obj):
+        """
+        Return the purchase info of the passed product, or ``None`` if it
+        has no stockrecords
+        """
+        info = getattr(self, '_purchase_info', {}).get(obj.pk)
         if obj.is_parent:
-            result = strategy.fetch_for_parent(obj)
-        elif obj.has_stockrecords:
-            result = strategy.fetch_for_product(obj)
+            return info or self.get_strategy().fetch_for_parent(obj)
+        # The stockrecords are prefetched by index_queryset()
+        if obj.stockrecords.all():
+            return info or self.get_strategy().fetch_for_product(obj)
 
+    def prepare_price(self, obj):
+        result = self.get_purchase_info(obj)
         if result:
             if result.price.is_tax_known:
                 return result.price.incl_tax
@@ -72,8 +105,8 @@ class ProductIndex(indexes.SearchIndex, indexes.Indexable):
         if obj.is_parent:
             # Don't return a stock level for parent products
             return None
-        elif obj.has_stockrecords:
-            result = strategy.fetch_for_product(obj)
+        result = self.get_purchase_info(obj)
+        if result and result.stockrecord:
             return result.stockrecord.net_stock_level
 
     def prepare(self, obj):
@@ -7,6 +7,7 @@ ReportCSVFormatter = get_class(
     'dashboard.reports.reports', 'ReportCSVFormatter')
 ReportHTMLFormatter = get_class(
     'dashboard.reports.reports', 'ReportHTMLFormatter')
+get_discount_totals = get_class('order.summaries', 'get_discount_totals')
 Voucher = get_model('voucher', 'Voucher')
 
 
@@ -43,5 +44,18 @@ class VoucherReportGenerator(ReportGenerator):
         'HTML_formatter': VoucherReportHTMLFormatter}
 
     def generate(self):
-        vouchers = Voucher._default_manager.all()
-        return self.formatter.generate_response(vouchers)
+        totals = list(get_discount_totals(
+            'voucher_id', self.start_date, self.end_date))
+        vouchers = Voucher._default_manager.in_bulk(
+            [row['voucher_id'] for row in totals])
+
+        # The voucher's order count and total discount are replaced with
+        # those of the report's period.
+        used_vouchers = []
+        for row in totals:
+            voucher = vouchers.get(row['voucher_id'])
+            if voucher is not None:
+                voucher.num_orders = row['orders']
+                voucher.total_discount = row['discount']
+                used_vouchers.append(voucher)
+        return self.formatter.generate_response(used_vouchers)
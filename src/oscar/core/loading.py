@@ -1,4 +1,6 @@
 import sys
+import threading
+import time
 import traceback
 from importlib import import_module
 
@@ -6,10 +8,24 @@ from django.apps import apps
 from django.apps.config import MODELS_MODULE_NAME
 from django.conf import settings
 from django.core.exceptions import AppRegistryNotReady
+from django.core.signals import setting_changed
 
 from oscar.core.exceptions import (
     AppNotFoundError, ClassNotFoundError, ModuleNotFoundError)
 
+# Process-wide cache of resolved classes, keyed by
+# (module_label, classname, module_prefix). Resolving a class means importing
+# up to two modules and walking INSTALLED_APPS, and as get_class is called
+# hundreds of times at import time (and on some request paths), it pays to
+# only do that once per class.
+_class_cache = {}
+_class_cache_lock = threading.Lock()
+_class_cache_stats = {
+    'hits': 0,
+    'misses': 0,
+    'resolution_time': 0.0,
+}
+
 
 def get_class(module_label, classname, module_prefix='oscar.apps'):
     """
@@ -80,6 +96,30 @@ def get_classes(module_label, classnames, module_prefix='oscar.apps'):
         raise ValueError(
             "Importing from top-level modules is not supported")
 
+    keys = [(module_label, classname, module_prefix)
+            for classname in classnames]
+    try:
+        klasses = [_class_cache[key] for key in keys]
+    except KeyError:
+        pass
+    else:
+        _class_cache_stats['hits'] += 1
+        return klasses
+
+    start = time.time()
+    klasses = _resolve_classes(module_label, classnames, module_prefix)
+    with _class_cache_lock:
+        _class_cache_stats['misses'] += 1
+        _class_cache_stats['resolution_time'] += time.time() - start
+        _class_cache.update(zip(keys, klasses))
+    return klasses
+
+
+def _resolve_classes(module_label, classnames, module_prefix):
+    """
+    Does the actual work of looking up classes for ``get_classes``, bypassing
+    the class cache.
+    """
     # import from Oscar package (should succeed in most cases)
     # e.g. 'oscar.apps.dashboard.catalogue.forms'
     oscar_module_label = "%s.%s" % (module_prefix, module_label)
@@ -112,6 +152,48 @@ def get_classes(module_label, classnames, module_prefix='oscar.apps'):
     return _pluck_classes([local_module, oscar_module], classnames)
 
 
+def clear_class_cache():
+    """
+    Empty the cache of classes resolved by ``get_classes``.
+
+    The cache is cleared automatically when ``INSTALLED_APPS`` changes (e.g.
+    within ``override_settings``), but this needs calling manually if the
+    modules that classes are loaded from change by other means, like
+    manipulating ``sys.path``.
+    """
+    with _class_cache_lock:
+        _class_cache.clear()
+
+
+def get_class_cache_stats(reset=False):
+    """
+    Return a dictionary reporting on the class cache:
+
+    * ``hits``: the number of ``get_classes`` calls served from the cache
+    * ``misses``: the number of calls which had to resolve classes
+    * ``resolution_time``: total seconds spent resolving classes on misses
+    * ``size``: the number of classes currently cached
+
+    This can be used to measure how much of worker startup time is spent in
+    dynamic class loading. Pass ``reset=True`` to zero the counters after
+    reading them.
+    """
+    with _class_cache_lock:
+        stats = dict(_class_cache_stats, size=len(_class_cache))
+        if reset:
+            _class_cache_stats.update(
+                hits=0, misses=0, resolution_time=0.0)
+    return stats
+
+
+def _clear_class_cache_on_setting_changed(setting, **kwargs):
+    if setting == 'INSTALLED_APPS':
+        clear_class_cache()
+
+
+setting_changed.connect(_clear_class_cache_on_setting_changed)
+
+
 def _import_module(module_label, classnames):
     """
     Imports the module with the given name.
@@ -11,6 +11,7 @@ OSCAR_HOMEPAGE = reverse_lazy('promotions:home')
 OSCAR_BASKET_COOKIE_LIFETIME = 7 * 24 * 60 * 60
 OSCAR_BASKET_COOKIE_OPEN = 'oscar_open_basket'
 OSCAR_BASKET_COOKIE_SECURE = False
+OSCAR_BASKET_SUMMARY_CACHE_TIMEOUT = 0
 OSCAR_MAX_BASKET_QUANTITY_THRESHOLD = 10000
 
 # Recently-viewed products
@@ -22,6 +23,13 @@ OSCAR_RECENTLY_VIEWED_PRODUCTS = 20
 # Currency
 OSCAR_DEFAULT_CURRENCY = 'GBP'
 
+# Strategies
+OSCAR_PURCHASE_INFO_MEMO_SIZE = 0
+
+# Analytics
+OSCAR_ANALYTICS_BUFFER_SIZE = 0
+OSCAR_ANALYTICS_FLUSH_INTERVAL = 60
+
 # Paths
 OSCAR_IMAGE_FOLDER = 'images/products/%Y/%m/'
 OSCAR_PROMOTION_FOLDER = 'images/promotions/'
@@ -51,6 +59,9 @@ OSCAR_DASHBOARD_ITEMS_PER_PAGE = 20
 # Checkout
 OSCAR_ALLOW_ANON_CHECKOUT = False
 
+# Order processing
+OSCAR_BULK_CREATE_ORDER_LINES = False
+
 # Promotions
 COUNTDOWN, LIST, SINGLE_PRODUCT, TABBED_BLOCK = (
     'Countdown', 'List', 'SingleProduct', 'TabbedBlock')
@@ -79,9 +90,17 @@ OSCAR_ACCOUNTS_REDIRECT_URL = 'customer:profile-view'
 # disabled.
 OSCAR_EAGER_ALERTS = True
 
+# Categories
+OSCAR_CACHE_CATEGORY_TREE = False
+
+# Offers
+OSCAR_CACHE_SITE_OFFERS = False
+OSCAR_INCREMENTAL_OFFER_APPLICATION = False
+
 # Registration
 OSCAR_SEND_REGISTRATION_EMAIL = True
 OSCAR_FROM_EMAIL = 'oscar@example.com'
+OSCAR_EMAIL_OUTBOX = False
 
 # Slug handling
 OSCAR_SLUG_FUNCTION = 'oscar.core.utils.default_slugifier'
@@ -215,6 +234,13 @@ OSCAR_DASHBOARD_NAVIGATION = [
     },
 ]
 OSCAR_DASHBOARD_DEFAULT_ACCESS_FUNCTION = 'oscar.apps.dashboard.nav.default_access_fn'  # noqa
+OSCAR_DASHBOARD_STATS_TIMEOUT = 0
+
+# Reports
+OSCAR_USE_DISCOUNT_SUMMARIES = False
+
+# Search
+OSCAR_SEARCH_CHANGE_LOG = False
 
 # Search facets
 OSCAR_SEARCH_FACETS = {
@@ -3,9 +3,10 @@ from optparse import make_option
 
 from django.core.management.base import BaseCommand, CommandError
 
-from oscar.core.loading import get_class
+from oscar.core.loading import get_class, get_classes
 
-CatalogueImporter = get_class('partner.importers', 'CatalogueImporter')
+CatalogueImporter, BulkCatalogueImporter = get_classes(
+    'partner.importers', ['CatalogueImporter', 'BulkCatalogueImporter'])
 CatalogueImportError = get_class('partner.exceptions', 'CatalogueImportError')
 
 logger = logging.getLogger('oscar.catalogue.import')
@@ -19,16 +20,31 @@ class Command(BaseCommand):
         make_option('--flush', action='store_true', dest='flush',
                     default=False, help='Flush tables before importing'),
         make_option('--delimiter', dest='delimiter', default=",",
-                    help='Delimiter used within CSV file(s)'))
+                    help='Delimiter used within CSV file(s)'),
+        make_option('--bulk', action='store_true', dest='bulk',
+                    default=False,
+                    help='Import rows in chunks with bulk queries'),
+        make_option('--batch-size', dest='batch_size', type='int',
+                    default=1000,
+                    help='Number of rows imported per chunk with --bulk'),
+        make_option('--workers', dest='workers', type='int', default=None,
+                    help='Number of processes importing a file with --bulk'))
 
     def handle(self, *args, **options):
         if not args:
             raise CommandError("Please select a CSV file to import")
 
         logger.info("Starting catalogue import")
-        importer = CatalogueImporter(
-            logger, delimiter=options.get('delimiter'),
-            flush=options.get('flush'))
+        if options.get('bulk'):
+            importer = BulkCatalogueImporter(
+                logger, delimiter=options.get('delimiter'),
+                flush=options.get('flush'),
+                batch_size=options.get('batch_size'),
+                workers=options.get('workers'))
+        else:
+            importer = CatalogueImporter(
+                logger, delimiter=options.get('delimiter'),
+                flush=options.get('flush'))
         for file_path in args:
             logger.info(" - Importing records from '%s'" % file_path)
             try:
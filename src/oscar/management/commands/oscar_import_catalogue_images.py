@@ -3,9 +3,10 @@ from optparse import make_option
 
 from django.core.management.base import BaseCommand, CommandError
 
-from oscar.core.loading import get_class
+from oscar.core.loading import get_classes
 
-Importer = get_class('catalogue.utils', 'Importer')
+Importer, ParallelImporter = get_classes(
+    'catalogue.utils', ['Importer', 'ParallelImporter'])
 
 logger = logging.getLogger('oscar.catalogue.import')
 
@@ -19,6 +20,19 @@ class Command(BaseCommand):
                     dest='filename',
                     default='upc',
                     help='Product field to lookup from image filename'),
+        make_option('--parallel', action='store_true', dest='parallel',
+                    default=False,
+                    help='Import images in batches with a pool of processes'),
+        make_option('--workers', dest='workers', type='int', default=None,
+                    help='Number of processes verifying images with '
+                         '--parallel (defaults to the number of CPUs)'),
+        make_option('--batch-size', dest='batch_size', type='int',
+                    default=500,
+                    help='Number of images imported per batch with '
+                         '--parallel'),
+        make_option('--state-file', dest='state_file', default=None,
+                    help='File recording the imported images with '
+                         '--parallel, to resume an interrupted import'),
     )
 
     def handle(self, *args, **options):
@@ -27,5 +41,12 @@ class Command(BaseCommand):
 
         logger.info("Starting image import")
         dirname = args[0]
-        importer = Importer(logger, field=options.get('filename'))
+        if options.get('parallel'):
+            importer = ParallelImporter(
+                logger, field=options.get('filename'),
+                workers=options.get('workers'),
+                batch_size=options.get('batch_size'),
+                state_file=options.get('state_file'))
+        else:
+            importer = Importer(logger, field=options.get('filename'))
         importer.handle(dirname)
@@ -0,0 +1,47 @@
+import logging
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from oscar.core.loading import get_class, get_model
+
+record_orders = get_class('analytics.utils', 'record_orders')
+Order = get_model('order', 'Order')
+ProductRecord = get_model('analytics', 'ProductRecord')
+UserRecord = get_model('analytics', 'UserRecord')
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = ("Recalculate the purchase counts of product records and the order "
+            "statistics of user records from the order history")
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=1000,
+            help="Number of orders to process at once")
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        with transaction.atomic():
+            ProductRecord._default_manager.update(num_purchases=0)
+            UserRecord._default_manager.update(
+                num_orders=0, num_order_lines=0, num_order_items=0,
+                total_spent=0, date_last_order=None)
+
+        # Orders are processed in batches, so they don't all need to be
+        # loaded at once
+        last_pk, num_orders = 0, 0
+        while True:
+            pks = list(Order._default_manager.filter(
+                pk__gt=last_pk).order_by('pk').values_list(
+                    'pk', flat=True)[:batch_size])
+            if not pks:
+                break
+            with transaction.atomic():
+                record_orders(Order._default_manager.filter(pk__in=pks))
+            last_pk = pks[-1]
+            num_orders += len(pks)
+            logger.info("Recorded %d orders", num_orders)
+        self.stdout.write("Rebuilt analytics from %d orders" % num_orders)
@@ -1,6 +1,7 @@
 import logging
 
-from django.core.management.base import BaseCommand
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
 from django.utils.translation import ugettext_lazy as _
 
 from oscar.apps.customer.alerts import utils
@@ -16,10 +17,41 @@ class Command(BaseCommand):
     help = _("Check for products that are back in "
              "stock and send out alerts")
 
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--incremental', action='store_true', default=False,
+            help="Only check the products whose stock records changed since "
+                 "the last incremental run. The time of the last run is "
+                 "kept in Django's cache.")
+        parser.add_argument(
+            '--batch-size', type=int, default=utils.BATCH_SIZE,
+            help="Number of products checked at once")
+        parser.add_argument(
+            '--shard', type=int, default=0,
+            help="The shard of the products to check (0 to num-shards - 1)")
+        parser.add_argument(
+            '--num-shards', type=int, default=1,
+            help="Number of processes the products are split across")
+
     def handle(self, **options):
         """
         Check all products with active product alerts for
         availability and send out email alerts when a product is
         available to buy.
         """
-        utils.send_alerts()
+        shard, num_shards = options['shard'], options['num_shards']
+        if not 0 <= shard < num_shards:
+            raise CommandError("The shard must be between 0 and %d" % (
+                num_shards - 1))
+
+        since = None
+        # Stock changed while sending is picked up by the next run
+        started = timezone.now()
+        if options['incremental']:
+            since = utils.get_last_run(shard, num_shards)
+        num_emails = utils.send_alerts(
+            since=since, batch_size=options['batch_size'], shard=shard,
+            num_shards=num_shards)
+        if options['incremental']:
+            utils.set_last_run(started, shard, num_shards)
+        logger.info("Sent %d alert emails", num_emails)
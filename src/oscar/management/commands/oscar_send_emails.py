@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from oscar.core.loading import get_class
+
+send_queued_emails = get_class('customer.outbox', 'send_queued_emails')
+
+
+class Command(BaseCommand):
+    help = ("Send the emails queued in the outbox, if OSCAR_EMAIL_OUTBOX "
+            "is set")
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=100,
+            help="Number of emails sent over the mail connection at once")
+
+    def handle(self, *args, **options):
+        num_sent = send_queued_emails(batch_size=options['batch_size'])
+        self.stdout.write("Sent %d emails" % num_sent)
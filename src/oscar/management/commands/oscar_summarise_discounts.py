@@ -0,0 +1,49 @@
+import datetime
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from oscar.core.loading import get_class, get_model
+
+summarise_discounts = get_class('order.summaries', 'summarise_discounts')
+Order = get_model('order', 'Order')
+OrderDiscountSummary = get_model('order', 'OrderDiscountSummary')
+
+
+def parse_date(value):
+    return datetime.datetime.strptime(value, '%Y-%m-%d').date()
+
+
+class Command(BaseCommand):
+    help = ("Summarise the discounts of the orders placed on each day, for "
+            "the offer and voucher reports")
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--start-date', type=parse_date,
+            help="First day to summarise (YYYY-MM-DD). Defaults to the last "
+                 "day that has been summarised before.")
+        parser.add_argument(
+            '--end-date', type=parse_date,
+            help="Last day to summarise (YYYY-MM-DD). Defaults to today.")
+
+    def handle(self, *args, **options):
+        start_date = options['start_date'] or self.get_default_start_date()
+        end_date = options['end_date'] or timezone.localtime(
+            timezone.now()).date()
+        if start_date is None:
+            self.stdout.write("There are no orders to summarise")
+            return
+        num_summaries = summarise_discounts(start_date, end_date)
+        self.stdout.write("Created %d summaries for %s to %s" % (
+            num_summaries, start_date, end_date))
+
+    def get_default_start_date(self):
+        # The last summarised day may have been summarised before it ended
+        summary = OrderDiscountSummary._default_manager.order_by(
+            '-date').first()
+        if summary is not None:
+            return summary.date
+        order = Order._default_manager.order_by('date_placed').first()
+        if order is not None:
+            return timezone.localtime(order.date_placed).date()
@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from oscar.core.loading import get_class
+
+update_full_names_and_slugs = get_class(
+    'catalogue.categories', 'update_full_names_and_slugs')
+
+
+class Command(BaseCommand):
+    help = "Recalculate the full names and slugs of all categories"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=500,
+            help="Number of categories to update with each query")
+
+    def handle(self, *args, **options):
+        num_updated = update_full_names_and_slugs(options['batch_size'])
+        self.stdout.write("Updated %d categories" % num_updated)
@@ -0,0 +1,22 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from oscar.apps.dashboard import statistics
+from oscar.core.loading import get_class
+
+IndexView = get_class('dashboard.views', 'IndexView')
+
+
+class Command(BaseCommand):
+    help = ("Take a new snapshot of the statistics shown on the dashboard's "
+            "index page")
+
+    def handle(self, *args, **options):
+        if not statistics.is_enabled():
+            raise CommandError(
+                "OSCAR_DASHBOARD_STATS_TIMEOUT must be set to store "
+                "dashboard statistics")
+        statistics.take_snapshot(IndexView().compute_stats)
+        self.stdout.write(
+            "Updated the dashboard statistics, which are kept for %d "
+            "seconds" % settings.OSCAR_DASHBOARD_STATS_TIMEOUT)
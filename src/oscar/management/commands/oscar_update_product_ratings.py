@@ -1,10 +1,14 @@
 # -*- coding: utf-8 -*-
 
 from django.core.management.base import BaseCommand
+from django.utils import timezone
 
-from oscar.core.loading import get_model
+from oscar.core.loading import get_classes
 
-Product = get_model('catalogue', 'Product')
+(update_ratings, get_changed_product_ids, get_last_run, set_last_run,
+ BATCH_SIZE) = get_classes('catalogue.reviews.ratings', [
+     'update_ratings', 'get_changed_product_ids', 'get_last_run',
+     'set_last_run', 'BATCH_SIZE'])
 
 
 class Command(BaseCommand):
@@ -12,10 +16,27 @@ class Command(BaseCommand):
               Should only be necessary when changing to e.g. a weight-based
               rating."""
 
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--incremental', action='store_true', default=False,
+            help="Only update the products whose reviews changed since the "
+                 "last incremental run. The time of the last run is kept in "
+                 "Django's cache.")
+        parser.add_argument(
+            '--batch-size', type=int, default=BATCH_SIZE,
+            help="Number of products whose ratings are calculated at once")
+
     def handle(self, *args, **options):
-        # Iterate over all Products (not just ones with reviews)
-        products = Product.objects.all()
-        for product in products:
-            product.update_rating()
+        product_ids = None
+        # Reviews changed while updating are picked up by the next run
+        started = timezone.now()
+        if options['incremental']:
+            since = get_last_run()
+            if since is not None:
+                product_ids = get_changed_product_ids(since)
+        num_updated = update_ratings(
+            product_ids, batch_size=options['batch_size'])
+        if options['incremental']:
+            set_last_run(started)
         self.stdout.write(
-            'Successfully updated %s products\n' % products.count())
+            'Successfully updated %s products\n' % num_updated)
@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand
+
+from haystack.constants import DEFAULT_ALIAS
+
+from oscar.core.loading import get_class
+
+update_index = get_class('search.indexing', 'update_index')
+BATCH_SIZE = get_class('search.indexing', 'BATCH_SIZE')
+
+
+class Command(BaseCommand):
+    help = ("Reindex the products that have changed since the last run, if "
+            "OSCAR_SEARCH_CHANGE_LOG is set")
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=BATCH_SIZE,
+            help="Number of products reindexed at once")
+        parser.add_argument(
+            '--workers', type=int, default=None,
+            help="Number of processes reindexing the products")
+        parser.add_argument(
+            '--using', default=DEFAULT_ALIAS,
+            help="The Haystack connection to update")
+
+    def handle(self, *args, **options):
+        num_indexed = update_index(
+            batch_size=options['batch_size'], workers=options['workers'],
+            using=options['using'])
+        self.stdout.write("Reindexed %d products" % num_indexed)
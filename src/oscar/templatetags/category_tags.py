@@ -1,5 +1,6 @@
 from django import template
 
+from oscar.apps.catalogue import tree
 from oscar.core.loading import get_model
 
 register = template.Library()
@@ -21,9 +22,14 @@ def get_annotated_list(depth=None, parent=None):
 
     start_depth, prev_depth = (None, None)
     if parent:
-        categories = parent.get_descendants()
+        if tree.is_enabled():
+            categories = tree.get_tree().get_descendants(parent)
+        else:
+            categories = parent.get_descendants()
         if max_depth is not None:
             max_depth += parent.get_depth()
+    elif tree.is_enabled():
+        categories = tree.get_tree().get_categories()
     else:
         categories = Category.get_tree()
 
@@ -1,10 +1,19 @@
 from django import template
 
+from oscar.core.loading import get_class
+
+prefetch_purchase_info = get_class('partner.views', 'prefetch_purchase_info')
+
 register = template.Library()
 
 
 @register.assignment_tag
 def purchase_info_for_product(request, product):
+    # Use the purchase info fetched in bulk for the page, if any
+    cache = getattr(request, '_purchase_info_cache', None)
+    if cache and product.id in cache:
+        return cache[product.id]
+
     if product.is_parent:
         return request.strategy.fetch_for_parent(product)
 
@@ -14,3 +23,13 @@ def purchase_info_for_product(request, product):
 @register.assignment_tag
 def purchase_info_for_line(request, line):
     return request.strategy.fetch_for_line(line)
+
+
+@register.simple_tag
+def prefetch_purchase_info_for_products(request, products):
+    """
+    Fetch the purchase info of all passed products at once, so that rendering
+    each of them with ``purchase_info_for_product`` doesn't need any queries.
+    """
+    prefetch_purchase_info(request, products)
+    return ''
@@ -0,0 +1,69 @@
+"""
+Compare updating the analytics records for every product view with buffering
+the views and writing them in bulk, for traffic concentrated on a few popular
+products.
+
+Every direct update of a product's record takes a lock on its row until the
+transaction ends, so concurrent requests viewing the same product queue up
+behind each other. The number of UPDATEs of these rows is reported as a
+measure of that contention, as SQLite can't show it directly.
+
+Run with ``make benchmark``.
+"""
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext, override_settings
+
+from oscar.apps.analytics import buffer, receivers
+from oscar.core.loading import get_model
+from oscar.test import factories
+
+from . import utils
+
+ProductRecord = get_model('analytics', 'ProductRecord')
+
+# (number of views, number of products viewed)
+SCENARIOS = [(100, 1), (1000, 5), (1000, 50)]
+
+
+def count_record_updates(queries):
+    table = ProductRecord._meta.db_table
+    return len([query for query in queries
+                if query['sql'].startswith('UPDATE "%s"' % table)])
+
+
+@override_settings(OSCAR_ANALYTICS_FLUSH_INTERVAL=None)
+class TestAnalyticsBuffer(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.products = utils.create_catalogue(
+            max(num_products for __, num_products in SCENARIOS))
+        cls.users = [factories.UserFactory() for __ in range(10)]
+
+    def view_products(self, num_views, num_products):
+        for i in range(num_views):
+            receivers.receive_product_view(
+                self, product=self.products[i % num_products],
+                user=self.users[i % len(self.users)])
+        buffer.flush()
+
+    def test_buffered_updates(self):
+        print("\n%6s %8s %30s %30s" % (
+            "views", "products", "direct (ms / queries / updates)",
+            "buffered (ms / queries / updates)"))
+        for num_views, num_products in SCENARIOS:
+            row = []
+            for buffer_size in (0, num_views):
+                with override_settings(
+                        OSCAR_ANALYTICS_BUFFER_SIZE=buffer_size):
+                    result = utils.measure(
+                        lambda: self.view_products(num_views, num_products),
+                        repeat=1)
+                    with CaptureQueriesContext(connection) as context:
+                        self.view_products(num_views, num_products)
+                row.append((result['wall_time'] * 1000, result['queries'],
+                            count_record_updates(context.captured_queries)))
+            print("%6d %8d %15.1f / %5d / %5d %15.1f / %5d / %5d" % (
+                num_views, num_products, row[0][0], row[0][1], row[0][2],
+                row[1][0], row[1][1], row[1][2]))
@@ -0,0 +1,108 @@
+"""
+Benchmarks for the stages of pricing a basket: applying offers, finding the
+lines a condition applies to, applying benefits, breaking down line prices
+and calculating the basket totals.
+
+Run with ``make benchmark``. The basket sizes, offer counts and range shapes
+can be set with the ``--benchmark-lines``, ``--benchmark-offers`` and
+``--benchmark-shapes`` options. Results are compared with the baseline in
+``baselines/basket.json`` and the benchmark fails if a stage runs more
+queries, or allocates more memory than ``--benchmark-tolerance`` allows.
+Pass ``--benchmark-save`` to store the results as the new baseline.
+"""
+import os
+from itertools import product as cartesian_product
+
+import pytest
+from django.test import TestCase
+
+from oscar.apps.offer.applicator import Applicator
+
+from . import utils
+
+BASELINE_PATH = os.path.join(
+    os.path.dirname(__file__), 'baselines', 'basket.json')
+
+
+def get_scenarios():
+    config = pytest.config
+    lines = [int(n) for n in config.getoption('benchmark_lines').split(',')]
+    offers = [int(n) for n in config.getoption('benchmark_offers').split(',')]
+    shapes = config.getoption('benchmark_shapes').split(',')
+    return list(cartesian_product(lines, offers, shapes))
+
+
+class TestBasketPricing(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.scenarios = get_scenarios()
+        cls.products = utils.create_catalogue(
+            max(num_lines for num_lines, __, __ in cls.scenarios) * 2)
+
+    def reset(self, basket, offers=None):
+        """
+        Remove all discounts and reload the basket's lines, optionally
+        re-applying the offers
+        """
+        basket.reset_offer_applications()
+        basket.all_lines()
+        if offers is not None:
+            Applicator().apply_offers(basket, offers)
+
+    def benchmark_stages(self, basket, offers):
+        applicator = Applicator()
+
+        def get_applicable_lines():
+            for offer in offers:
+                offer.condition.proxy().get_applicable_lines(offer, basket)
+
+        def apply_benefits():
+            for offer in offers:
+                offer.benefit.proxy().apply(
+                    basket, offer.condition.proxy(), offer)
+
+        def get_price_breakdowns():
+            for line in basket.all_lines():
+                line.get_price_breakdown()
+
+        def get_totals():
+            basket.total_excl_tax
+            basket.total_incl_tax
+            basket.total_incl_tax_excl_discounts
+            basket.total_discount
+
+        return [
+            ('apply_offers', lambda: applicator.apply_offers(basket, offers),
+             lambda: self.reset(basket)),
+            ('condition_lines', get_applicable_lines,
+             lambda: self.reset(basket)),
+            ('benefit_apply', apply_benefits, lambda: self.reset(basket)),
+            ('price_breakdown', get_price_breakdowns,
+             lambda: self.reset(basket, offers)),
+            ('totals', get_totals, lambda: self.reset(basket, offers)),
+        ]
+
+    def test_basket_pricing(self):
+        results = {}
+        for num_lines, num_offers, shape in self.scenarios:
+            offers = utils.create_offers(
+                self.products, num_offers, shapes=(shape,))
+            basket = utils.create_basket(self.products, num_lines)
+            basket.all_lines()
+            for stage, func, setup in self.benchmark_stages(basket, offers):
+                name = "%s lines=%d offers=%d shape=%s" % (
+                    stage, num_lines, num_offers, shape)
+                results[name] = utils.measure(func, setup=setup)
+
+        baseline = utils.load_baseline(BASELINE_PATH)
+        print('\n' + utils.format_results(results, baseline))
+        if pytest.config.getoption('benchmark_save'):
+            baseline.update(results)
+            utils.save_baseline(BASELINE_PATH, baseline)
+            return
+
+        regressions = utils.find_regressions(
+            results, baseline, pytest.config.getoption('benchmark_tolerance'))
+        self.assertFalse(
+            regressions, "Regressions found:\n" + '\n'.join(regressions))
@@ -0,0 +1,61 @@
+"""
+Compare importing a catalogue CSV file row by row with importing it in
+chunks with bulk queries, both into an empty catalogue and over the
+existing products.
+
+Run with ``make benchmark``. The file sizes can be set with the
+``--benchmark-import-rows`` option, e.g. ``--benchmark-import-rows=1000000``
+for a file with a million rows. The row-by-row importer is only run for
+files of up to 10,000 rows, as it takes too long for larger ones.
+"""
+import logging
+import os
+import shutil
+import tempfile
+
+import pytest
+from django.test import TestCase
+
+from oscar.apps.partner.importers import (
+    BulkCatalogueImporter, CatalogueImporter)
+
+from . import utils
+
+logger = logging.getLogger('oscar.benchmarks')
+
+MAX_ROW_BY_ROW_ROWS = 10000
+
+
+class TestCatalogueImport(TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def get_importers(self, num_rows):
+        importers = [('bulk', BulkCatalogueImporter(logger, flush=True))]
+        if num_rows <= MAX_ROW_BY_ROW_ROWS:
+            importers.insert(0, ('row by row', CatalogueImporter(
+                logger, flush=True)))
+        return importers
+
+    def test_catalogue_import(self):
+        sizes = [int(n) for n in pytest.config.getoption(
+            'benchmark_import_rows').split(',')]
+        print("\n%8s %12s %30s %30s" % (
+            "rows", "importer", "new (ms / queries)",
+            "existing (ms / queries)"))
+        for num_rows in sizes:
+            path = os.path.join(self.directory, 'catalogue-%d.csv' % num_rows)
+            utils.write_catalogue_csv(path, num_rows)
+            for name, importer in self.get_importers(num_rows):
+                importer._flush = True
+                new = utils.measure(lambda: importer.handle(path), repeat=1)
+                importer._flush = False
+                existing = utils.measure(
+                    lambda: importer.handle(path), repeat=1)
+                print("%8d %12s %19.0f / %8d %19.0f / %8d" % (
+                    num_rows, name, new['wall_time'] * 1000, new['queries'],
+                    existing['wall_time'] * 1000, existing['queries']))
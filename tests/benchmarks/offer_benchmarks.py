@@ -0,0 +1,69 @@
+"""
+Compare re-applying all offers with re-applying only the offers affected by a
+basket change, for baskets and offer sets of various sizes. Each offer has its
+own range, so that a change to a line affects a single offer.
+
+Run with ``make benchmark``.
+"""
+from django.test import TestCase
+from django.test.utils import override_settings
+
+from oscar.apps.offer.applicator import Applicator
+
+from . import utils
+
+# (number of basket lines, number of offers)
+SCENARIOS = [(5, 5), (25, 10), (100, 20), (100, 50)]
+
+
+class FixedOffersApplicator(Applicator):
+
+    def __init__(self, offers):
+        self.offers = offers
+
+    def get_offers(self, basket, user=None, request=None):
+        return self.offers
+
+
+@override_settings(OSCAR_INCREMENTAL_OFFER_APPLICATION=True)
+class TestOfferReapplication(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.products = utils.create_catalogue(200)
+        num_offers = max(num_offers for __, num_offers in SCENARIOS)
+        cls.offers = []
+        for i in range(num_offers):
+            cls.offers.extend(utils.create_offers(
+                cls.products[i::num_offers], 1, shapes=('products',), seed=i))
+
+    def test_incremental_reapplication(self):
+        print("\n%6s %6s %24s %24s" % (
+            "lines", "offers", "full (ms / queries)",
+            "incremental (ms / queries)"))
+        for num_lines, num_offers in SCENARIOS:
+            basket = utils.create_basket(self.products, num_lines)
+            applicator = FixedOffersApplicator(self.offers[:num_offers])
+            product = basket.all_lines()[0].product
+
+            def change_line(incremental):
+                basket.reset_offer_applications()
+                applicator.apply(basket)
+                basket.add_product(product)
+                if not incremental:
+                    basket.reset_offer_applications()
+
+            results = []
+            for incremental in (False, True):
+                results.append(utils.measure(
+                    lambda: applicator.apply(basket),
+                    setup=lambda: change_line(incremental)))
+                state = utils.get_offer_state(basket)
+                basket.reset_offer_applications()
+                applicator.apply(basket)
+                self.assertEqual(utils.get_offer_state(basket), state)
+
+            print("%6d %6d %17.1f / %4d %17.1f / %4d" % (
+                num_lines, num_offers,
+                results[0]['wall_time'] * 1000, results[0]['queries'],
+                results[1]['wall_time'] * 1000, results[1]['queries']))
@@ -0,0 +1,244 @@
+"""
+Helpers for generating synthetic catalogues, offers and baskets, and for
+measuring the code under benchmark.
+"""
+import json
+import os
+import random
+import time
+from decimal import Decimal as D
+
+from django.db import connection, reset_queries
+from django.test.utils import CaptureQueriesContext
+
+from oscar.apps.partner import strategy
+from oscar.core.loading import get_model
+from oscar.test import factories
+
+try:
+    import tracemalloc
+except ImportError:  # Python 2
+    tracemalloc = None
+
+Basket = get_model('basket', 'Basket')
+Benefit = get_model('offer', 'Benefit')
+Category = get_model('catalogue', 'Category')
+Condition = get_model('offer', 'Condition')
+ConditionalOffer = get_model('offer', 'ConditionalOffer')
+ProductCategory = get_model('catalogue', 'ProductCategory')
+ProductClass = get_model('catalogue', 'ProductClass')
+Range = get_model('offer', 'Range')
+RangeProduct = get_model('offer', 'RangeProduct')
+
+# The ways a range can be defined
+RANGE_SHAPES = ('all', 'products', 'classes', 'categories')
+
+
+def create_catalogue(num_products, num_classes=5, num_categories=5, seed=0):
+    """
+    Create products with a stockrecord each, spread over a number of product
+    classes and (two-level) categories.
+    """
+    rng = random.Random(seed)
+    classes = [ProductClass.objects.create(name="Class %d" % i)
+               for i in range(num_classes)]
+    categories = []
+    for i in range(num_categories):
+        root = Category.add_root(name="Category %d" % i)
+        categories.extend([root, root.add_child(name="Sub %d" % i)])
+
+    products = []
+    for i in range(num_products):
+        product = factories.create_product(
+            title="Product %d" % i, product_class=rng.choice(classes).name,
+            price=D(rng.randint(100, 10000)) / 100, num_in_stock=1000)
+        ProductCategory.objects.create(
+            product=product, category=rng.choice(categories))
+        products.append(product)
+    return products
+
+
+def write_catalogue_csv(path, num_rows, num_categories=50, num_partners=5,
+                        seed=0):
+    """
+    Write a CSV file in the format of ``oscar_import_catalogue``, with stock
+    data for most of the rows
+    """
+    rng = random.Random(seed)
+    with open(path, 'w') as f:
+        for i in range(num_rows):
+            row = ['Book', 'Books > Category %d' % rng.randrange(
+                num_categories), '%013d' % i, 'Title %d' % i, 'NULL']
+            if rng.random() < 0.9:
+                price = rng.randint(100, 10000) / 100.0
+                row += ['Partner %d' % rng.randrange(num_partners),
+                        'SKU%d' % i, '%.2f' % price,
+                        str(rng.randint(0, 100))]
+            f.write(','.join('"%s"' % value for value in row) + '\n')
+
+
+def create_range(products, shape, size=10, seed=0):
+    """
+    Create a range of the given shape. Ranges defined by products, classes or
+    categories contain a random selection of them.
+    """
+    rng = random.Random(seed)
+    product_range = Range.objects.create(
+        name="Range %s %d" % (shape, Range.objects.count()),
+        includes_all_products=(shape == 'all'))
+    if shape == 'products':
+        RangeProduct.objects.bulk_create([
+            RangeProduct(range=product_range, product=product)
+            for product in rng.sample(products, min(size, len(products)))])
+    elif shape == 'classes':
+        product_range.classes.add(rng.choice(list(ProductClass.objects.all())))
+    elif shape == 'categories':
+        product_range.included_categories.add(
+            rng.choice(list(Category.get_root_nodes())))
+    return product_range
+
+
+def create_offers(products, num_offers, shapes=RANGE_SHAPES, seed=0):
+    """
+    Create site offers giving a percentage discount when a number of items
+    from their range are in the basket, with ranges of the given shapes.
+    """
+    rng = random.Random(seed)
+    offers = []
+    for i in range(num_offers):
+        product_range = create_range(
+            products, shapes[i % len(shapes)], seed=seed + i)
+        condition = Condition.objects.create(
+            range=product_range, type=Condition.COUNT,
+            value=rng.randint(1, 3))
+        benefit = Benefit.objects.create(
+            range=product_range, type=Benefit.PERCENTAGE,
+            value=rng.randint(5, 25))
+        offers.append(ConditionalOffer.objects.create(
+            name="Offer %d" % ConditionalOffer.objects.count(), offer_type=ConditionalOffer.SITE,
+            condition=condition, benefit=benefit, priority=i % 3))
+    return offers
+
+
+def create_basket(products, num_lines, max_quantity=3, seed=0):
+    """
+    Create a basket with the given number of lines of distinct products
+    """
+    rng = random.Random(seed)
+    basket = Basket.objects.create()
+    basket.strategy = strategy.Default()
+    for product in rng.sample(products, min(num_lines, len(products))):
+        basket.add_product(product, rng.randint(1, max_quantity))
+    return basket
+
+
+def get_offer_state(basket):
+    """
+    Return the outcome of applying offers to a basket in a comparable form
+    """
+    discounts = dict(
+        (application['offer'].id, (application['freq'],
+                                   application['discount']))
+        for application in basket.offer_applications)
+    lines = dict(
+        (line.id, line.get_discount_state()) for line in basket.all_lines())
+    return discounts, lines
+
+
+def measure(func, setup=None, repeat=3):
+    """
+    Call func repeatedly and return the best wall time (in seconds), the
+    number of queries and the peak memory allocated (in KiB) by a call. If
+    passed, setup is called before each call of func, outside of the
+    measurement.
+
+    Allocations are traced in a separate call so that tracing doesn't skew
+    the timings, and are ``None`` where tracemalloc isn't available.
+    """
+    timings = []
+    for __ in range(repeat):
+        if setup is not None:
+            setup()
+        # The query log is bounded, so clear it to get an accurate count
+        reset_queries()
+        with CaptureQueriesContext(connection) as queries:
+            start = time.time()
+            func()
+            timings.append(time.time() - start)
+
+    allocations = None
+    if tracemalloc is not None:
+        if setup is not None:
+            setup()
+        tracemalloc.start()
+        try:
+            func()
+            __, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        allocations = peak / 1024.0
+    return {'wall_time': min(timings), 'queries': len(queries),
+            'allocations': allocations}
+
+
+def load_baseline(path):
+    """
+    Return the results stored at path, or an empty dict if there are none
+    """
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        return json.load(f)
+
+
+def save_baseline(path, results):
+    with open(path, 'w') as f:
+        json.dump(results, f, indent=2, sort_keys=True)
+        f.write('\n')
+
+
+def find_regressions(results, baseline, tolerance):
+    """
+    Return a description of each result which regressed compared to the
+    baseline.
+
+    Any extra query is a regression, as is an increase in allocations beyond
+    the tolerance (a fraction of the baseline). Wall times depend on the
+    machine running the benchmarks, so they are reported but never treated
+    as regressions.
+    """
+    regressions = []
+    for name, result in sorted(results.items()):
+        expected = baseline.get(name)
+        if expected is None:
+            continue
+        if result['queries'] > expected['queries']:
+            regressions.append("%s: %d queries (baseline %d)" % (
+                name, result['queries'], expected['queries']))
+        if (result['allocations'] is not None and
+                expected.get('allocations') is not None and
+                result['allocations'] >
+                expected['allocations'] * (1 + tolerance)):
+            regressions.append("%s: %.1f KiB allocated (baseline %.1f)" % (
+                name, result['allocations'], expected['allocations']))
+    return regressions
+
+
+def format_results(results, baseline):
+    """
+    Return a table of the results, with the change in wall time compared to
+    the baseline
+    """
+    rows = ["%-60s %10s %8s %12s %8s" % (
+        "benchmark", "time (ms)", "queries", "alloc (KiB)", "vs base")]
+    for name, result in sorted(results.items()):
+        change = ''
+        expected = baseline.get(name)
+        if expected and expected['wall_time']:
+            change = "%+.0f%%" % (
+                100 * (result['wall_time'] / expected['wall_time'] - 1))
+        allocations = result['allocations']
+        rows.append("%-60s %10.2f %8d %12s %8s" % (
+            name, result['wall_time'] * 1000, result['queries'],
+            '-' if allocations is None else "%.1f" % allocations, change))
+    return '\n'.join(rows)
@@ -9,6 +9,26 @@ def pytest_addoption(parser):
     parser.addoption(
         '--deprecation', choices=['strict', 'log', 'none'], default='log')
 
+    # Options for the benchmarks in tests/benchmarks
+    parser.addoption(
+        '--benchmark-lines', default='10,100',
+        help="Comma-separated numbers of basket lines to benchmark")
+    parser.addoption(
+        '--benchmark-offers', default='5,25',
+        help="Comma-separated numbers of offers to benchmark")
+    parser.addoption(
+        '--benchmark-shapes', default='all,products,classes,categories',
+        help="Comma-separated range shapes to benchmark")
+    parser.addoption(
+        '--benchmark-import-rows', default='1000,10000',
+        help="Comma-separated numbers of CSV rows to import")
+    parser.addoption(
+        '--benchmark-tolerance', type=float, default=0.25,
+        help="Allowed increase in allocations compared to the baseline")
+    parser.addoption(
+        '--benchmark-save', action='store_true',
+        help="Store the benchmark results as the new baseline")
+
 
 def pytest_configure(config):
     os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'tests.settings')
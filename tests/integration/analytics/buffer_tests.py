@@ -0,0 +1,75 @@
+from django.contrib.auth.models import AnonymousUser
+from django.test import TestCase
+from django.test.utils import override_settings
+
+from oscar.apps.analytics import buffer, receivers
+from oscar.apps.analytics.models import (
+    ProductRecord, UserProductView, UserRecord)
+from oscar.test import factories
+
+
+@override_settings(OSCAR_ANALYTICS_BUFFER_SIZE=100,
+                   OSCAR_ANALYTICS_FLUSH_INTERVAL=None)
+class TestBufferedAnalytics(TestCase):
+
+    def setUp(self):
+        self.products = [factories.create_product() for __ in range(3)]
+        self.user = factories.UserFactory()
+
+    def view(self, product, user=None):
+        receivers.receive_product_view(self, product=product, user=user)
+
+    def add_to_basket(self, product, user=None):
+        receivers.receive_basket_addition(self, product=product, user=user)
+
+    def test_does_not_write_events_until_flushed(self):
+        self.view(self.products[0], self.user)
+        self.add_to_basket(self.products[0], self.user)
+        self.assertFalse(ProductRecord.objects.exists())
+        self.assertFalse(UserRecord.objects.exists())
+
+    def test_creates_records_on_flush(self):
+        for __ in range(3):
+            self.view(self.products[0], self.user)
+        self.view(self.products[1])
+        self.add_to_basket(self.products[0], self.user)
+        buffer.flush()
+
+        record = ProductRecord.objects.get(product=self.products[0])
+        self.assertEqual(record.num_views, 3)
+        self.assertEqual(record.num_basket_additions, 1)
+        self.assertEqual(
+            ProductRecord.objects.get(product=self.products[1]).num_views, 1)
+        user_record = UserRecord.objects.get(user=self.user)
+        self.assertEqual(user_record.num_product_views, 3)
+        self.assertEqual(user_record.num_basket_additions, 1)
+        self.assertEqual(
+            UserProductView.objects.filter(user=self.user).count(), 3)
+
+    def test_updates_existing_records_in_bulk(self):
+        for product in self.products:
+            ProductRecord.objects.create(product=product, num_views=10)
+        for product in self.products:
+            for __ in range(5):
+                self.view(product)
+
+        # Reading the existing records and one update for all of them
+        with self.assertNumQueries(2):
+            buffer.flush()
+        for record in ProductRecord.objects.all():
+            self.assertEqual(record.num_views, 15)
+
+    def test_flushes_when_full(self):
+        with override_settings(OSCAR_ANALYTICS_BUFFER_SIZE=2):
+            self.view(self.products[0])
+            self.assertFalse(ProductRecord.objects.exists())
+            self.view(self.products[0])
+            self.assertEqual(
+                ProductRecord.objects.get(product=self.products[0]).num_views,
+                2)
+
+    def test_ignores_anonymous_users(self):
+        self.view(self.products[0], AnonymousUser())
+        buffer.flush()
+        self.assertFalse(UserRecord.objects.exists())
+        self.assertFalse(UserProductView.objects.exists())
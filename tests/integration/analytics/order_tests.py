@@ -0,0 +1,94 @@
+import datetime
+from decimal import Decimal as D
+
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils.six import StringIO
+
+from oscar.apps.analytics.models import ProductRecord, UserRecord
+from oscar.apps.analytics.receivers import _record_products_in_order
+from oscar.apps.analytics.utils import record_orders
+from oscar.apps.basket.models import Basket
+from oscar.apps.order.models import Order
+from oscar.apps.partner import strategy
+from oscar.test import factories
+
+
+class OrderMixin(object):
+
+    def create_order(self, products, user=None, quantity=1):
+        basket = Basket.objects.create()
+        basket.strategy = strategy.Default()
+        for product in products:
+            basket.add_product(product, quantity)
+        return factories.create_order(basket=basket, user=user)
+
+    def create_products(self, num_products):
+        return [factories.create_product(price=D('10.00'))
+                for __ in range(num_products)]
+
+
+class TestRecordingOrderedProducts(OrderMixin, TestCase):
+
+    def test_records_purchases(self):
+        products = self.create_products(2)
+        self.create_order(products, quantity=2)
+        self.create_order(products[:1], quantity=3)
+        self.assertEqual(
+            ProductRecord.objects.get(product=products[0]).num_purchases, 5)
+        self.assertEqual(
+            ProductRecord.objects.get(product=products[1]).num_purchases, 2)
+
+    def test_does_not_query_per_line(self):
+        for num_lines in (1, 10):
+            order = self.create_order(self.create_products(num_lines))
+            # Aggregating the lines, reading the existing records (created
+            # when the order was placed) and updating them
+            with self.assertNumQueries(3):
+                _record_products_in_order(order)
+
+
+class TestRecordingOrders(OrderMixin, TestCase):
+
+    def setUp(self):
+        self.user = factories.UserFactory()
+        self.products = self.create_products(3)
+        self.orders = [
+            self.create_order(self.products, self.user),
+            self.create_order(self.products[:1], self.user, quantity=2),
+            self.create_order(self.products[1:])]
+        self.expected = self.get_records()
+
+    def get_records(self):
+        user_record = UserRecord.objects.get(user=self.user)
+        return (
+            list(ProductRecord.objects.order_by('product_id').values_list(
+                'product_id', 'num_purchases')),
+            (user_record.num_orders, user_record.num_order_lines,
+             user_record.num_order_items, user_record.total_spent,
+             user_record.date_last_order))
+
+    def test_records_many_orders_at_once(self):
+        ProductRecord.objects.all().delete()
+        UserRecord.objects.all().delete()
+        record_orders(Order.objects.all())
+        self.assertEqual(self.get_records(), self.expected)
+        self.assertEqual(self.expected[1][:3], (2, 4, 5))
+
+    def test_rebuild_command_recalculates_records(self):
+        ProductRecord.objects.update(num_purchases=100)
+        UserRecord.objects.filter(user=self.user).delete()
+        call_command('oscar_rebuild_analytics', batch_size=2,
+                     stdout=StringIO())
+        self.assertEqual(self.get_records(), self.expected)
+
+    def test_keeps_the_date_of_the_latest_order(self):
+        # The first order by primary key is the latest one
+        date_placed = self.orders[1].date_placed + datetime.timedelta(days=1)
+        Order.objects.filter(pk=self.orders[0].pk).update(
+            date_placed=date_placed)
+        call_command('oscar_rebuild_analytics', batch_size=1,
+                     stdout=StringIO())
+        self.assertEqual(
+            date_placed, UserRecord.objects.get(
+                user=self.user).date_last_order)
@@ -0,0 +1,22 @@
+from django.test import TestCase
+
+from oscar.apps.analytics.models import ProductRecord
+from oscar.apps.analytics.reports import ProductReportGenerator
+from oscar.test import factories
+
+
+class TestProductReportCSVFormatter(TestCase):
+
+    def test_lists_the_most_purchased_products_first(self):
+        for num_purchases in (3, 7, 1, 7, 5):
+            ProductRecord.objects.create(
+                product=factories.create_product(),
+                num_purchases=num_purchases)
+        generator = ProductReportGenerator(formatter='CSV')
+        generator.formatter.chunk_size = 2
+        response = generator.generate()
+        lines = b''.join(response.streaming_content).decode(
+            'utf-8').splitlines()
+        self.assertEqual(
+            ['7', '7', '5', '3', '1'],
+            [line.split(',')[-1] for line in lines[1:]])
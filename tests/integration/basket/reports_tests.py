@@ -0,0 +1,32 @@
+from django.test import TestCase
+
+from oscar.apps.basket import reports
+from oscar.apps.basket.models import Basket
+from oscar.test import factories
+
+
+class TestOpenBasketReport(TestCase):
+
+    def setUp(self):
+        self.owner = factories.UserFactory(
+            first_name='Paul', last_name='Chuckle')
+        for __ in range(3):
+            basket = factories.create_basket()
+            basket.owner = self.owner
+            basket.save()
+        factories.create_basket(empty=True)
+
+    def test_streams_baskets_with_their_line_counts(self):
+        generator = reports.OpenBasketReportGenerator(formatter='CSV')
+        generator.formatter.chunk_size = 2
+        response = generator.generate()
+        # Two full chunks and an empty one
+        with self.assertNumQueries(3):
+            lines = b''.join(response.streaming_content).decode(
+                'utf-8').splitlines()
+        self.assertEqual(len(lines), 5)
+        rows = [line.split(',') for line in lines[1:]]
+        self.assertEqual(
+            sorted(row[3:6] for row in rows),
+            sorted([[Basket.OPEN, '0', '0']] + [[Basket.OPEN, '1', '1']] * 3))
+        self.assertEqual(rows[1][1], 'Paul Chuckle')
@@ -0,0 +1,143 @@
+import copy
+from decimal import Decimal as D
+
+import mock
+from django.conf import settings
+from django.core.cache import cache
+from django.core.urlresolvers import reverse
+from django.db import connection, transaction
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext, override_settings
+
+import oscar
+from oscar.apps.basket.models import Basket
+from oscar.apps.basket.summary import BasketSummary, get_summary
+from oscar.apps.partner import strategy
+from oscar.test import factories
+from oscar.test.testcases import WebTestCase
+
+
+class TestLoadingBasketLines(TestCase):
+
+    def create_basket(self, num_lines):
+        basket = Basket.objects.create()
+        basket.strategy = strategy.Default()
+        for __ in range(num_lines):
+            basket.add_product(factories.create_product(price=D('10.00')))
+        basket.reset_offer_applications()
+        return basket
+
+    def assert_num_queries(self, basket):
+        # Lines with their products and stockrecords, line attributes,
+        # product images and the stockrecords used by the strategy
+        with self.assertNumQueries(4):
+            basket.total_incl_tax
+            for line in basket.all_lines():
+                line.description
+                line.product.primary_image()
+
+    def test_does_not_query_per_line(self):
+        self.assert_num_queries(self.create_basket(1))
+        self.assert_num_queries(self.create_basket(5))
+
+
+class TestBasketSummary(TestCase):
+
+    def setUp(self):
+        self.basket = Basket.objects.create()
+        self.basket.strategy = strategy.Default()
+        self.product = factories.create_product(
+            title="A book", price=D('12.00'))
+        self.basket.add_product(self.product, 2)
+
+    def test_copies_the_basket_totals_and_lines(self):
+        summary = BasketSummary(self.basket)
+        self.assertEqual(1, summary.num_lines)
+        self.assertEqual(2, summary.num_items)
+        self.assertEqual(self.basket.total_incl_tax, summary.total_incl_tax)
+        line = summary.all_lines()[0]
+        self.assertEqual("A book", line.title)
+        self.assertEqual(self.product.get_absolute_url(), line.url)
+        self.assertEqual(D('12.00'), line.unit_price_excl_tax)
+
+    def test_is_built_each_time_by_default(self):
+        load_basket = mock.Mock(return_value=self.basket)
+        get_summary(self.basket.id, load_basket)
+        get_summary(self.basket.id, load_basket)
+        self.assertEqual(2, load_basket.call_count)
+
+
+@override_settings(OSCAR_BASKET_SUMMARY_CACHE_TIMEOUT=60)
+class TestCachedBasketSummary(TestCase):
+
+    def setUp(self):
+        self.basket = Basket.objects.create()
+        self.basket.strategy = strategy.Default()
+        self.basket.add_product(factories.create_product(price=D('5.00')))
+        self.load_basket = mock.Mock(return_value=self.basket)
+        get_summary(self.basket.id, self.load_basket)
+
+    def assert_rebuilt(self):
+        summary = get_summary(self.basket.id, self.load_basket)
+        self.assertEqual(2, self.load_basket.call_count)
+        return summary
+
+    def test_is_reused_while_the_basket_is_unchanged(self):
+        get_summary(self.basket.id, self.load_basket)
+        self.assertEqual(1, self.load_basket.call_count)
+
+    def test_is_rebuilt_when_a_line_is_added(self):
+        self.basket.add_product(factories.create_product(price=D('5.00')))
+        self.assertEqual(2, self.assert_rebuilt().num_lines)
+
+    def test_is_rebuilt_when_a_line_is_deleted(self):
+        self.basket.all_lines()[0].delete()
+        self.basket.reset_offer_applications()
+        self.assertEqual(0, self.assert_rebuilt().num_lines)
+
+    def test_is_rebuilt_again_once_committed(self):
+        with mock.patch.object(transaction, 'on_commit') as on_commit:
+            self.basket.add_product(factories.create_product(price=D('5.00')))
+        self.assertEqual(2, self.assert_rebuilt().num_lines)
+
+        on_commit.call_args[0][0]()
+        get_summary(self.basket.id, self.load_basket)
+        self.assertEqual(3, self.load_basket.call_count)
+
+    def test_is_rebuilt_when_a_voucher_is_added(self):
+        self.basket.vouchers.add(factories.VoucherFactory())
+        self.assert_rebuilt()
+
+
+def get_oscar_templates():
+    """
+    Return the template settings without the test site's templates, so that
+    pages are rendered with Oscar's own layout
+    """
+    templates = copy.deepcopy(settings.TEMPLATES)
+    templates[0]['DIRS'] = [oscar.OSCAR_MAIN_TEMPLATE_DIR]
+    return templates
+
+
+@override_settings(OSCAR_BASKET_SUMMARY_CACHE_TIMEOUT=60,
+                   TEMPLATES=get_oscar_templates())
+class TestRenderingPagesWithACachedSummary(WebTestCase):
+
+    def setUp(self):
+        super(TestRenderingPagesWithACachedSummary, self).setUp()
+        cache.clear()
+        basket = Basket.objects.create(owner=self.user)
+        basket.strategy = strategy.Default()
+        for __ in range(3):
+            basket.add_product(factories.create_product(price=D('10.00')))
+
+    def test_does_not_load_the_basket_lines(self):
+        url = reverse('offer:list')
+        self.app.get(url, user=self.user)
+        with CaptureQueriesContext(connection) as context:
+            response = self.app.get(url, user=self.user)
+        self.assertContains(response, 'btn-cart')
+        self.assertContains(response, '30.00')
+        line_queries = [query for query in context.captured_queries
+                        if 'basket_line' in query['sql']]
+        self.assertEqual([], line_queries)
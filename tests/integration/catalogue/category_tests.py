@@ -2,8 +2,10 @@
 from unittest import skipIf
 
 from django import VERSION as DJANGO_VERSION
+from django.core.management import call_command
 from django.test import TestCase
 from django.test.utils import override_settings
+from django.utils.six import StringIO
 
 from oscar.apps.catalogue.models import Category
 from oscar.apps.catalogue.categories import create_from_breadcrumbs
@@ -49,6 +51,40 @@ class TestCategory(TestCase):
             self.assertEqual(child_category.slug, u'château-dyquem')
 
 
+class TestStoredFullNamesAndSlugs(TestCase):
+
+    def setUp(self):
+        self.teen = create_from_breadcrumbs('Books > Fiction > Horror > Teen')
+
+    def test_stores_full_name_and_slug(self):
+        teen = Category.objects.get(full_slug='books/fiction/horror/teen')
+        self.assertEqual(teen, self.teen)
+        self.assertEqual(teen.full_name, 'Books > Fiction > Horror > Teen')
+
+    def test_reads_full_name_without_queries(self):
+        teen = Category.objects.get(pk=self.teen.pk)
+        with self.assertNumQueries(0):
+            self.assertEqual(str(teen), 'Books > Fiction > Horror > Teen')
+
+    def test_updates_descendants_when_renamed(self):
+        fiction = Category.objects.get(name='Fiction')
+        fiction.name = 'Novels'
+        fiction.slug = 'novels'
+        fiction.save()
+        teen = Category.objects.get(pk=self.teen.pk)
+        self.assertEqual(teen.full_name, 'Books > Novels > Horror > Teen')
+        self.assertEqual(teen.full_slug, 'books/novels/horror/teen')
+
+    def test_can_be_recalculated_in_bulk(self):
+        Category.objects.update(full_name='', full_slug='')
+        out = StringIO()
+        call_command('oscar_update_category_names', batch_size=2, stdout=out)
+        self.assertIn('Updated 4 categories', out.getvalue())
+        teen = Category.objects.get(pk=self.teen.pk)
+        self.assertEqual(teen.full_name, 'Books > Fiction > Horror > Teen')
+        self.assertEqual(teen.full_slug, 'books/fiction/horror/teen')
+
+
 class TestMovingACategory(TestCase):
 
     def setUp(self):
@@ -0,0 +1,108 @@
+import mock
+from django.core.urlresolvers import reverse
+from django.db import transaction
+from django.test import TestCase
+from django.test.utils import override_settings
+
+from oscar.apps.catalogue import tree
+from oscar.apps.catalogue.categories import create_from_breadcrumbs
+from oscar.apps.catalogue.models import Category
+from oscar.apps.offer.models import Range
+from oscar.templatetags.category_tags import get_annotated_list
+from oscar.test.testcases import WebTestCase
+
+
+@override_settings(OSCAR_CACHE_CATEGORY_TREE=True)
+class TestCategoryTree(TestCase):
+
+    def setUp(self):
+        for trail in ('Books > Fiction > Horror', 'Books > Fiction > Comedy',
+                      'Books > Non-fiction', 'Music > Jazz'):
+            create_from_breadcrumbs(trail)
+
+    def get_annotated_names(self, *args):
+        return [(category.name, info)
+                for category, info in get_annotated_list(*args)]
+
+    def test_matches_the_uncached_annotated_list(self):
+        fiction = Category.objects.get(name='Fiction')
+        for args in ((), (1,), (None, fiction), (1, fiction)):
+            with override_settings(OSCAR_CACHE_CATEGORY_TREE=False):
+                expected = self.get_annotated_names(*args)
+            self.assertEqual(self.get_annotated_names(*args), expected)
+
+    def test_renders_without_queries(self):
+        get_annotated_list()
+        with self.assertNumQueries(0):
+            for category, __ in get_annotated_list():
+                category.full_name
+                category.full_slug
+
+    def test_knows_full_names_and_slugs(self):
+        horror = tree.get_tree().get_category(
+            Category.objects.get(name='Horror').pk)
+        self.assertEqual(horror.full_name, 'Books > Fiction > Horror')
+        self.assertEqual(horror.full_slug, 'books/fiction/horror')
+        self.assertEqual(
+            tree.get_tree().get_category_by_full_slug('books/fiction/horror'),
+            horror)
+
+    def test_returns_descendant_ids(self):
+        fiction, music = Category.objects.filter(
+            name__in=['Fiction', 'Music']).order_by('name')
+        self.assertEqual(
+            tree.get_tree().get_descendant_ids([fiction.pk, music.pk]),
+            set(Category.objects.filter(
+                name__in=['Fiction', 'Horror', 'Comedy', 'Music', 'Jazz']
+            ).values_list('pk', flat=True)))
+
+    def test_is_rebuilt_when_a_category_changes(self):
+        old_tree = tree.get_tree()
+        jazz = Category.objects.get(name='Jazz')
+        jazz.name = 'Blues'
+        jazz.save()
+        self.assertIsNot(tree.get_tree(), old_tree)
+        self.assertEqual(
+            tree.get_tree().get_category(jazz.pk).full_name, 'Music > Blues')
+
+    def test_changes_the_version_once_committed(self):
+        version = tree.get_version()
+        jazz = Category.objects.get(name='Jazz')
+        jazz.name = 'Blues'
+        with mock.patch.object(transaction, 'on_commit') as on_commit:
+            jazz.save()
+        self.assertEqual(version, tree.get_version())
+        self.assertEqual(
+            tree.get_tree().get_category(jazz.pk).full_name, 'Music > Blues')
+
+        on_commit.call_args[0][0]()
+        self.assertNotEqual(version, tree.get_version())
+
+    def test_is_rebuilt_when_a_category_is_moved(self):
+        jazz = Category.objects.get(name='Jazz')
+        tree.get_tree()
+        jazz.move(Category.objects.get(name='Books'), 'last-child')
+        self.assertEqual(
+            tree.get_tree().get_category(jazz.pk).full_name, 'Books > Jazz')
+
+    def test_is_used_for_range_categories(self):
+        fiction = Category.objects.get(name='Fiction')
+        range = Range.objects.create(name='Fiction')
+        range.included_categories.add(fiction)
+        tree.get_tree()
+        with self.assertNumQueries(1):
+            self.assertEqual(len(range._category_ids()), 3)
+
+
+@override_settings(OSCAR_CACHE_CATEGORY_TREE=True)
+class TestCategoryViewWithCategoryTree(WebTestCase):
+
+    def test_looks_up_categories_in_the_tree(self):
+        category = create_from_breadcrumbs('Books > Fiction')
+        response = self.app.get(category.get_absolute_url())
+        self.assertEqual(response.context['category'], category)
+
+    def test_raises_404_for_unknown_categories(self):
+        url = reverse('catalogue:category', kwargs={
+            'category_slug': 'books', 'pk': 1234})
+        self.app.get(url, status=404)
@@ -0,0 +1,93 @@
+import logging
+import os
+import shutil
+import tempfile
+
+from django.test import TestCase
+from django.test.utils import override_settings
+from PIL import Image
+
+from oscar.apps.catalogue.models import ProductImage
+from oscar.apps.catalogue.utils import ParallelImporter
+from oscar.test import factories
+
+logger = logging.getLogger('oscar.catalogue.import')
+
+
+class TestParallelImporter(TestCase):
+
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.image_dir = tempfile.mkdtemp()
+        self.settings = override_settings(MEDIA_ROOT=self.media_root)
+        self.settings.enable()
+        self.products = [factories.create_product(upc='upc%d' % i)
+                         for i in range(3)]
+
+    def tearDown(self):
+        self.settings.disable()
+        shutil.rmtree(self.media_root)
+        shutil.rmtree(self.image_dir)
+
+    def write_image(self, filename, colour='red'):
+        Image.new('RGB', (10, 10), colour).save(
+            os.path.join(self.image_dir, filename))
+
+    def import_images(self, **kwargs):
+        kwargs.setdefault('workers', 2)
+        ParallelImporter(logger, 'upc', **kwargs).handle(self.image_dir)
+
+    def test_imports_images_in_batches(self):
+        for i, product in enumerate(self.products):
+            self.write_image('%s.png' % product.upc, colour=(i, 0, 0))
+        # Per batch, look up the products, their images and the next display
+        # orders, then create the images in a savepoint
+        with self.assertNumQueries(2 * 6):
+            self.import_images(batch_size=2)
+        for product in self.products:
+            self.assertEqual(1, product.images.count())
+
+    def test_skips_invalid_and_unmatched_images(self):
+        self.write_image('upc0.png')
+        self.write_image('unknown.png')
+        with open(os.path.join(self.image_dir, 'upc1.png'), 'w') as f:
+            f.write('not an image')
+        self.import_images()
+        self.assertEqual(
+            ['upc0'], list(ProductImage.objects.values_list(
+                'product__upc', flat=True)))
+
+    def test_skips_identical_images(self):
+        self.write_image('upc0.png')
+        self.import_images()
+        self.write_image('upc0.jpg', colour='blue')
+        self.import_images()
+        self.import_images()
+        product = self.products[0]
+        self.assertEqual(
+            [0, 1], [image.display_order for image in product.images.all()])
+
+    def test_resumes_from_the_state_file(self):
+        state_file = os.path.join(self.media_root, 'state')
+        self.write_image('upc0.png')
+        self.import_images(state_file=state_file)
+        ProductImage.objects.all().delete()
+        self.write_image('upc1.png')
+        self.import_images(state_file=state_file)
+        self.assertEqual(
+            ['upc1'], list(ProductImage.objects.values_list(
+                'product__upc', flat=True)))
+
+    def test_retries_invalid_and_unmatched_images_when_resuming(self):
+        state_file = os.path.join(self.media_root, 'state')
+        self.write_image('upc0.png')
+        self.write_image('upc3.png')
+        with open(os.path.join(self.image_dir, 'upc1.png'), 'w') as f:
+            f.write('not an image')
+        self.import_images(state_file=state_file)
+        self.write_image('upc1.png')
+        factories.create_product(upc='upc3')
+        self.import_images(state_file=state_file)
+        self.assertEqual(
+            ['upc0', 'upc1', 'upc3'], sorted(ProductImage.objects.values_list(
+                'product__upc', flat=True)))
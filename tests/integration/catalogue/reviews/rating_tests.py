@@ -0,0 +1,68 @@
+import datetime
+
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+from django.utils.six import StringIO
+
+from oscar.apps.catalogue.reviews import ratings
+from oscar.apps.catalogue.reviews.models import ProductReview
+from oscar.core.loading import get_model
+from oscar.test.factories import ProductReviewFactory, create_product
+
+Product = get_model('catalogue', 'Product')
+
+
+class TestUpdatingRatings(TestCase):
+
+    def setUp(self):
+        self.product = create_product()
+        for score in (1, 4):
+            ProductReviewFactory(product=self.product, score=score)
+        ProductReviewFactory(
+            product=self.product, score=5, status=ProductReview.REJECTED)
+        self.unreviewed = create_product()
+        # Forget the ratings kept up to date when saving the reviews
+        Product.objects.update(rating=1)
+
+    def get_rating(self, product):
+        return Product.objects.get(pk=product.pk).rating
+
+    def test_calculates_the_average_score_of_approved_reviews(self):
+        self.assertEqual(2, ratings.update_ratings(batch_size=1))
+        self.assertEqual(2.5, self.get_rating(self.product))
+        self.assertEqual(self.product.calculate_rating(),
+                         self.get_rating(self.product))
+        self.assertIsNone(self.get_rating(self.unreviewed))
+
+    def test_only_updates_changed_ratings(self):
+        ratings.update_ratings()
+        self.assertEqual(0, ratings.update_ratings())
+
+    def test_updates_only_the_passed_products(self):
+        ratings.update_ratings([self.product.pk])
+        self.assertEqual(2.5, self.get_rating(self.product))
+        self.assertEqual(1, self.get_rating(self.unreviewed))
+
+    def test_finds_products_whose_reviews_changed(self):
+        other = create_product()
+        ProductReviewFactory(product=other)
+        ProductReview.objects.filter(product=self.product).update(
+            date_updated=timezone.now() - datetime.timedelta(days=1))
+        self.assertEqual(
+            set([other.pk]), ratings.get_changed_product_ids(
+                timezone.now() - datetime.timedelta(hours=1)))
+
+    def test_incremental_command_only_updates_changed_products(self):
+        call_command('oscar_update_product_ratings', incremental=True,
+                     stdout=StringIO())
+        Product.objects.update(rating=1)
+
+        stdout = StringIO()
+        call_command('oscar_update_product_ratings', incremental=True,
+                     stdout=stdout)
+        self.assertIn('Successfully updated 0 products', stdout.getvalue())
+        self.assertEqual(1, self.get_rating(self.product))
+
+        call_command('oscar_update_product_ratings', stdout=StringIO())
+        self.assertEqual(2.5, self.get_rating(self.product))
@@ -0,0 +1,129 @@
+import datetime
+
+from django.core import mail
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from oscar.apps.customer.alerts import utils
+from oscar.apps.customer.models import Notification, ProductAlert
+from oscar.core.loading import get_model
+from oscar.test.factories import (
+    ProductClassFactory, UserFactory, create_product, create_stockrecord)
+
+StockRecord = get_model('partner', 'StockRecord')
+
+
+class TestSendingAlerts(TestCase):
+
+    def setUp(self):
+        self.user = UserFactory()
+
+    def create_alert(self, num_in_stock=10, product=None, user=None):
+        if product is None:
+            product = create_product(price=10, num_in_stock=num_in_stock)
+        return ProductAlert.objects.create(
+            user=user or self.user, product=product)
+
+    def test_sends_alerts_for_products_back_in_stock(self):
+        alert = self.create_alert()
+
+        self.assertEqual(1, utils.send_alerts())
+
+        self.assertEqual(1, len(mail.outbox))
+        self.assertEqual([self.user.email], mail.outbox[0].to)
+        self.assertEqual(1, Notification.objects.filter(
+            recipient=self.user).count())
+        alert = ProductAlert.objects.get(pk=alert.pk)
+        self.assertEqual(ProductAlert.CLOSED, alert.status)
+        self.assertIsNotNone(alert.date_closed)
+
+    def test_does_not_send_alerts_for_products_out_of_stock(self):
+        alert = self.create_alert(num_in_stock=0)
+
+        self.assertEqual(0, utils.send_alerts())
+
+        self.assertEqual(0, len(mail.outbox))
+        self.assertTrue(ProductAlert.objects.get(pk=alert.pk).is_active)
+
+    def test_only_checks_products_whose_stock_changed_since(self):
+        old_alert = self.create_alert()
+        StockRecord.objects.filter(product=old_alert.product).update(
+            date_updated=timezone.now() - datetime.timedelta(days=1))
+        new_alert = self.create_alert()
+
+        utils.send_alerts(
+            since=timezone.now() - datetime.timedelta(hours=1))
+
+        self.assertTrue(ProductAlert.objects.get(pk=old_alert.pk).is_active)
+        self.assertFalse(ProductAlert.objects.get(pk=new_alert.pk).is_active)
+
+    def test_splits_products_across_shards(self):
+        alerts = [self.create_alert() for i in range(4)]
+
+        num_emails = [utils.send_alerts(shard=shard, num_shards=2)
+                      for shard in range(2)]
+
+        self.assertEqual([2, 2], num_emails)
+        self.assertFalse(ProductAlert.objects.filter(
+            pk__in=[alert.pk for alert in alerts],
+            status=ProductAlert.ACTIVE).exists())
+
+    def test_sends_an_alert_on_a_parent_product_once(self):
+        product_class = ProductClassFactory()
+        parent = create_product(
+            product_class=product_class.name, structure='parent')
+        for i in range(2):
+            child = create_product(
+                product_class=product_class.name, structure='child',
+                parent=parent)
+            create_stockrecord(child, price_excl_tax=10, num_in_stock=5)
+        self.create_alert(product=parent)
+
+        self.assertEqual(1, utils.send_alerts())
+        self.assertEqual(1, len(mail.outbox))
+
+    def test_checks_the_children_of_a_parent_in_the_same_shard(self):
+        product_class = ProductClassFactory()
+        parent = create_product(
+            product_class=product_class.name, structure='parent')
+        children = []
+        for i in range(2):
+            child = create_product(
+                product_class=product_class.name, structure='child',
+                parent=parent)
+            create_stockrecord(child, price_excl_tax=10, num_in_stock=5)
+            children.append(child.id)
+        self.create_alert(product=parent)
+
+        shards = [utils.get_product_ids_with_alerts(
+            shard=shard, num_shards=2) for shard in range(2)]
+        self.assertIn(sorted(children), shards)
+        self.assertIn([], shards)
+        num_emails = [utils.send_alerts(shard=shard, num_shards=2)
+                      for shard in range(2)]
+        self.assertEqual(1, sum(num_emails))
+
+    def test_number_of_queries_does_not_depend_on_number_of_alerts(self):
+        num_queries = []
+        for num_alerts in (2, 8):
+            for i in range(num_alerts):
+                self.create_alert(user=self.user)
+            with CaptureQueriesContext(connection) as context:
+                self.assertEqual(num_alerts, utils.send_alerts())
+            num_queries.append(len(context))
+        self.assertEqual(num_queries[0], num_queries[1])
+
+    def test_incremental_command_only_checks_changed_products(self):
+        call_command('oscar_send_alerts', incremental=True)
+        alert = self.create_alert()
+        StockRecord.objects.filter(product=alert.product).update(
+            date_updated=timezone.now() - datetime.timedelta(days=1))
+
+        call_command('oscar_send_alerts', incremental=True)
+        self.assertTrue(ProductAlert.objects.get(pk=alert.pk).is_active)
+
+        call_command('oscar_send_alerts')
+        self.assertFalse(ProductAlert.objects.get(pk=alert.pk).is_active)
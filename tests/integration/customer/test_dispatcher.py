@@ -1,9 +1,15 @@
 from django.test import TestCase
+from django.test.utils import override_settings
 from django.core import mail
+from django.core.management import call_command
+from django.utils.six import StringIO
 
 from oscar.core.compat import get_user_model
+from oscar.apps.customer import outbox
 from oscar.apps.customer.utils import Dispatcher
-from oscar.apps.customer.models import CommunicationEventType
+from oscar.apps.customer.models import (
+    CommunicationEventType, Email, OutboxEmail)
+from oscar.apps.order.models import CommunicationEvent
 from oscar.test.factories import create_order
 
 
@@ -39,3 +45,84 @@ class TestDispatcher(TestCase):
         message = mail.outbox[0]
         self.assertIn(order_number, message.body)
 
+
+@override_settings(OSCAR_EMAIL_OUTBOX=True)
+class TestDispatcherWithOutbox(TestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            'testuser', 'testuser@example.com', 'somesimplepassword')
+        self.event_type = CommunicationEventType.objects.create(
+            code="ORDER_PLACED", name="Order Placed",
+            category="Order related")
+
+    def get_messages(self, order):
+        return self.event_type.get_messages({
+            'order': order, 'lines': order.lines.all()})
+
+    def test_queues_order_messages_without_sending_them(self):
+        order = create_order(user=self.user)
+        Dispatcher().dispatch_order_messages(
+            order, self.get_messages(order), self.event_type)
+
+        self.assertEqual(0, len(mail.outbox))
+        self.assertFalse(Email.objects.exists())
+        self.assertFalse(CommunicationEvent.objects.exists())
+        queued = OutboxEmail.objects.get()
+        self.assertEqual('testuser@example.com', queued.recipient)
+        self.assertEqual(order, queued.order)
+        self.assertEqual(self.user, queued.user)
+
+    def test_sends_queued_emails_and_records_them(self):
+        orders = [create_order(user=self.user) for i in range(3)]
+        for order in orders:
+            Dispatcher().dispatch_order_messages(
+                order, self.get_messages(order), self.event_type)
+
+        self.assertEqual(3, outbox.send_queued_emails(batch_size=2))
+
+        self.assertEqual(3, len(mail.outbox))
+        self.assertIn(str(orders[0].number), mail.outbox[0].body)
+        self.assertEqual(3, Email.objects.filter(user=self.user).count())
+        self.assertEqual(
+            set(orders),
+            set(event.order for event in CommunicationEvent.objects.all()))
+        self.assertFalse(OutboxEmail.objects.exists())
+
+    def test_queues_emails_to_anonymous_customers(self):
+        order = create_order(guest_email='guest@example.com')
+        Dispatcher().dispatch_order_messages(
+            order, self.get_messages(order), self.event_type)
+
+        queued = OutboxEmail.objects.get()
+        self.assertEqual('guest@example.com', queued.recipient)
+        self.assertIsNone(queued.user)
+
+        outbox.send_queued_emails()
+        self.assertEqual(['guest@example.com'], mail.outbox[0].to)
+        self.assertFalse(Email.objects.exists())
+        self.assertEqual(order, CommunicationEvent.objects.get().order)
+
+    def test_keeps_queued_emails_if_sending_fails(self):
+        order = create_order(user=self.user)
+        Dispatcher().dispatch_order_messages(
+            order, self.get_messages(order), self.event_type)
+
+        class FailingConnection(mail.get_connection().__class__):
+            def send_messages(self, messages):
+                raise IOError("Connection refused")
+
+        with self.assertRaises(IOError):
+            outbox.send_queued_emails(connection=FailingConnection())
+        self.assertTrue(OutboxEmail.objects.exists())
+        self.assertFalse(Email.objects.exists())
+
+    def test_management_command_sends_queued_emails(self):
+        Dispatcher().dispatch_user_messages(self.user, {
+            'subject': 'Subject', 'body': 'Body', 'html': '', 'sms': None})
+        stdout = StringIO()
+        call_command('oscar_send_emails', stdout=stdout)
+
+        self.assertEqual('Subject', mail.outbox[0].subject)
+        self.assertEqual('Subject', Email.objects.get(user=self.user).subject)
+        self.assertIn('Sent 1 emails', stdout.getvalue())
@@ -0,0 +1,96 @@
+from decimal import Decimal as D
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase
+from django.test.utils import override_settings
+from django.utils.six import StringIO
+
+from oscar.apps.dashboard import statistics
+from oscar.apps.dashboard.views import IndexView
+from oscar.apps.partner.models import StockAlert
+from oscar.core import prices
+from oscar.test import factories
+
+
+def create_order(total):
+    return factories.create_order(
+        total=prices.Price('GBP', excl_tax=D(total), tax=D('0.00')))
+
+
+class TestDashboardStatistics(TestCase):
+
+    def setUp(self):
+        create_order('10.00')
+        create_order('20.00')
+        product = factories.create_product(price=D('5.00'))
+        StockAlert.objects.create(
+            stockrecord=product.stockrecords.get(), threshold=1)
+
+    def test_are_computed(self):
+        stats = IndexView().compute_stats()
+        self.assertEqual(stats['total_orders'], 2)
+        self.assertEqual(stats['total_orders_last_day'], 2)
+        self.assertEqual(stats['total_lines'], 2)
+        self.assertEqual(stats['total_revenue'], D('30.00'))
+        self.assertEqual(stats['total_revenue_last_day'], D('30.00'))
+        self.assertEqual(stats['average_order_costs'], D('15.00'))
+        self.assertEqual(stats['total_open_stock_alerts'], 1)
+        self.assertEqual(stats['total_closed_stock_alerts'], 0)
+        hourly_totals = [item['total_incl_tax'] for item
+                         in stats['hourly_report_dict']['order_total_hourly']]
+        self.assertEqual(hourly_totals[-1], D('30.00'))
+        self.assertEqual(sum(hourly_totals), D('30.00'))
+
+    def test_hourly_report_takes_one_query(self):
+        with self.assertNumQueries(1):
+            IndexView().get_hourly_report()
+
+
+@override_settings(OSCAR_DASHBOARD_STATS_TIMEOUT=60)
+class TestDashboardStatisticsSnapshot(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        create_order('10.00')
+        call_command('oscar_update_dashboard_stats', stdout=StringIO())
+
+    def get_stats(self):
+        return IndexView().get_stats()
+
+    def test_is_read_without_queries(self):
+        with self.assertNumQueries(0):
+            stats = self.get_stats()
+        self.assertEqual(stats['total_orders'], 1)
+        self.assertEqual(stats['total_revenue'], D('10.00'))
+
+    def test_counts_new_orders(self):
+        create_order('20.00')
+        stats = self.get_stats()
+        self.assertEqual(stats['total_orders'], 2)
+        self.assertEqual(stats['total_orders_last_day'], 2)
+        self.assertEqual(stats['total_lines'], 2)
+        self.assertEqual(stats['total_revenue'], D('30.00'))
+        self.assertEqual(stats['average_order_costs'], D('15.00'))
+
+    def test_counts_new_customers_and_baskets(self):
+        stats = self.get_stats()
+        factories.UserFactory()
+        factories.BasketFactory()
+        new_stats = self.get_stats()
+        for key in ('total_customers', 'total_customers_last_day',
+                    'total_open_baskets', 'total_open_baskets_last_day'):
+            self.assertEqual(new_stats[key], stats[key] + 1)
+
+    def test_matches_the_computed_statistics(self):
+        create_order('20.00')
+        factories.UserFactory()
+        stats = self.get_stats()
+        computed_stats = IndexView().compute_stats()
+        for key in statistics.COUNTERS:
+            self.assertEqual(stats[key], computed_stats[key])
+
+    def test_is_taken_when_missing(self):
+        statistics.invalidate()
+        create_order('20.00')
+        self.assertEqual(self.get_stats()['total_orders'], 2)
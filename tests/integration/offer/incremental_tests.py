@@ -0,0 +1,103 @@
+from decimal import Decimal as D
+
+import mock
+from django.test import TestCase
+from django.test.utils import override_settings
+
+from oscar.apps.offer.applicator import Applicator
+from oscar.test import factories
+
+
+@override_settings(OSCAR_INCREMENTAL_OFFER_APPLICATION=True)
+class TestIncrementalOfferApplication(TestCase):
+
+    def setUp(self):
+        self.applicator = Applicator()
+        self.basket = factories.create_basket(empty=True)
+        self.book = factories.create_product(price=D('10.00'))
+        self.shirt = factories.create_product(price=D('20.00'))
+        self.book_range = factories.RangeFactory()
+        self.book_range.add_product(self.book)
+        self.shirt_range = factories.RangeFactory()
+        self.shirt_range.add_product(self.shirt)
+        self.book_offer = factories.create_offer(
+            name="Books", range=self.book_range)
+        self.shirt_offer = factories.create_offer(
+            name="Shirts", range=self.shirt_range)
+        self.offers = [self.book_offer, self.shirt_offer]
+
+        self.basket.add_product(self.book)
+        self.basket.add_product(self.shirt)
+        self.apply()
+
+    def apply(self):
+        with mock.patch.object(
+                self.applicator, 'get_offers', return_value=self.offers):
+            self.applicator.apply(self.basket)
+
+    def get_discounts(self):
+        return dict((application['offer'].id, application['discount'])
+                    for application in self.basket.offer_applications)
+
+    def assert_matches_full_application(self):
+        discounts = self.get_discounts()
+        total = self.basket.total_incl_tax
+        self.basket.reset_offer_applications()
+        self.apply()
+        self.assertEqual(self.get_discounts(), discounts)
+        self.assertEqual(self.basket.total_incl_tax, total)
+
+    def test_only_reapplies_offers_affected_by_the_change(self):
+        self.basket.add_product(self.book)
+        with mock.patch.object(
+                self.applicator, 'apply_offer',
+                wraps=self.applicator.apply_offer) as apply_offer:
+            self.apply()
+        applied = [args[1] for args, __ in apply_offer.call_args_list]
+        self.assertEqual([self.book_offer], applied)
+        self.assertEqual(
+            {self.book_offer.id: D('4.00'), self.shirt_offer.id: D('4.00')},
+            self.get_discounts())
+        self.assert_matches_full_application()
+
+    def test_matches_full_application_when_lines_are_added(self):
+        other = factories.create_product(price=D('5.00'))
+        self.book_range.add_product(other)
+        self.basket.add_product(other, 2)
+        self.apply()
+        self.assert_matches_full_application()
+
+    def test_reapplies_all_offers_when_the_offers_change(self):
+        self.offers = [self.book_offer]
+        self.basket.add_product(self.shirt)
+        with mock.patch.object(
+                self.applicator, 'apply_offers',
+                wraps=self.applicator.apply_offers) as apply_offers:
+            self.apply()
+        self.assertTrue(apply_offers.called)
+        self.assertEqual(
+            [self.book_offer], list(self.basket.applied_offers().values()))
+
+    def test_reapplies_all_offers_for_custom_conditions(self):
+        condition = factories.ConditionFactory(
+            range=self.book_range, type='', value=1,
+            proxy_class='oscar.apps.offer.conditions.CountCondition')
+        self.offers.append(factories.create_offer(
+            name="Custom", range=self.book_range, condition=condition))
+        self.basket.reset_offer_applications()
+        self.apply()
+        self.basket.add_product(self.book)
+        with mock.patch.object(
+                self.applicator, 'apply_offers',
+                wraps=self.applicator.apply_offers) as apply_offers:
+            self.apply()
+        self.assertTrue(apply_offers.called)
+
+    @override_settings(OSCAR_INCREMENTAL_OFFER_APPLICATION=False)
+    def test_reapplies_all_offers_when_disabled(self):
+        self.basket.add_product(self.book)
+        with mock.patch.object(
+                self.applicator, 'reapply_offers') as reapply_offers:
+            self.apply()
+        self.assertFalse(reapply_offers.called)
+        self.assertFalse(self.basket.has_offer_changes)
@@ -0,0 +1,112 @@
+from decimal import Decimal as D
+
+from django.test import TestCase
+
+from oscar.apps.catalogue.models import Category, ProductCategory
+from oscar.apps.offer import custom
+from oscar.apps.offer.applicator import Applicator
+from oscar.apps.offer.membership import RangeMembershipIndex
+from oscar.test import factories
+from oscar.test.basket import add_product
+
+
+class StartsWithARange(object):
+    name = "Products starting with A"
+
+    def contains_product(self, product):
+        return product.title.startswith("A")
+
+
+class TestRangeMembershipIndex(TestCase):
+
+    def setUp(self):
+        self.index = RangeMembershipIndex()
+        self.range = factories.RangeFactory()
+        self.product = factories.create_product()
+
+    def get_range_ids(self, product, ranges=None):
+        return self.index.ranges_for_products(
+            [product.id], ranges or [self.range])[product.id]
+
+    def test_includes_included_products_and_their_children(self):
+        parent = factories.create_product(structure='parent')
+        child = factories.create_product(structure='child', parent=parent)
+        self.range.add_product(parent)
+        self.assertEqual({self.range.id}, self.get_range_ids(parent))
+        self.assertEqual({self.range.id}, self.get_range_ids(child))
+        self.assertEqual(set(), self.get_range_ids(self.product))
+
+    def test_honours_exclusions(self):
+        self.range.includes_all_products = True
+        self.range.save()
+        self.range.excluded_products.add(self.product)
+        self.assertEqual(set(), self.get_range_ids(self.product))
+
+    def test_includes_products_of_included_classes(self):
+        self.range.classes.add(self.product.get_product_class())
+        self.assertEqual({self.range.id}, self.get_range_ids(self.product))
+
+    def test_includes_products_within_included_category_subtrees(self):
+        parent = Category.add_root(name="Books")
+        child = parent.add_child(name="Fiction")
+        ProductCategory.objects.create(product=self.product, category=child)
+        self.range.included_categories.add(parent)
+        self.assertEqual({self.range.id}, self.get_range_ids(self.product))
+
+    def test_evaluates_ranges_with_proxy_classes(self):
+        proxy_range = custom.create_range(StartsWithARange)
+        product = factories.create_product(title="A tale")
+        self.assertEqual(
+            {proxy_range.id}, self.get_range_ids(product, [proxy_range]))
+
+    def test_agrees_with_contains_product(self):
+        parent = Category.add_root(name="Books")
+        child = parent.add_child(name="Fiction")
+        products = [factories.create_product() for __ in range(3)]
+        ProductCategory.objects.create(product=products[0], category=child)
+        self.range.add_product(products[1])
+        other_range = factories.RangeFactory(includes_all_products=True)
+        other_range.excluded_products.add(products[2])
+        self.range.included_categories.add(parent)
+        ranges = [self.range, other_range]
+
+        memberships = self.index.ranges_for_products(
+            [p.id for p in products], ranges)
+        for product in products:
+            expected = {r.id for r in ranges if r.contains_product(product)}
+            self.assertEqual(expected, memberships[product.id])
+
+    def test_uses_a_bounded_number_of_queries(self):
+        products = [factories.create_product() for __ in range(10)]
+        self.range.classes.add(products[0].get_product_class())
+        ranges = [self.range, factories.RangeFactory()]
+        product_ids = [p.id for p in products]
+        # Exclusions, inclusions, classes, categories and product data
+        with self.assertNumQueries(5):
+            self.index.ranges_for_products(product_ids, ranges)
+        # Membership data is cached after the first lookup
+        with self.assertNumQueries(1):
+            self.index.ranges_for_products(product_ids, ranges)
+
+    def test_can_be_invalidated_per_range(self):
+        self.get_range_ids(self.product)
+        self.range.add_product(self.product)
+        self.assertEqual(set(), self.get_range_ids(self.product))
+        self.index.invalidate([self.range.id])
+        self.assertEqual({self.range.id}, self.get_range_ids(self.product))
+
+
+class TestApplicatorRangeMemberships(TestCase):
+
+    def test_annotates_basket_products(self):
+        rng = factories.RangeFactory(includes_all_products=True)
+        offer = factories.create_offer(range=rng)
+        basket = factories.create_basket(empty=True)
+        add_product(basket, D('10.00'))
+
+        Applicator().apply_offers(basket, [offer])
+
+        product = basket.all_lines()[0].product
+        self.assertEqual({rng.id: True}, product._range_memberships)
+        with self.assertNumQueries(0):
+            self.assertTrue(rng.contains_product(product))
@@ -1,8 +1,12 @@
+import os
+import shutil
+import tempfile
+
 from django.test import TestCase
 
 from oscar.apps.offer import models
 from oscar.apps.catalogue import models as catalogue_models
-from oscar.test.factories import create_product
+from oscar.test.factories import UserFactory, create_product
 
 
 class TestWholeSiteRange(TestCase):
@@ -216,3 +220,84 @@ class TestRangeModel(TestCase):
         first_range.name = "Bar"
         first_range.save()
         models.Range.objects.create(name="Foo")
+
+
+class TestRangeProductFileUpload(TestCase):
+
+    def setUp(self):
+        self.range = models.Range.objects.create(name="Range")
+        self.user = UserFactory()
+        self.directory = tempfile.mkdtemp()
+        self.products = [
+            create_product(upc='upc%d' % i, partner_sku='sku%d' % i)
+            for i in range(5)]
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def process(self, ids, **kwargs):
+        filepath = os.path.join(self.directory, 'skus.txt')
+        with open(filepath, 'w') as f:
+            f.write('\n'.join(ids))
+        upload = models.RangeProductFileUpload.objects.create(
+            range=self.range, uploaded_by=self.user, filepath=filepath,
+            size=0)
+        upload.process(**kwargs)
+        return upload
+
+    def test_adds_products_by_sku_or_upc(self):
+        upload = self.process(['sku0', 'upc1', 'sku2,upc3', 'unknown'])
+        self.assertEqual(
+            set(self.products[:4]), set(self.range.all_products()))
+        self.assertEqual(4, upload.num_new_skus)
+        self.assertEqual(1, upload.num_unknown_skus)
+        self.assertEqual(0, upload.num_duplicate_skus)
+        self.assertTrue(upload.was_processing_successful())
+
+    def test_counts_products_in_the_range_as_duplicates(self):
+        self.range.add_product(self.products[0])
+        product = create_product(
+            upc='upc-other', partner_sku='sku-other', product_class='Other')
+        self.range.classes.add(product.get_product_class())
+        # A product listed under both its UPC and its SKU is only added once,
+        # and counted as a duplicate afterwards
+        upload = self.process(['sku0', 'upc-other', 'upc2', 'sku2', 'upc2'])
+        self.assertEqual(1, upload.num_new_skus)
+        self.assertEqual(3, upload.num_duplicate_skus)
+        self.assertEqual(
+            1, models.RangeProduct.objects.filter(
+                range=self.range, product=self.products[2]).count())
+
+    def test_counts_duplicates_regardless_of_the_chunk_size(self):
+        ids = ['sku0', 'upc1', 'upc0', 'sku1', 'unknown']
+        for chunk_size in range(1, len(ids) + 1):
+            models.RangeProduct.objects.all().delete()
+            upload = self.process(ids, chunk_size=chunk_size)
+            self.assertEqual(
+                (2, 1, 2), (upload.num_new_skus, upload.num_unknown_skus,
+                            upload.num_duplicate_skus))
+
+    def test_takes_a_constant_number_of_queries_per_chunk(self):
+        ids = ['sku%d' % i for i in range(5)]
+        # Besides creating and updating the upload, loading the range's
+        # membership data takes 4 queries. Each chunk then looks up products,
+        # stock records and their memberships, and adds the new ones.
+        with self.assertNumQueries(2 + 4 + 3 * 7):
+            self.process(ids, chunk_size=2)
+        self.assertEqual(5, self.range.all_products().count())
+
+
+class TestAddProducts(TestCase):
+
+    def setUp(self):
+        self.range = models.Range.objects.create(name="Range")
+        self.products = [create_product() for i in range(3)]
+
+    def test_adds_new_products_only(self):
+        self.range.add_product(self.products[0], display_order=3)
+        ids = [product.id for product in self.products]
+        self.assertEqual(2, self.range.add_products(ids))
+        self.assertEqual(0, self.range.add_products(ids))
+        self.assertEqual(3, self.range.all_products().count())
+        self.assertEqual(3, models.RangeProduct.objects.get(
+            range=self.range, product=self.products[0]).display_order)
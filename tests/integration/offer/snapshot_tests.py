@@ -0,0 +1,99 @@
+import datetime
+from decimal import Decimal as D
+
+import mock
+
+from django.db import transaction
+from django.test import TestCase
+from django.test.utils import override_settings
+from django.utils import timezone
+
+from oscar.apps.offer import models, snapshot
+from oscar.apps.offer.applicator import Applicator
+from oscar.test import factories
+from oscar.test.basket import add_product
+
+
+@override_settings(OSCAR_CACHE_SITE_OFFERS=True)
+class TestSiteOfferSnapshot(TestCase):
+
+    def setUp(self):
+        self.range = factories.RangeFactory(includes_all_products=True)
+        self.offer = factories.create_offer(range=self.range)
+        self.applicator = Applicator()
+
+    def test_returns_open_site_offers(self):
+        self.assertEqual([self.offer], self.applicator.get_site_offers())
+
+    def test_does_not_query_the_database_once_built(self):
+        self.applicator.get_site_offers()
+        with self.assertNumQueries(0):
+            offer = self.applicator.get_site_offers()[0]
+            offer.condition.proxy().range
+            offer.benefit.proxy().range
+
+    def test_is_invalidated_when_an_offer_is_saved(self):
+        self.applicator.get_site_offers()
+        self.offer.suspend()
+        self.assertEqual([], self.applicator.get_site_offers())
+
+    def test_is_invalidated_when_a_range_changes(self):
+        product = factories.create_product()
+        offers = self.applicator.get_site_offers()
+        self.assertTrue(offers[0].condition.range.contains(product))
+
+        self.range.excluded_products.add(product)
+        offers = self.applicator.get_site_offers()
+        self.assertFalse(offers[0].condition.range.contains(product))
+
+    def test_changes_the_version_once_committed(self):
+        version = snapshot.get_version()
+        with mock.patch.object(transaction, 'on_commit') as on_commit:
+            self.offer.suspend()
+        self.assertEqual(version, snapshot.get_version())
+        self.assertEqual([], self.applicator.get_site_offers())
+
+        on_commit.call_args[0][0]()
+        self.assertNotEqual(version, snapshot.get_version())
+
+    def test_filters_offers_by_date(self):
+        start = timezone.now() + datetime.timedelta(days=1)
+        factories.create_offer(
+            name="Future offer", range=self.range, start=start)
+        self.assertEqual([self.offer], self.applicator.get_site_offers())
+
+    def test_excludes_offers_with_only_an_end_date(self):
+        self.offer.start_datetime = None
+        self.offer.save()
+        self.assertEqual([], self.applicator.get_site_offers())
+
+    def test_returns_copies_of_the_offers(self):
+        first = self.applicator.get_site_offers()[0]
+        second = self.applicator.get_site_offers()[0]
+        self.assertIsNot(first, second)
+
+    def test_applies_offers_to_basket(self):
+        basket = factories.create_basket(empty=True)
+        add_product(basket, D('10.00'))
+        self.applicator.apply(basket)
+        self.assertEqual(1, len(basket.offer_applications))
+
+
+class TestSiteOfferSnapshotIsOptIn(TestCase):
+
+    def test_loads_offers_from_the_database_by_default(self):
+        factories.create_offer()
+        applicator = Applicator()
+        applicator.get_site_offers()
+        with self.assertNumQueries(1):
+            list(applicator.get_site_offers())
+
+
+class TestProxyRange(TestCase):
+
+    def test_proxies_keep_the_fetched_range(self):
+        offer = factories.create_offer()
+        condition = models.Condition.objects.select_related('range').get(
+            pk=offer.condition.pk)
+        with self.assertNumQueries(0):
+            condition.proxy().range
@@ -1,7 +1,8 @@
 from decimal import Decimal as D
 
+from django.db import connection
 from django.test import TestCase
-from django.test.utils import override_settings
+from django.test.utils import CaptureQueriesContext, override_settings
 
 from oscar.apps.catalogue.models import ProductClass, Product
 from oscar.apps.checkout import calculators
@@ -111,6 +112,91 @@ class TestSuccessfulOrderCreation(TestCase):
             self.assertTrue(partner_name == line.partner_name == partner.name)
 
 
+@override_settings(OSCAR_BULK_CREATE_ORDER_LINES=True)
+class TestBulkOrderCreation(TestCase):
+
+    def setUp(self):
+        self.creator = OrderCreator()
+        self.option = factories.OptionFactory()
+
+    def create_basket(self, num_lines):
+        basket = factories.create_basket(empty=True)
+        for i in range(num_lines):
+            basket.add_product(
+                factories.create_product(price=D('10.00')), quantity=2,
+                options=[{'option': self.option, 'value': 'value %d' % i}])
+        return basket
+
+    def test_creates_lines_with_prices_and_attributes(self):
+        basket = self.create_basket(3)
+        with override_settings(OSCAR_INITIAL_LINE_STATUS='A'):
+            order = place_order(self.creator, basket=basket)
+
+        lines = order.lines.order_by('pk')
+        self.assertEqual(3, len(lines))
+        for line, basket_line in zip(lines, basket.all_lines()):
+            self.assertEqual(basket_line.product, line.product)
+            self.assertEqual('A', line.status)
+            self.assertEqual(2, line.quantity)
+            self.assertEqual(D('20.00'), line.line_price_excl_tax)
+            price = line.prices.get()
+            self.assertEqual(order, price.order)
+            self.assertEqual(2, price.quantity)
+            attribute = line.attributes.get()
+            self.assertEqual(
+                basket_line.attributes.get().value, attribute.value)
+            self.assertEqual('example', attribute.type)
+
+    def test_records_offer_name_and_voucher_code_of_discounts(self):
+        basket = self.create_basket(1)
+        voucher = factories.VoucherFactory()
+        offer = factories.create_offer(name="Ten off", offer_type="Voucher")
+        voucher.offers.add(offer)
+        basket.vouchers.add(voucher)
+        user = factories.UserFactory()
+        Applicator().apply(basket, user)
+
+        order = place_order(self.creator, basket=basket, user=user)
+
+        discount = order.discounts.get()
+        self.assertEqual("Ten off", discount.offer_name)
+        self.assertEqual(voucher.code, discount.voucher_code)
+
+    def test_calls_an_overridden_update_stock_records_for_each_line(self):
+        class CustomOrderCreator(OrderCreator):
+            def update_stock_records(self, line):
+                allocated.append(line.product)
+
+        allocated = []
+        basket = self.create_basket(2)
+        place_order(CustomOrderCreator(), basket=basket)
+        self.assertEqual(
+            [line.product for line in basket.all_lines()], allocated)
+
+    def test_number_of_queries_does_not_depend_on_number_of_lines(self):
+        baskets = [self.create_basket(1), self.create_basket(5)]
+        num_queries = []
+        for basket in baskets:
+            with CaptureQueriesContext(connection) as context:
+                place_order(self.creator, basket=basket)
+            num_queries.append(len(context))
+        self.assertEqual(num_queries[0], num_queries[1])
+
+    def test_calls_additional_line_models_hook_for_each_line(self):
+        basket = self.create_basket(2)
+        line_ids = []
+
+        class Creator(OrderCreator):
+            def create_additional_line_models(self, order, order_line,
+                                              basket_line):
+                line_ids.append(order_line.pk)
+
+        order = place_order(Creator(), basket=basket)
+        self.assertEqual(
+            list(order.lines.order_by('pk').values_list('pk', flat=True)),
+            line_ids)
+
+
 class TestPlacingOrderForDigitalGoods(TestCase):
 
     def setUp(self):
@@ -186,6 +272,23 @@ class TestShippingOfferForOrder(TestCase):
         self.assertEqual(D('0.00'), order.shipping_incl_tax)
         self.assertEqual(D('12.00'), order.total_incl_tax)
 
+    @override_settings(OSCAR_BULK_CREATE_ORDER_LINES=True)
+    def test_shipping_discount_is_created_in_bulk_mode(self):
+        add_product(self.basket, D('12.00'))
+        offer = self.apply_20percent_shipping_offer()
+
+        shipping = FixedPrice(D('5.00'), D('5.00'))
+        shipping = Repository().apply_shipping_offer(
+            self.basket, shipping, offer)
+
+        order = place_order(self.creator, basket=self.basket,
+                            shipping_method=shipping)
+
+        discount = order.shipping_discounts[0]
+        self.assertEqual(offer.id, discount.offer_id)
+        self.assertEqual(offer.name, discount.offer_name)
+        self.assertEqual(D('1.00'), discount.amount)
+
 
 class TestMultiSiteOrderCreation(TestCase):
 
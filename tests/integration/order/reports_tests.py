@@ -4,6 +4,8 @@ from django.test import TestCase
 from django.utils.timezone import now
 
 from oscar.apps.order import reports
+from oscar.apps.order.models import Order
+from oscar.test import factories
 
 
 class TestOrderReportGenerator(TestCase):
@@ -18,3 +20,45 @@ class TestOrderReportGenerator(TestCase):
         generator = reports.OrderReportGenerator(
             start_date=start_date, end_date=end_date, formatter='CSV')
         generator.generate()
+
+
+class TestOrderReportCSVFormatter(TestCase):
+
+    def setUp(self):
+        user = factories.UserFactory(first_name='Barry', last_name='Chuckle')
+        self.orders = [factories.create_order(user=user) for __ in range(4)]
+        self.orders.append(factories.create_order())
+
+    def generate_csv(self, chunk_size):
+        generator = reports.OrderReportGenerator(formatter='CSV')
+        generator.formatter.chunk_size = chunk_size
+        response = generator.generate()
+        return b''.join(response.streaming_content).decode('utf-8')
+
+    def test_streams_all_orders(self):
+        lines = self.generate_csv(chunk_size=2).splitlines()
+        self.assertEqual(len(lines), 6)
+        self.assertTrue(lines[0].startswith('Order number'))
+        self.assertIn('Barry Chuckle', lines[2])
+        self.assertEqual(
+            [line.split(',')[0] for line in lines[1:]],
+            [str(order.number) for order in reversed(self.orders)])
+
+    def test_loads_orders_in_chunks_with_their_users(self):
+        with self.assertNumQueries(3):
+            self.generate_csv(chunk_size=2)
+
+    def test_keeps_the_date_placed_ordering(self):
+        # Orders with an explicit date, e.g. imported ones, aren't placed in
+        # the order of their primary keys
+        order = self.orders[1]
+        Order.objects.filter(pk=order.pk).update(
+            date_placed=now() + datetime.timedelta(days=1))
+        expected = list(Order.objects.order_by(
+            '-date_placed', '-pk').values_list('number', flat=True))
+        self.assertEqual(str(order.number), expected[0])
+
+        for chunk_size in (1, 2, 10):
+            lines = self.generate_csv(chunk_size=chunk_size).splitlines()
+            self.assertEqual(
+                expected, [line.split(',')[0] for line in lines[1:]])
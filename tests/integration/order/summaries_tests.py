@@ -0,0 +1,118 @@
+import datetime
+from decimal import Decimal as D
+
+from django.core.management import call_command
+from django.test import TestCase
+from django.test.utils import override_settings
+from django.utils import timezone
+from django.utils.six import StringIO
+
+from oscar.apps.offer.reports import OfferReportGenerator
+from oscar.apps.order.models import OrderDiscount, OrderDiscountSummary
+from oscar.apps.order.summaries import get_discount_totals
+from oscar.apps.voucher.reports import VoucherReportGenerator
+from oscar.test import factories
+
+
+class DiscountsMixin(object):
+
+    def setUp(self):
+        self.today = timezone.localtime(timezone.now()).date()
+        self.offers = [
+            factories.ConditionalOfferFactory(name='Offer %d' % i)
+            for i in range(2)]
+        self.voucher = factories.VoucherFactory()
+        self.add_discount(self.offers[0], D('5.00'), days_ago=0)
+        self.add_discount(self.offers[0], D('3.00'), days_ago=1,
+                          voucher=self.voucher)
+        self.add_discount(self.offers[1], D('10.00'), days_ago=0)
+        self.add_discount(self.offers[1], D('1.00'), days_ago=5)
+
+    def add_discount(self, offer, amount, days_ago, voucher=None):
+        order = factories.create_order()
+        order.date_placed = timezone.now() - datetime.timedelta(
+            days=days_ago)
+        order.save()
+        OrderDiscount.objects.create(
+            order=order, offer_id=offer.id, amount=amount,
+            voucher_id=voucher.id if voucher else None)
+
+    def get_totals(self, field, **kwargs):
+        return [(row[field], row['orders'], row['discount'])
+                for row in get_discount_totals(field, **kwargs)]
+
+
+class TestDiscountTotals(DiscountsMixin, TestCase):
+
+    def test_aggregates_discounts_per_offer(self):
+        self.assertEqual(self.get_totals('offer_id'), [
+            (self.offers[1].id, 2, D('11.00')),
+            (self.offers[0].id, 2, D('8.00'))])
+
+    def test_filters_by_date(self):
+        start_date = self.today - datetime.timedelta(days=1)
+        self.assertEqual(self.get_totals('offer_id', start_date=start_date), [
+            (self.offers[1].id, 1, D('10.00')),
+            (self.offers[0].id, 2, D('8.00'))])
+
+    def test_aggregates_discounts_per_voucher(self):
+        self.assertEqual(self.get_totals('voucher_id'), [
+            (self.voucher.id, 1, D('3.00'))])
+
+
+class TestDiscountSummaries(DiscountsMixin, TestCase):
+
+    def summarise(self, *args):
+        call_command('oscar_summarise_discounts', *args, stdout=StringIO())
+
+    def test_summarises_each_day(self):
+        self.summarise()
+        self.assertEqual(OrderDiscountSummary.objects.count(), 4)
+        self.assertEqual(
+            OrderDiscountSummary.objects.filter(date=self.today).count(), 2)
+
+    def test_resummarises_the_last_day(self):
+        self.summarise()
+        self.add_discount(self.offers[0], D('2.00'), days_ago=0)
+        self.summarise()
+        summary = OrderDiscountSummary.objects.get(
+            date=self.today, offer_id=self.offers[0].id)
+        self.assertEqual(summary.num_orders, 2)
+        self.assertEqual(summary.total_discount, D('7.00'))
+
+    def test_summaries_match_the_discounts(self):
+        self.summarise()
+        start_date = self.today - datetime.timedelta(days=1)
+        for field in ('offer_id', 'voucher_id'):
+            for kwargs in ({}, {'start_date': start_date},
+                           {'end_date': start_date}):
+                expected = self.get_totals(field, **kwargs)
+                with override_settings(OSCAR_USE_DISCOUNT_SUMMARIES=True):
+                    self.assertEqual(
+                        self.get_totals(field, **kwargs), expected)
+
+
+class TestDiscountReports(DiscountsMixin, TestCase):
+
+    def test_offer_report(self):
+        generator = OfferReportGenerator(formatter='HTML')
+        with self.assertNumQueries(2):
+            rows = generator.generate()
+        self.assertEqual(
+            [(row['offer'], row['total_discount']) for row in rows],
+            [(self.offers[1], D('11.00')), (self.offers[0], D('8.00'))])
+
+    def test_offer_report_csv(self):
+        generator = OfferReportGenerator(formatter='CSV')
+        content = generator.generate().content.decode('utf-8')
+        self.assertIn('Offer 1,11.00', content)
+
+    def test_voucher_report(self):
+        generator = VoucherReportGenerator(
+            formatter='HTML', start_date=self.today)
+        self.assertEqual(generator.generate(), [])
+        generator = VoucherReportGenerator(formatter='HTML')
+        vouchers = generator.generate()
+        self.assertEqual(vouchers, [self.voucher])
+        self.assertEqual(vouchers[0].num_orders, 1)
+        self.assertEqual(vouchers[0].total_discount, D('3.00'))
@@ -0,0 +1,67 @@
+from decimal import Decimal as D
+
+from django.test import TestCase
+
+from oscar.apps.partner import stock
+from oscar.apps.partner.models import StockAlert
+from oscar.test import factories
+
+from tests._site.apps.partner.models import StockRecord
+
+
+class TestBulkAllocation(TestCase):
+
+    def setUp(self):
+        self.stockrecords = [
+            factories.create_product(
+                price=D('10.00'), num_in_stock=10).stockrecords.get()
+            for __ in range(3)]
+        for stockrecord in self.stockrecords:
+            stockrecord.low_stock_threshold = 5
+            stockrecord.save()
+
+    def get_allocations(self):
+        return [StockRecord.objects.get(pk=stockrecord.pk).num_allocated
+                for stockrecord in self.stockrecords]
+
+    def test_allocates_with_a_single_update(self):
+        stock.allocate({self.stockrecords[0].pk: 2,
+                        self.stockrecords[1].pk: 3})
+        stock.allocate({self.stockrecords[0].pk: 1})
+        self.assertEqual([3, 3, None], self.get_allocations())
+
+    def test_takes_a_constant_number_of_queries(self):
+        # Update the allocations, then fetch the stock records and their open
+        # alerts, and create the new ones in a savepoint
+        with self.assertNumQueries(6):
+            stock.allocate(dict(
+                (stockrecord.pk, 6) for stockrecord in self.stockrecords))
+        self.assertEqual(3, StockAlert.objects.filter(
+            status=StockAlert.OPEN).count())
+
+    def test_opens_and_closes_alerts(self):
+        stock.allocate({self.stockrecords[0].pk: 6})
+        alert = StockAlert.objects.get()
+        self.assertEqual(self.stockrecords[0], alert.stockrecord)
+        self.assertEqual(5, alert.threshold)
+
+        StockRecord.objects.filter(pk=self.stockrecords[0].pk).update(
+            num_in_stock=20)
+        stock.update_stock_alerts([self.stockrecords[0].pk])
+        alert = StockAlert.objects.get()
+        self.assertEqual(StockAlert.CLOSED, alert.status)
+        self.assertIsNotNone(alert.date_closed)
+
+
+class TestPlacingAnOrder(TestCase):
+
+    def test_allocates_stock_of_all_lines_at_once(self):
+        basket = factories.create_basket(empty=True)
+        products = [factories.create_product(price=D('10.00'),
+                                             num_in_stock=10)
+                    for __ in range(3)]
+        for product in products:
+            basket.add_product(product, quantity=2)
+        order = factories.create_order(basket=basket)
+        for line in order.lines.all():
+            self.assertEqual(2, line.stockrecord.num_allocated)
@@ -1,4 +1,5 @@
 from django.test import TestCase
+from django.test.utils import override_settings
 from decimal import Decimal as D
 
 from oscar.apps.partner import strategy
@@ -107,3 +108,84 @@ class TestDefaultStrategyForParentProductWithOutOfStockVariant(TestCase):
 
     def test_specifies_product_has_correct_price(self):
         self.assertEqual(D('10.00'), self.info.price.incl_tax)
+
+
+class TestFetchingPurchaseInfoInBulk(TestCase):
+
+    def setUp(self):
+        self.strategy = strategy.Default()
+        self.products = [
+            factories.create_product(price=D('1.99'), num_in_stock=4),
+            factories.create_product(price=D('5.00'), num_in_stock=0),
+            factories.create_product()]
+        self.parent = factories.create_product(structure='parent')
+        factories.create_product(
+            parent=self.parent, price=D('10.00'), num_in_stock=3)
+        self.products.append(self.parent)
+
+    def assert_info_equal(self, expected, info):
+        self.assertEqual(expected.stockrecord, info.stockrecord)
+        self.assertEqual(expected.price.excl_tax, info.price.excl_tax)
+        self.assertEqual(expected.availability.code, info.availability.code)
+
+    def test_matches_fetching_each_product(self):
+        infos = self.strategy.fetch_for_products(self.products)
+        for product in self.products[:-1]:
+            self.assert_info_equal(
+                self.strategy.fetch_for_product(product), infos[product.id])
+        self.assert_info_equal(
+            self.strategy.fetch_for_parent(self.parent), infos[self.parent.id])
+
+    def test_uses_a_constant_number_of_queries(self):
+        products = models.Product.objects.select_related(
+            'product_class').filter(id__in=[p.id for p in self.products])
+        # Products, stockrecords, children and their stockrecords
+        with self.assertNumQueries(4):
+            self.strategy.fetch_for_products(products)
+
+    def test_fetches_purchase_info_for_lines(self):
+        basket = factories.create_basket(empty=True)
+        basket.add_product(self.products[0])
+        line = basket.all_lines()[0]
+        infos = self.strategy.fetch_for_lines([line])
+        self.assert_info_equal(
+            self.strategy.fetch_for_line(line), infos[line.id])
+
+
+@override_settings(OSCAR_PURCHASE_INFO_MEMO_SIZE=2)
+class TestMemoizingPurchaseInfo(TestCase):
+
+    def setUp(self):
+        self.strategy = strategy.Default()
+        self.product = factories.create_product(price=D('1.99'))
+
+    def test_is_disabled_by_default(self):
+        with override_settings(OSCAR_PURCHASE_INFO_MEMO_SIZE=0):
+            self.assertIsNone(strategy.Default().get_memo_stats())
+
+    def test_reuses_purchase_info(self):
+        info = self.strategy.fetch_for_product(self.product)
+        with self.assertNumQueries(0):
+            self.assertIs(info, self.strategy.fetch_for_product(self.product))
+        self.assertEqual({'hits': 1, 'misses': 1, 'size': 1},
+                         self.strategy.get_memo_stats())
+
+    def test_is_used_when_fetching_in_bulk(self):
+        info = self.strategy.fetch_for_product(self.product)
+        with self.assertNumQueries(0):
+            infos = self.strategy.fetch_for_products([self.product])
+        self.assertIs(info, infos[self.product.id])
+
+    def test_is_bounded(self):
+        products = [factories.create_product() for __ in range(3)]
+        for product in products:
+            self.strategy.fetch_for_product(product)
+        self.assertEqual(2, self.strategy.get_memo_stats()['size'])
+
+    def test_is_invalidated_when_a_stockrecord_is_saved(self):
+        self.strategy.fetch_for_product(self.product)
+        stockrecord = self.product.stockrecords.all()[0]
+        stockrecord.price_excl_tax = D('5.00')
+        stockrecord.save()
+        info = self.strategy.fetch_for_product(self.product)
+        self.assertEqual(D('5.00'), info.price.excl_tax)
@@ -0,0 +1,189 @@
+from decimal import Decimal as D
+
+import mock
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.utils.six import StringIO
+from haystack import connections
+
+from oscar.apps.partner.stock import allocate
+from oscar.apps.search import indexing
+from oscar.core.loading import get_model
+from oscar.test import factories
+
+Category = get_model('catalogue', 'Category')
+Product = get_model('catalogue', 'Product')
+ProductCategory = get_model('catalogue', 'ProductCategory')
+ProductChange = get_model('catalogue', 'ProductChange')
+StockRecord = get_model('partner', 'StockRecord')
+
+
+def get_changed_ids():
+    return set(ProductChange.objects.values_list('product_id', flat=True))
+
+
+@override_settings(OSCAR_SEARCH_CHANGE_LOG=True)
+class TestLoggingChanges(TestCase):
+
+    def test_logs_saved_and_deleted_products(self):
+        product = factories.create_product()
+        product_id = product.id
+        ProductChange.objects.all().delete()
+
+        product.delete()
+        self.assertEqual(set([product_id]), get_changed_ids())
+
+    def test_logs_the_parent_of_a_changed_child(self):
+        parent = factories.create_product(structure='parent')
+        child = factories.create_product(structure='child', parent=parent)
+        ProductChange.objects.all().delete()
+
+        factories.create_stockrecord(child, num_in_stock=1)
+        self.assertEqual(set([parent.id, child.id]), get_changed_ids())
+
+    def test_logs_the_products_of_a_renamed_category(self):
+        category = factories.CategoryFactory(name='Books')
+        product = factories.create_product()
+        ProductCategory.objects.create(product=product, category=category)
+        ProductChange.objects.all().delete()
+
+        category.name = 'Novels'
+        category.save()
+        self.assertEqual(set([product.id]), get_changed_ids())
+
+    def test_logs_bulk_stock_allocations(self):
+        product = factories.create_product(price=D('10.00'), num_in_stock=5)
+        ProductChange.objects.all().delete()
+
+        allocate({product.stockrecords.get().id: 2})
+        self.assertEqual(set([product.id]), get_changed_ids())
+
+    @override_settings(OSCAR_SEARCH_CHANGE_LOG=False)
+    def test_does_not_log_changes_if_disabled(self):
+        factories.create_product()
+        self.assertFalse(ProductChange.objects.exists())
+
+
+@override_settings(OSCAR_SEARCH_CHANGE_LOG=True)
+class TestUpdatingTheIndex(TestCase):
+
+    def setUp(self):
+        self.backend = connections['default'].get_backend()
+        patcher = mock.patch.multiple(
+            self.backend.__class__, update=mock.DEFAULT, remove=mock.DEFAULT)
+        self.mocks = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def get_indexed_ids(self):
+        ids = set()
+        for call in self.mocks['update'].call_args_list:
+            ids.update(product.id for product in call[0][1])
+        return ids
+
+    def test_reindexes_changed_products_in_chunks(self):
+        products = [factories.create_product(price=D('10.00'))
+                    for i in range(3)]
+
+        self.assertEqual(3, indexing.update_index(batch_size=2))
+
+        self.assertEqual(2, self.mocks['update'].call_count)
+        self.assertEqual(set(p.id for p in products), self.get_indexed_ids())
+        self.assertFalse(ProductChange.objects.exists())
+
+    def test_keeps_changes_recorded_while_updating(self):
+        product = factories.create_product()
+        self.mocks['update'].side_effect = (
+            lambda index, products, commit: ProductChange.objects.create(
+                product_id=product.id))
+
+        indexing.update_index()
+        self.assertEqual(1, ProductChange.objects.count())
+
+    def test_removes_deleted_products(self):
+        product = factories.create_product()
+        product_id = product.id
+        product.delete()
+
+        indexing.update_index()
+        self.mocks['remove'].assert_called_once_with(
+            'catalogue.product.%d' % product_id, commit=True)
+
+    def test_commits_once_per_chunk(self):
+        products = [factories.create_product() for i in range(3)]
+        deleted_ids = [product.id for product in products[1:]]
+        for product in products[1:]:
+            product.delete()
+
+        indexing.update_index()
+        self.assertEqual(
+            [mock.call('catalogue.product.%d' % product_id, commit=False)
+             for product_id in deleted_ids],
+            self.mocks['remove'].call_args_list)
+        self.assertEqual(
+            {'commit': True}, self.mocks['update'].call_args[1])
+
+    def test_does_not_remove_child_products(self):
+        parent = factories.create_product(structure='parent')
+        factories.create_product(structure='child', parent=parent)
+
+        indexing.update_index()
+        self.assertEqual(set([parent.id]), self.get_indexed_ids())
+        self.assertFalse(self.mocks['remove'].called)
+
+    def test_prepares_products_with_a_constant_number_of_queries(self):
+        index = connections['default'].get_unified_index().get_index(Product)
+        category = factories.CategoryFactory()
+        num_queries = []
+        for num_products in (1, 5):
+            ids = []
+            for i in range(num_products):
+                product = factories.create_product(price=D('10.00'),
+                                                   num_in_stock=3)
+                ProductCategory.objects.create(
+                    product=product, category=category)
+                ids.append(product.id)
+            self.mocks['update'].side_effect = (
+                lambda index, products, commit: [
+                    index.full_prepare(product) for product in products])
+            with CaptureQueriesContext(connection) as context:
+                indexing.index_products(ids)
+            num_queries.append(len(context))
+        self.assertEqual(num_queries[0], num_queries[1])
+
+        product = Product.objects.get(pk=ids[0])
+        prepared = index.full_prepare(product)
+        self.assertEqual(D('10.00'), prepared['price'])
+        self.assertEqual(3, prepared['num_in_stock'])
+        self.assertEqual([category.full_name], prepared['category'])
+
+    def test_management_command_reindexes_changed_products(self):
+        factories.create_product()
+        stdout = StringIO()
+        call_command('oscar_update_search_index', stdout=stdout)
+        self.assertIn('Reindexed 1 products', stdout.getvalue())
+        self.assertEqual(0, indexing.update_index())
+
+    def test_does_nothing_without_changes(self):
+        with override_settings(OSCAR_SEARCH_CHANGE_LOG=False):
+            factories.create_product()
+        self.assertEqual(0, indexing.update_index())
+        self.assertFalse(self.mocks['update'].called)
+
+
+@override_settings(OSCAR_PURCHASE_INFO_MEMO_SIZE=100)
+class TestPreparingProducts(TestCase):
+
+    def test_uses_the_current_stock_with_memoized_purchase_info(self):
+        index = connections['default'].get_unified_index().get_index(Product)
+        product = factories.create_product(price=D('10.00'), num_in_stock=3)
+        self.assertEqual(3, index.full_prepare(product)['num_in_stock'])
+
+        # Bulk updates don't send any signals
+        StockRecord.objects.filter(product=product).update(
+            num_in_stock=7, price_excl_tax=D('12.00'))
+        product = Product.objects.get(pk=product.pk)
+        prepared = index.full_prepare(product)
+        self.assertEqual(7, prepared['num_in_stock'])
+        self.assertEqual(D('12.00'), prepared['price'])
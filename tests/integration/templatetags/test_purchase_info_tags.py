@@ -0,0 +1,32 @@
+from decimal import Decimal as D
+
+from django import template
+from django.test import TestCase
+from django.test.client import RequestFactory
+
+from oscar.apps.partner.strategy import Default
+from oscar.test import factories
+
+
+class TestPurchaseInfoTags(TestCase):
+
+    def setUp(self):
+        self.request = RequestFactory().get('/')
+        self.request.strategy = Default()
+        self.products = [factories.create_product(price=D('5.00'))
+                         for __ in range(3)]
+        self.template = template.Template(
+            "{% load purchase_info_tags %}"
+            "{% prefetch_purchase_info_for_products request products %}"
+            "{% for product in products %}"
+            "{% purchase_info_for_product request product as session %}"
+            "{{ session.price.excl_tax }} "
+            "{% endfor %}")
+
+    def test_prefetches_purchase_info_for_all_products(self):
+        context = template.Context(
+            {'request': self.request, 'products': self.products})
+        # Only the stockrecords of all products are looked up
+        with self.assertNumQueries(1):
+            output = self.template.render(context)
+        self.assertEqual("5.00 5.00 5.00 ", output)
@@ -22,6 +22,9 @@ class TestBasketMiddleware(TestCase):
     def test_strategy_is_attached_to_request(self):
         self.assertTrue(hasattr(self.request, 'strategy'))
 
+    def test_basket_summary_is_attached_to_request(self):
+        self.assertEqual(0, self.request.basket_summary.num_lines)
+
     def test_get_cookie_basket_handles_invalid_signatures(self):
         request_factory = RequestFactory()
         request_factory.cookies['oscar_open_basket'] = '1:NOTAVALIDHASH'
@@ -7,7 +7,8 @@ from django.test.utils import override_settings
 
 import oscar
 from oscar.core.loading import (
-    get_model, AppNotFoundError, get_classes, get_class, ClassNotFoundError)
+    get_model, AppNotFoundError, get_classes, get_class, ClassNotFoundError,
+    clear_class_cache, get_class_cache_stats)
 from tests import temporary_python_path
 
 
@@ -108,6 +109,51 @@ class ClassLoadingWithLocalOverrideWithMultipleSegmentsTests(TestCase):
             self.assertEqual('tests._site.apps.shipping.methods', Free.__module__)
 
 
+class TestClassCache(TestCase):
+
+    def setUp(self):
+        clear_class_cache()
+        get_class_cache_stats(reset=True)
+
+    def test_records_a_miss_then_a_hit(self):
+        first = get_class('catalogue.models', 'Product')
+        second = get_class('catalogue.models', 'Product')
+        self.assertIs(first, second)
+        stats = get_class_cache_stats()
+        self.assertEqual(1, stats['misses'])
+        self.assertEqual(1, stats['hits'])
+        self.assertEqual(1, stats['size'])
+
+    def test_serves_single_classes_previously_loaded_as_a_group(self):
+        get_classes('catalogue.models', ('Product', 'Category'))
+        get_class('catalogue.models', 'Category')
+        self.assertEqual(1, get_class_cache_stats()['hits'])
+
+    def test_can_reset_the_counters(self):
+        get_class('catalogue.models', 'Product')
+        get_class_cache_stats(reset=True)
+        stats = get_class_cache_stats()
+        self.assertEqual(0, stats['misses'])
+        self.assertEqual(0.0, stats['resolution_time'])
+        self.assertEqual(1, stats['size'])
+
+    def test_is_cleared_when_installed_apps_change(self):
+        get_class('shipping.methods', 'Free')
+        installed_apps = list(settings.INSTALLED_APPS)
+        installed_apps[installed_apps.index('oscar.apps.shipping')] = 'tests._site.shipping'
+        with override_settings(INSTALLED_APPS=installed_apps):
+            Free = get_class('shipping.methods', 'Free')
+            self.assertEqual('tests._site.shipping.methods', Free.__module__)
+        Free = get_class('shipping.methods', 'Free')
+        self.assertEqual('oscar.apps.shipping.methods', Free.__module__)
+
+    def test_does_not_cache_failures(self):
+        for __ in range(2):
+            with self.assertRaises(ClassNotFoundError):
+                get_class('catalogue.models', 'Monkey')
+        self.assertEqual(0, get_class_cache_stats()['size'])
+
+
 class TestGetCoreAppsFunction(TestCase):
     """
     oscar.get_core_apps function
@@ -1,6 +1,7 @@
 from django.test import TestCase
 
 from oscar.core.compat import get_user_model
+from oscar.apps.customer import template_cache
 from oscar.apps.customer.models import CommunicationEventType
 
 
@@ -33,3 +34,45 @@ class CommunicationTypeTest(TestCase):
             et = CommunicationEventType(email_subject_template=original)
             messages = et.get_messages()
             self.assertEqual(modified, messages['subject'])
+
+    def test_render_messages_renders_each_context(self):
+        et = CommunicationEventType(
+            code='GREETING', email_subject_template='Hello {{ name }}')
+        messages = et.render_messages([{'name': 'world'}, {'name': 'you'}])
+        self.assertEqual(['Hello world', 'Hello you'],
+                         [msgs['subject'] for msgs in messages])
+
+
+class CommunicationTypeTemplateCacheTest(TestCase):
+
+    def setUp(self):
+        self.et = CommunicationEventType.objects.create(
+            code='GREETING', name='Greeting',
+            email_subject_template='Hello {{ name }}')
+
+    def test_reuses_compiled_templates(self):
+        templates = self.et.get_templates()
+        et = CommunicationEventType.objects.get(pk=self.et.pk)
+        self.assertIs(templates['subject'], et.get_templates()['subject'])
+
+    def test_renders_edited_templates(self):
+        self.et.get_messages({'name': 'world'})
+        self.et.email_subject_template = 'Bye {{ name }}'
+        messages = self.et.get_messages({'name': 'world'})
+        self.assertEqual('Bye world', messages['subject'])
+
+    def test_saving_discards_compiled_templates(self):
+        templates = self.et.get_templates()
+        self.et.save()
+        self.assertIsNot(templates['subject'],
+                         self.et.get_templates()['subject'])
+
+    def test_does_not_grow_when_previewing_edits(self):
+        self.et.get_templates()
+        num_templates = len(template_cache._field_templates)
+        for i in range(3):
+            CommunicationEventType(
+                code='GREETING',
+                email_subject_template='Hello %d' % i).get_templates()
+        self.assertEqual(
+            num_templates, len(template_cache._field_templates))
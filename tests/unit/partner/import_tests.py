@@ -3,9 +3,10 @@ from decimal import Decimal as D
 from django.test import TestCase
 import logging
 
-from oscar.apps.partner.importers import CatalogueImporter
+from oscar.apps.partner.importers import (
+    BulkCatalogueImporter, CatalogueImporter)
 from oscar.apps.partner.exceptions import ImportingError
-from oscar.apps.catalogue.models import ProductClass, Product
+from oscar.apps.catalogue.models import Category, ProductClass, Product
 from oscar.apps.partner.models import Partner
 from oscar.test.factories import create_product
 
@@ -13,6 +14,7 @@ from tests._site.apps.partner.models import StockRecord
 
 TEST_BOOKS_CSV = os.path.join(os.path.dirname(__file__), 'fixtures/books-small.csv')
 TEST_BOOKS_SEMICOLON_CSV = os.path.join(os.path.dirname(__file__), 'fixtures/books-small-semicolon.csv')
+TEST_BOOKS_MULTI_PARTNER_CSV = os.path.join(os.path.dirname(__file__), 'fixtures/books-multi-partner.csv')
 
 
 class NullHandler(logging.Handler):
@@ -125,3 +127,79 @@ class ImportWithFlushTest(TestCase):
 
         with self.assertRaises(Product.DoesNotExist):
             Product.objects.get(upc=upc)
+
+
+class BulkImportSmokeTest(ImportSmokeTest):
+
+    def setUp(self):
+        self.importer = BulkCatalogueImporter(logger, batch_size=3)
+        self.importer.handle(TEST_BOOKS_CSV)
+        self.product = Product.objects.get(upc='9780115531446')
+
+    def test_categories_are_created_once(self):
+        self.assertEqual(['Books', 'Books > Fiction'], list(
+            Category.objects.order_by('path').values_list(
+                'full_name', flat=True)))
+        self.assertEqual(10, self.product.__class__.objects.filter(
+            categories__full_name='Books > Fiction').count())
+
+
+class BulkImportUpdateTest(TestCase):
+
+    def setUp(self):
+        self.importer = BulkCatalogueImporter(logger, batch_size=4)
+
+    def test_importing_again_updates_products_and_stockrecords(self):
+        create_product(price=D('10.00'), upc='9780115531446',
+                       partner_sku='9780115531446', num_in_stock=1)
+        self.importer.handle(TEST_BOOKS_CSV)
+        self.importer.handle(TEST_BOOKS_CSV)
+
+        self.assertEqual(10, Product.objects.count())
+        product = Product.objects.get(upc='9780115531446')
+        self.assertEqual(
+            "Prepare for Your Practical Driving Test", product.title)
+        stockrecord = StockRecord.objects.get(partner_sku='9780115531446')
+        self.assertEqual(product, stockrecord.product)
+        self.assertEqual('Gardners', stockrecord.partner.name)
+        self.assertEqual(D('10.32'), stockrecord.price_excl_tax)
+        self.assertEqual(6, stockrecord.num_in_stock)
+
+    def test_takes_a_constant_number_of_queries_per_chunk(self):
+        self.importer.handle(TEST_BOOKS_CSV)
+        self.importer.batch_size = 10
+        # Load the lookups, then look up the products, their categories and
+        # stock records of the single chunk in a savepoint. As nothing has
+        # changed, nothing needs to be updated.
+        with self.assertNumQueries(3 + 5):
+            self.importer.handle(TEST_BOOKS_CSV)
+
+    def test_workers_import_all_rows_between_them(self):
+        self.importer.workers = 3
+        self.importer._load_lookups()
+        results = [self.importer._import_partition(TEST_BOOKS_CSV, worker)
+                   for worker in range(3)]
+        self.assertEqual(10, sum(new for new, __ in results))
+        self.assertEqual(10, Product.objects.count())
+
+
+class BulkImportMultiPartnerTest(TestCase):
+
+    def import_file(self, importer):
+        importer.handle(TEST_BOOKS_MULTI_PARTNER_CSV)
+        product = Product.objects.get(upc='111')
+        return (
+            list(product.stockrecords.order_by('partner_sku').values_list(
+                'partner_sku', 'partner__name')),
+            list(product.categories.order_by('name').values_list(
+                'name', flat=True)))
+
+    def test_imports_every_row_of_a_product(self):
+        expected = ([('SKU-A', 'Gardners'), ('SKU-B', 'Blackwells')],
+                    ['Fiction', 'Poetry'])
+        self.assertEqual(expected, self.import_file(CatalogueImporter(logger)))
+        for batch_size in (1, 2, 10):
+            Product.objects.all().delete()
+            StockRecord.objects.all().delete()
+            self.assertEqual(expected, self.import_file(
+                BulkCatalogueImporter(logger, batch_size=batch_size)))